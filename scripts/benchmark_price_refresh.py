@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Price Refresh Benchmark
+
+This script compares price refresh strategies against a local stub data fetcher
+that simulates per-request network latency, so no API access is needed.
+
+Strategies:
+    - sequential: one blocking fetch_data call per ticker (the old behavior)
+    - batch: a single fetch_many request for all tickers
+    - concurrent: fetch_data calls on a bounded thread pool
+
+Usage:
+    python scripts/benchmark_price_refresh.py [--tickers 150] [--latency 0.05]
+        [--workers 8] [--timeout 10]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+# Add the src directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.folio.portfolio import _fetch_latest_prices
+from src.stockdata import DataFetcherInterface
+
+console = Console()
+
+
+class StubDataFetcher(DataFetcherInterface):
+    """Data fetcher that sleeps for a fixed latency on every request."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+
+    def fetch_data(self, ticker, period="3m", interval="1d"):  # noqa: ARG002
+        self.requests += 1
+        time.sleep(self.latency)
+        return pd.DataFrame({"Close": [100.0]})
+
+    def fetch_market_data(self, market_index="SPY", period=None, interval="1d"):
+        return self.fetch_data(market_index, period, interval)
+
+    def fetch_many(self, tickers, period="3m", interval="1d"):  # noqa: ARG002
+        # A bulk endpoint costs one round trip regardless of ticker count
+        self.requests += 1
+        time.sleep(self.latency)
+        return {ticker: pd.DataFrame({"Close": [100.0]}) for ticker in tickers}
+
+
+def run_strategy(name, tickers, latency, workers, timeout):
+    """Run one refresh strategy and return (elapsed seconds, request count)."""
+    fetcher = StubDataFetcher(latency)
+    start = time.perf_counter()
+    if name == "sequential":
+        for ticker in tickers:
+            fetcher.fetch_data(ticker, period="1d")
+    else:
+        _fetch_latest_prices(
+            tickers,
+            fetcher,
+            {"mode": name, "max_workers": workers, "timeout": timeout},
+        )
+    return time.perf_counter() - start, fetcher.requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price refresh modes")
+    parser.add_argument("--tickers", type=int, default=150, help="Number of tickers")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated latency per request"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool size")
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="Per-ticker timeout"
+    )
+    args = parser.parse_args()
+
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+
+    table = Table(
+        title=f"Price refresh: {args.tickers} tickers, {args.latency}s latency"
+    )
+    table.add_column("Mode")
+    table.add_column("Requests", justify="right")
+    table.add_column("Elapsed", justify="right")
+    for name in ("sequential", "batch", "concurrent"):
+        elapsed, requests = run_strategy(
+            name, tickers, args.latency, args.workers, args.timeout
+        )
+        table.add_row(name, str(requests), f"{elapsed:.2f}s")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
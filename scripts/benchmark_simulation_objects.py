@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Simulation Object Churn Benchmark
+
+This script measures the position objects a simulation creates with the
+"objects" method, which rebuilds every position and the portfolio summary per
+scenario with recalculate_portfolio_with_prices. The book is synthetic, so no
+API access is needed.
+
+Reported:
+    - objects created by a 41-step SPY sweep, and the memory they use
+    - per-instance size of each position class
+    - construction time through __init__ and through copy_with
+
+Usage:
+    python scripts/benchmark_simulation_objects.py [--tickers 25] [--options 3]
+        [--steps 41]
+"""
+
+import argparse
+import datetime
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+# Add the src directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.folio.data_model import (
+    ExposureBreakdown,
+    OptionPosition,
+    PortfolioGroup,
+    StockPosition,
+    create_portfolio_group,
+)
+from src.folio.portfolio import recalculate_portfolio_with_prices
+
+console = Console()
+
+
+def create_book(tickers, options):
+    """Create a book of groups, each with a stock and a ladder of options."""
+    rng = np.random.default_rng(0)
+    expiry = (datetime.date.today() + datetime.timedelta(days=60)).isoformat()
+    groups = []
+    for index in range(tickers):
+        ticker = f"T{index:03d}"
+        price = float(rng.uniform(20, 500))
+        beta = float(rng.uniform(0.5, 1.8))
+        quantity = float(rng.integers(-50, 200))
+        option_data = []
+        for leg in range(options):
+            contracts = float(rng.integers(-5, 6) or 1)
+            delta_exposure = 0.5 * contracts * 100 * price
+            option_data.append(
+                {
+                    "ticker": ticker,
+                    "quantity": contracts,
+                    "beta": beta,
+                    "beta_adjusted_exposure": delta_exposure * beta,
+                    "market_exposure": delta_exposure,
+                    "strike": round(price * (0.9 + 0.1 * leg)),
+                    "expiry": expiry,
+                    "option_type": "CALL" if leg % 2 == 0 else "PUT",
+                    "delta": 0.5,
+                    "delta_exposure": delta_exposure,
+                    "notional_value": abs(contracts) * 100 * price,
+                    "price": price * 0.05,
+                }
+            )
+        groups.append(
+            create_portfolio_group(
+                {
+                    "ticker": ticker,
+                    "quantity": quantity,
+                    "beta": beta,
+                    "market_exposure": quantity * price,
+                    "beta_adjusted_exposure": quantity * price * beta,
+                    "price": price,
+                },
+                option_data,
+            )
+        )
+    return groups
+
+
+def instance_size(instance):
+    """Bytes used by an instance, including its attribute dictionary if any."""
+    size = sys.getsizeof(instance)
+    if hasattr(instance, "__dict__"):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def run_sweep(groups, steps):
+    """Run the SPY sweep, keeping every result alive.
+
+    Returns:
+        Tuple of (results, elapsed seconds)
+    """
+    start = time.perf_counter()
+    results = [
+        recalculate_portfolio_with_prices(
+            groups, {group.ticker: 1.0 + change * group.beta for group in groups}
+        )
+        for change in np.linspace(-0.2, 0.2, steps)
+    ]
+    return results, time.perf_counter() - start
+
+
+def retained_memory(results):
+    """Bytes used by the position objects of the sweep results."""
+    total = 0
+    for recalculated_groups, summary in results:
+        total += sum(
+            instance_size(instance)
+            for instance in (
+                summary.long_exposure,
+                summary.short_exposure,
+                summary.options_exposure,
+            )
+        )
+        for group in recalculated_groups:
+            total += instance_size(group)
+            if group.stock_position:
+                total += instance_size(group.stock_position)
+            total += sum(instance_size(option) for option in group.option_positions)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark simulation object churn")
+    parser.add_argument("--tickers", type=int, default=25, help="Number of groups")
+    parser.add_argument("--options", type=int, default=3, help="Options per group")
+    parser.add_argument("--steps", type=int, default=41, help="SPY sweep steps")
+    args = parser.parse_args()
+
+    groups = create_book(args.tickers, args.options)
+    results, elapsed = run_sweep(groups, args.steps)
+
+    # Per step: a group, stock and options per ticker, and the summary's three
+    # exposure breakdowns
+    objects = args.steps * (args.tickers * (2 + args.options) + 3)
+    table = Table(
+        title=f"{args.steps}-step sweep: {args.tickers} groups, "
+        f"{args.options} options each"
+    )
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Position objects created", f"{objects:,}")
+    table.add_row("Elapsed", f"{elapsed:.2f}s")
+    table.add_row(
+        "Position object memory", f"{retained_memory(results) / 1024:,.0f} KiB"
+    )
+    console.print(table)
+
+    recalculated_groups, summary = results[0]
+    group = recalculated_groups[0]
+    option = group.option_positions[0]
+    table = Table(title="Instance size and construction time")
+    table.add_column("Class")
+    table.add_column("Bytes", justify="right")
+    table.add_column("__init__", justify="right")
+    table.add_column("copy_with", justify="right")
+    number = 20_000
+    for cls, instance, kwargs in (
+        (StockPosition, group.stock_position, group.stock_position.to_dict()),
+        (OptionPosition, option, option.to_dict()),
+        (
+            PortfolioGroup,
+            group,
+            {
+                "ticker": group.ticker,
+                "stock_position": group.stock_position,
+                "option_positions": group.option_positions,
+                "net_exposure": group.net_exposure,
+                "beta": group.beta,
+                "beta_adjusted_exposure": group.beta_adjusted_exposure,
+                "total_delta_exposure": group.total_delta_exposure,
+                "options_delta_exposure": group.options_delta_exposure,
+            },
+        ),
+        (ExposureBreakdown, summary.long_exposure, summary.long_exposure.to_dict()),
+    ):
+        init_time = (
+            timeit.timeit(lambda cls=cls, kwargs=kwargs: cls(**kwargs), number=number)
+            / number
+        )
+        copy_time = (
+            timeit.timeit(lambda instance=instance: instance.copy_with(), number=number)
+            / number
+        )
+        table.add_row(
+            cls.__name__,
+            str(instance_size(instance)),
+            f"{init_time * 1e6:.2f}us",
+            f"{copy_time * 1e6:.2f}us",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
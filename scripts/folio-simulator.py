@@ -21,7 +21,7 @@ Configuration:
 
 Usage:
     # Recommended: Use the make target (activates virtual environment automatically)
-    make simulator [range=5] [steps=11] [focus=SPY,QQQ] [detailed=1]
+    make simulator [range=5] [steps=11] [focus=SPY,QQQ] [detailed=1] [paths=100000] [horizon=10] [seed=1] [method=taylor] [workers=4] [surface=1] [replay=2020-covid-crash] [rolling=20]
 
     # Alternative: Activate virtual environment first, then run the script
     source venv/bin/activate
@@ -34,7 +34,18 @@ Options:
     --focus TICKERS    Comma-separated list of tickers to focus on (e.g., "SPY,QQQ,AAPL")
     --range PERCENT    SPY change range in percent (default: 20.0)
     --steps N          Number of steps in the simulation (default: 13)
+    --method METHOD    Simulation method: objects, vectorized or taylor
+    --workers N        Worker processes for scenarios and Monte Carlo paths (0: every core)
     --detailed         Show detailed analysis for all positions
+    --monte-carlo N    Also estimate VaR and expected shortfall from N random paths
+    --horizon DAYS     Monte Carlo horizon in trading days (default: 1)
+    --seed N           Random seed for reproducible Monte Carlo results
+    --period PERIOD    Price history period for return covariances (default: 1y)
+    --surface          Also show P&L heatmaps over SPY change x volatility x time
+    --vol-shifts LIST  Surface volatility shifts in points (default: -10,-5,0,5,10)
+    --days LIST        Surface horizons in calendar days (default: 0,7,30,90)
+    --replay WINDOW    Replay a historical window: a named scenario or START:END dates
+    --rolling DAYS     Replay every rolling window of DAYS trading days in the history
 
 Examples:
     # Run with default settings (±20% SPY range with 13 steps)
@@ -71,6 +82,15 @@ Output:
     6. Portfolio Beta Analysis - The portfolio's beta for up and down moves, average
        beta, and a note about non-linear behavior if applicable.
 
+    7. Monte Carlo Risk (with --monte-carlo) - VaR and expected shortfall from
+       correlated random price moves of all positions.
+
+    8. Scenario Surface (with --surface) - One P&L heatmap per horizon, by SPY
+       change and option volatility shift.
+
+    9. Historical Replay (with --replay or --rolling) - Daily portfolio values
+       over a historical window, or the worst rolling windows in the history.
+
 Notes:
     - The script requires a portfolio CSV file at 'private-data/portfolio-private.csv'.
     - The script updates prices for all positions before running the simulation.
@@ -78,6 +98,8 @@ Notes:
     - The script calculates implied beta based on the portfolio's response to SPY changes.
 """
 
+import argparse
+import datetime
 import logging
 import os
 import sys
@@ -113,9 +135,21 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from src.folio.formatting import format_currency
+from src.folio.formatting import format_compact_currency, format_currency
 from src.folio.portfolio import process_portfolio_data
-from src.folio.simulator import simulate_portfolio_with_spy_changes
+from src.folio.simulator import (
+    DEFAULT_REPLAY_PERIOD,
+    HISTORICAL_SCENARIOS,
+    SIMULATION_METHODS,
+    estimate_return_covariance,
+    load_price_history,
+    simulate_historical_replay,
+    simulate_portfolio_monte_carlo,
+    simulate_portfolio_surface,
+    simulate_portfolio_with_spy_changes,
+    simulate_rolling_replays,
+)
+from src.folio.utils import data_fetcher
 
 console = Console()
 
@@ -125,6 +159,11 @@ DEFAULT_STEPS = 13  # Default number of steps (gives 1% increments for default r
 CHART_WIDTH = 50  # Width of the ASCII chart visualization
 CHART_HEIGHT = 10  # Height of the ASCII chart visualization
 PORTFOLIO_PATH = "private-data/portfolio-private.csv"  # Path to the portfolio CSV file
+DEFAULT_HORIZON = 1  # Default Monte Carlo horizon in trading days
+DEFAULT_RETURN_PERIOD = "1y"  # Default price history period for return covariances
+DEFAULT_VOL_SHIFTS = "-10,-5,0,5,10"  # Default surface volatility shifts in points
+DEFAULT_DAYS_FORWARD = "0,7,30,90"  # Default surface horizons in calendar days
+WORST_WINDOWS = 10  # Number of worst rolling windows to show
 
 # Configure logging
 logging.basicConfig(
@@ -146,6 +185,9 @@ def debug_simulate_portfolio(
     pending_activity_value=0.0,
     spy_range=10.0,
     steps=21,
+    *,
+    workers=None,
+    method=None,
 ):
     """Run the portfolio simulator with detailed logging for debugging.
 
@@ -155,6 +197,8 @@ def debug_simulate_portfolio(
         pending_activity_value: Value of pending activity
         spy_range: Range of SPY changes to simulate (e.g., 10.0 for ±10%)
         steps: Number of steps in the simulation (default: 21)
+        workers: Number of worker processes (default: app.simulator.workers)
+        method: Simulation method (default: app.simulator.method)
     """
     logger = logging.getLogger("debug_simulator")
     logger.info("Starting detailed portfolio simulation")
@@ -184,6 +228,8 @@ def debug_simulate_portfolio(
         spy_changes=spy_changes,
         cash_like_positions=cash_like_positions,
         pending_activity_value=pending_activity_value,
+        workers=workers,
+        method=method,
     )
 
     # Add position-by-position analysis
@@ -375,10 +421,142 @@ def debug_simulate_portfolio(
     return results
 
 
+def print_monte_carlo_results(results, horizon_days):
+    """Print Monte Carlo VaR and expected shortfall as a table."""
+    current_value = results["current_value"]
+    risk_table = Table(
+        title=f"Monte Carlo Risk ({len(results['pnl_values']):,} paths, "
+        f"{horizon_days}-day horizon)",
+        box=box.ROUNDED,
+    )
+    risk_table.add_column("Confidence", style="cyan")
+    risk_table.add_column("VaR", style="red")
+    risk_table.add_column("Expected Shortfall", style="red")
+    risk_table.add_column("ES % of Portfolio", style="yellow")
+
+    for level, var in results["var"].items():
+        shortfall = results["expected_shortfall"][level]
+        shortfall_pct = shortfall / current_value * 100 if current_value else 0.0
+        risk_table.add_row(
+            f"{level:.1%}",
+            format_currency(var),
+            format_currency(shortfall),
+            f"{shortfall_pct:.2f}%",
+        )
+
+    console.print(risk_table)
+    console.print(
+        f"Mean P&L: {format_currency(results['mean_pnl'])}, "
+        f"standard deviation: {format_currency(results['std_pnl'])}"
+    )
+
+
+def print_surface_results(surface):
+    """Print a scenario surface as one P&L heatmap table per horizon."""
+    pnl = surface["pnl"]
+    # Shade cells by their size relative to the largest move on the surface
+    scale = max(abs(pnl.min()), abs(pnl.max())) or 1.0
+
+    for days_index, days in enumerate(surface["days_forward"]):
+        surface_table = Table(
+            title=f"Scenario Surface: P&L in {days} Days"
+            if days
+            else "Scenario Surface: P&L Today",
+            box=box.ROUNDED,
+        )
+        surface_table.add_column("Vol Shift", style="cyan")
+        for change in surface["spy_changes"]:
+            surface_table.add_column(f"SPY {change:+.0%}", justify="right")
+
+        for shift_index, shift in enumerate(surface["volatility_shifts"]):
+            cells = []
+            for value in pnl[days_index, shift_index]:
+                color = "green" if value >= 0 else "red"
+                weight = "bold " if abs(value) >= scale / 2 else ""
+                cells.append(f"[{weight}{color}]{format_compact_currency(value)}[/]")
+            surface_table.add_row(f"{shift * 100:+.0f} pts", *cells)
+
+        console.print(surface_table)
+
+
+def replay_window(value):
+    """Validate a --replay value.
+
+    Args:
+        value: A named scenario from HISTORICAL_SCENARIOS, or START:END dates
+            in YYYY-MM-DD format
+
+    Returns:
+        The value, unchanged
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is neither
+    """
+    if value in HISTORICAL_SCENARIOS:
+        return value
+
+    start, separator, end = value.partition(":")
+    try:
+        if not separator:
+            raise ValueError(value)
+        datetime.date.fromisoformat(start)
+        datetime.date.fromisoformat(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid window {value!r}: use one of "
+            f"{', '.join(HISTORICAL_SCENARIOS)}, or START:END dates (YYYY-MM-DD)"
+        ) from None
+    return value
+
+
+def print_replay_results(replay, title):
+    """Print a historical replay as a table of daily portfolio values."""
+    current_value = replay["current_value"]
+    replay_table = Table(title=f"Historical Replay: {title}", box=box.ROUNDED)
+    replay_table.add_column("Date", style="cyan")
+    replay_table.add_column("Portfolio Value", style="green")
+    replay_table.add_column("P&L", style="yellow")
+    replay_table.add_column("% Change", style="yellow")
+
+    for date, value, pnl in zip(
+        replay["dates"], replay["portfolio_values"], replay["pnl"], strict=True
+    ):
+        pct_change = pnl / abs(current_value) * 100 if current_value else 0.0
+        replay_table.add_row(
+            f"{date:%Y-%m-%d}",
+            format_currency(value),
+            format_currency(pnl),
+            f"{pct_change:+.2f}%",
+        )
+
+    console.print(replay_table)
+    console.print(f"Maximum drawdown: {format_currency(replay['max_drawdown'])}")
+
+
+def print_rolling_results(rolling, window_days):
+    """Print the worst rolling windows of a historical replay."""
+    rolling_table = Table(
+        title=f"Worst {window_days}-Day Windows ({len(rolling['start_dates']):,} replayed)",
+        box=box.ROUNDED,
+    )
+    rolling_table.add_column("Start", style="cyan")
+    rolling_table.add_column("Worst Day", style="cyan")
+    rolling_table.add_column("Worst P&L", style="red")
+    rolling_table.add_column("End P&L", style="yellow")
+
+    for index in rolling["worst_pnl"].argsort()[:WORST_WINDOWS]:
+        rolling_table.add_row(
+            f"{rolling['start_dates'][index]:%Y-%m-%d}",
+            f"{rolling['worst_dates'][index]:%Y-%m-%d}",
+            format_currency(rolling["worst_pnl"][index]),
+            format_currency(rolling["final_pnl"][index]),
+        )
+
+    console.print(rolling_table)
+
+
 def main():
     # Parse command line arguments
-    import argparse
-
     parser = argparse.ArgumentParser(
         description="Portfolio SPY Simulator - Analyze portfolio behavior under different SPY price scenarios",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -398,6 +576,19 @@ Examples:
 
   # Show detailed analysis for all positions
   python scripts/folio-simulator.py --detailed
+
+  # Add 10-day VaR and expected shortfall from 100,000 random paths
+  python scripts/folio-simulator.py --monte-carlo 100000 --horizon 10
+
+  # Add P&L heatmaps over SPY change, volatility shift and time
+  python scripts/folio-simulator.py --surface --vol-shifts -10,0,10 --days 0,30
+
+  # Replay the 2020 crash, or any date range, against today's portfolio
+  python scripts/folio-simulator.py --replay 2020-covid-crash
+  python scripts/folio-simulator.py --replay 2024-07-10:2024-08-05
+
+  # Find the worst 20-day windows of the last ten years
+  python scripts/folio-simulator.py --rolling 20
         """,
     )
 
@@ -417,6 +608,17 @@ Examples:
         help=f"Number of steps in the simulation (default: {DEFAULT_STEPS}, which gives {DEFAULT_SPY_RANGE / (DEFAULT_STEPS - 1) * 2:.1f}%% increments for default range)",
         metavar="N",
     )
+    sim_group.add_argument(
+        "--method",
+        choices=SIMULATION_METHODS,
+        help="Simulation method; taylor expands option values in their Greeks (default: app.simulator.method in folio.yaml)",
+    )
+    sim_group.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes to shard scenarios and Monte Carlo paths across; 0 uses every core (default: app.simulator.workers in folio.yaml)",
+        metavar="N",
+    )
 
     # Add a group for filtering and display options
     filter_group = parser.add_argument_group("Filtering and Display Options")
@@ -432,6 +634,81 @@ Examples:
         help="Show detailed analysis for all positions",
     )
 
+    # Add a group for Monte Carlo risk options
+    risk_group = parser.add_argument_group("Monte Carlo Risk Options")
+    risk_group.add_argument(
+        "--monte-carlo",
+        type=int,
+        default=0,
+        help="Estimate VaR and expected shortfall from N random paths (default: off)",
+        metavar="N",
+    )
+    risk_group.add_argument(
+        "--horizon",
+        type=int,
+        default=DEFAULT_HORIZON,
+        help=f"Monte Carlo horizon in trading days (default: {DEFAULT_HORIZON})",
+        metavar="DAYS",
+    )
+    risk_group.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for reproducible Monte Carlo results",
+        metavar="N",
+    )
+    risk_group.add_argument(
+        "--period",
+        type=str,
+        default=DEFAULT_RETURN_PERIOD,
+        help=f"Price history period for return covariances (default: {DEFAULT_RETURN_PERIOD})",
+        metavar="PERIOD",
+    )
+
+    # Add a group for scenario surface options
+    surface_group = parser.add_argument_group("Scenario Surface Options")
+    surface_group.add_argument(
+        "--surface",
+        action="store_true",
+        help="Show P&L heatmaps over SPY change x volatility shift x days forward",
+    )
+    surface_group.add_argument(
+        "--vol-shifts",
+        type=str,
+        default=DEFAULT_VOL_SHIFTS,
+        help=f"Comma-separated volatility shifts in points (default: {DEFAULT_VOL_SHIFTS})",
+        metavar="LIST",
+    )
+    surface_group.add_argument(
+        "--days",
+        type=str,
+        default=DEFAULT_DAYS_FORWARD,
+        help=f"Comma-separated horizons in calendar days (default: {DEFAULT_DAYS_FORWARD})",
+        metavar="LIST",
+    )
+
+    # Add a group for historical replay options
+    replay_group = parser.add_argument_group("Historical Replay Options")
+    replay_group.add_argument(
+        "--replay",
+        type=replay_window,
+        help=f"Replay a historical window: one of {', '.join(HISTORICAL_SCENARIOS)}, or START:END dates",
+        metavar="WINDOW",
+    )
+    replay_group.add_argument(
+        "--rolling",
+        type=int,
+        default=0,
+        help="Replay every rolling window of N trading days in the history (default: off)",
+        metavar="DAYS",
+    )
+    replay_group.add_argument(
+        "--replay-period",
+        type=str,
+        default=DEFAULT_REPLAY_PERIOD,
+        help=f"Price history period to replay from (default: {DEFAULT_REPLAY_PERIOD})",
+        metavar="PERIOD",
+    )
+
     args = parser.parse_args()
 
     # Path to the portfolio CSV file
@@ -480,6 +757,8 @@ Examples:
             pending_activity_value=getattr(summary, "pending_activity_value", 0.0),
             spy_range=args.range,
             steps=args.steps,
+            workers=args.workers,
+            method=args.method,
         )
 
         # Print the results
@@ -892,6 +1171,65 @@ Examples:
         except (StopIteration, IndexError):
             pass
 
+        # Estimate tail risk from correlated random price moves
+        if args.monte_carlo > 0:
+            covariance = estimate_return_covariance(
+                [group.ticker for group in groups],
+                data_fetcher,
+                period=args.period,
+            )
+            monte_carlo_results = simulate_portfolio_monte_carlo(
+                groups,
+                covariance,
+                cash_like_positions=summary.cash_like_positions,
+                pending_activity_value=getattr(summary, "pending_activity_value", 0.0),
+                num_paths=args.monte_carlo,
+                horizon_days=args.horizon,
+                seed=args.seed,
+                workers=args.workers,
+            )
+            print_monte_carlo_results(monte_carlo_results, args.horizon)
+
+        # Sweep SPY changes, volatility shifts and time together
+        if args.surface:
+            surface = simulate_portfolio_surface(
+                groups,
+                results["spy_changes"],
+                [float(shift) / 100 for shift in args.vol_shifts.split(",")],
+                [int(days) for days in args.days.split(",")],
+                cash_like_positions=summary.cash_like_positions,
+                pending_activity_value=getattr(summary, "pending_activity_value", 0.0),
+            )
+            print_surface_results(surface)
+
+        # Replay historical windows against the current portfolio
+        if args.replay or args.rolling > 0:
+            prices = load_price_history(
+                [group.ticker for group in groups],
+                data_fetcher,
+                period=args.replay_period,
+            )
+            if args.replay:
+                start, end = HISTORICAL_SCENARIOS.get(
+                    args.replay, args.replay.split(":", 1)
+                )
+                replay = simulate_historical_replay(
+                    groups,
+                    prices,
+                    start,
+                    end,
+                    cash_like_positions=summary.cash_like_positions,
+                    pending_activity_value=getattr(
+                        summary, "pending_activity_value", 0.0
+                    ),
+                )
+                print_replay_results(replay, args.replay)
+            if args.rolling > 0:
+                rolling = simulate_rolling_replays(
+                    groups, prices, args.rolling, workers=args.workers
+                )
+                print_rolling_results(rolling, args.rolling)
+
     except Exception:
         import traceback
 
@@ -9,6 +9,13 @@ from datetime import datetime, timedelta
 import pandas as pd
 import requests
 
+from src.price_cache import (
+    CACHE_READ_ERRORS,
+    HistoryStore,
+    MemoryCache,
+    create_price_cache,
+    load_cache_config,
+)
 from src.stockdata import DataFetcherInterface
 
 # Setup logging
@@ -25,8 +32,8 @@ class DataFetcher(DataFetcherInterface):
     # Default period for beta calculations
     beta_period = "3m"
 
-    def __init__(self, cache_dir=".cache_fmp"):
-        """Initialize with cache directory"""
+    def __init__(self, cache_dir=".cache_fmp", cache_config=None):
+        """Initialize with cache directory and optional cache settings (see YFinanceDataFetcher)"""
         self.cache_dir = cache_dir
         self.api_key = os.environ.get("FMP_API_KEY")
 
@@ -56,6 +63,23 @@ class DataFetcher(DataFetcherInterface):
         # Create cache directory if it doesn't exist
         os.makedirs(cache_dir, exist_ok=True)
 
+        # Get cache settings from config if not specified
+        if cache_config is None:
+            cache_config = load_cache_config()
+        self.cache = create_price_cache(cache_config.get("backend"), cache_dir)
+
+        # Keep one history per ticker and slice periods from it, if enabled
+        self.history_store = None
+        if cache_config.get("canonical_history"):
+            self.history_store = HistoryStore(
+                self.cache,
+                self.cache_ttl,
+                incremental=bool(cache_config.get("incremental_refresh")),
+            )
+
+        # Keep recently used DataFrames in memory in front of the disk cache
+        self.memory_cache = MemoryCache(cache_config.get("memory_cache_size", 0))
+
         # Check for API key
         if not self.api_key:
             raise ValueError(
@@ -78,8 +102,31 @@ class DataFetcher(DataFetcherInterface):
         Raises:
             ValueError: If no data is returned from API
         """
+        memory_key = (ticker, period, interval)
+        df = self.memory_cache.get(memory_key)
+        if df is not None:
+            return df
+
+        df = self._fetch_data_with_disk_cache(ticker, period, interval)
+        self.memory_cache.put(
+            memory_key, df, self.get_cache_path(ticker, period, interval), self.cache_ttl
+        )
+        return df
+
+    def get_cache_path(self, ticker, period="3m", interval="1d"):
+        """Get the path of the disk entry that data for a period is loaded from"""
+        if self.history_store is not None:
+            return self.history_store.get_path(ticker, interval)
+        return self.cache.get_path(ticker, f"{period}_{interval}")
+
+    def _fetch_data_with_disk_cache(self, ticker, period, interval):
+        """Fetch stock data for a ticker from the disk cache or the API"""
+        if self.history_store is not None:
+            return self._fetch_from_history(ticker, period, interval)
+
         # Check cache first
-        cache_file = os.path.join(self.cache_dir, f"{ticker}_{period}_{interval}.csv")
+        cache_key = f"{period}_{interval}"
+        cache_file = self.cache.get_path(ticker, cache_key)
 
         # Use the centralized cache validation logic
         from src.stockdata import should_use_cache
@@ -88,7 +135,7 @@ class DataFetcher(DataFetcherInterface):
 
         if should_use:
             logger.debug(f"Loading cached data for {ticker}: {reason}")
-            return pd.read_csv(cache_file, index_col=0, parse_dates=True)
+            return self.cache.read(ticker, cache_key)
         else:
             logger.debug(f"Cache for {ticker} is not valid: {reason}")
 
@@ -99,7 +146,7 @@ class DataFetcher(DataFetcherInterface):
 
             if df is not None and not df.empty:
                 # Save to cache
-                df.to_csv(cache_file)
+                self.cache.write(ticker, cache_key, df)
                 return df
             else:
                 # This is a valid case - API returned no data for a valid ticker
@@ -115,8 +162,8 @@ class DataFetcher(DataFetcherInterface):
             if os.path.exists(cache_file):
                 logger.warning(f"Using expired cache for {ticker} as fallback")
                 try:
-                    return pd.read_csv(cache_file, index_col=0, parse_dates=True)
-                except (pd.errors.ParserError, pd.errors.EmptyDataError) as cache_e:
+                    return self.cache.read(ticker, cache_key)
+                except CACHE_READ_ERRORS as cache_e:
                     logger.error(f"Error reading cache for {ticker}: {cache_e}")
                     # If we can't read the cache, re-raise the original error
                     raise e from cache_e
@@ -142,6 +189,31 @@ class DataFetcher(DataFetcherInterface):
             )
             raise
 
+    def _fetch_from_history(self, ticker, period, interval):
+        """Fetch stock data for a ticker through the history store"""
+        try:
+            return self.history_store.fetch(
+                ticker,
+                period,
+                interval,
+                lambda start, end: self._fetch_range(ticker, period, start, end),
+            )
+        except ValueError as e:
+            # Match fetch_data: no data and no history is not an error
+            if "No historical data found" in str(e):
+                logger.warning(
+                    f"No historical data found for {ticker} and no cache available"
+                )
+                return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+            raise
+
+    def _fetch_range(self, ticker, period, start, end):
+        """Fetch a date range from the API, raising ValueError if it is empty"""
+        df = self._fetch_from_api(ticker, period, start=start, end=end)
+        if df is None or df.empty:
+            raise ValueError(f"No historical data found for {ticker}")
+        return df
+
     def fetch_market_data(self, market_index="SPY", period=None, interval="1d"):
         """
         Fetch market index data for beta calculations.
@@ -162,12 +234,19 @@ class DataFetcher(DataFetcherInterface):
         logger.debug(f"Fetching market data for {market_index}")
         return self.fetch_data(market_index, period, interval)
 
-    def _fetch_from_api(self, ticker, period="5y"):
-        """Fetch data from Financial Modeling Prep API"""
+    def _fetch_from_api(self, ticker, period="5y", start=None, end=None):
+        """
+        Fetch data from Financial Modeling Prep API
+
+        The date range comes from period unless start is given. end, if given,
+        is exclusive.
+        """
         # Determine date range based on period
-        end_date = datetime.now()
+        end_date = datetime.now() if end is None else end - timedelta(days=1)
 
-        if period.endswith("y"):
+        if start is not None:
+            start_date = start
+        elif period.endswith("y"):
             years = int(period[:-1])
             start_date = end_date - timedelta(days=365 * years)
         elif period.endswith("m"):
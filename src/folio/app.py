@@ -30,6 +30,7 @@ from .data_model import OptionPosition, PortfolioGroup, StockPosition
 from .error_utils import handle_callback_error
 from .logger import logger
 from .security import sanitize_dataframe, validate_csv_upload
+from .store import decode_groups, decode_summary, encode_groups, encode_summary
 
 # Load the Bootstrap template for Plotly figures
 load_figure_template("bootstrap")
@@ -434,7 +435,7 @@ def create_app(portfolio_file: str | None = None, _debug: bool = False) -> dash.
         """Show empty state when no data is loaded and collapse upload section when data is loaded"""
         logger.debug(f"TOGGLE_EMPTY_STATE called with groups_data: {bool(groups_data)}")
 
-        if not groups_data:
+        if not groups_data or not decode_groups(groups_data):
             # No data, show empty state, hide main content, keep upload open
             logger.debug(
                 "TOGGLE_EMPTY_STATE: No data, showing empty state, hiding main content"
@@ -604,12 +605,11 @@ def create_app(portfolio_file: str | None = None, _debug: bool = False) -> dash.
             )
             # Continue with the original summary if price update fails
 
-            # Convert to Dash-compatible format
-            groups_data = [g.to_dict() for g in groups]
-            summary_data = summary.to_dict()
-            logger.debug(f"Summary data keys: {list(summary_data.keys())}")
+            # Encode for the dcc.Store components
+            groups_data = encode_groups(groups)
+            summary_data = encode_summary(summary)
             logger.debug(
-                f"Portfolio estimate value: {summary_data.get('portfolio_estimate_value', 'NOT FOUND')}"
+                f"Portfolio estimate value: {summary.portfolio_estimate_value}"
             )
             portfolio_data = df.to_dict("records")
 
@@ -686,34 +686,7 @@ def create_app(portfolio_file: str | None = None, _debug: bool = False) -> dash.
                 )
 
             # Convert data back to PortfolioGroup objects
-            groups = []
-            for g in groups_data:
-                # Filter out attributes that don't exist in Position class
-                stock_position = None
-                if g["stock_position"]:
-                    stock_position_data = g["stock_position"].copy()
-                    # Remove attributes that don't exist in StockPosition class
-                    if "sector" in stock_position_data:
-                        stock_position_data.pop("sector")
-                    if "is_cash_like" in stock_position_data:
-                        stock_position_data.pop("is_cash_like")
-                    if "position_type" in stock_position_data:
-                        stock_position_data.pop("position_type")
-                    stock_position = StockPosition(**stock_position_data)
-                option_positions = [
-                    OptionPosition(**opt) for opt in g["option_positions"]
-                ]
-                group = PortfolioGroup(
-                    ticker=g["ticker"],
-                    stock_position=stock_position,
-                    option_positions=option_positions,
-                    net_exposure=g["net_exposure"],
-                    beta=g["beta"],
-                    beta_adjusted_exposure=g["beta_adjusted_exposure"],
-                    total_delta_exposure=g["total_delta_exposure"],
-                    options_delta_exposure=g["options_delta_exposure"],
-                )
-                groups.append(group)
+            groups = decode_groups(groups_data)
 
             # Determine which filter button was clicked
             ctx = dash.callback_context
@@ -725,30 +698,17 @@ def create_app(portfolio_file: str | None = None, _debug: bool = False) -> dash.
 
             # Get cash-like positions from summary data
             cash_like_positions = []
-            if summary_data and "cash_like_positions" in summary_data:
+            if summary_data:
                 # Convert cash-like positions to PortfolioGroup objects
-                for pos in summary_data["cash_like_positions"]:
-                    # Create a StockPosition
-                    stock_pos = StockPosition(
-                        ticker=pos["ticker"],
-                        quantity=pos["quantity"],
-                        beta=pos["beta"],
-                        market_exposure=pos.get(
-                            "market_exposure", pos.get("market_value", 0.0)
-                        ),  # Use market_exposure or fall back to market_value
-                        beta_adjusted_exposure=pos["beta_adjusted_exposure"],
-                    )
-
+                for stock_pos in decode_summary(summary_data).cash_like_positions:
                     # Create a PortfolioGroup with just this stock position
                     cash_group = PortfolioGroup(
-                        ticker=pos["ticker"],
+                        ticker=stock_pos.ticker,
                         stock_position=stock_pos,
                         option_positions=[],
-                        net_exposure=pos.get(
-                            "market_exposure", pos.get("market_value", 0.0)
-                        ),
-                        beta=pos["beta"],
-                        beta_adjusted_exposure=pos["beta_adjusted_exposure"],
+                        net_exposure=stock_pos.market_exposure,
+                        beta=stock_pos.beta,
+                        beta_adjusted_exposure=stock_pos.beta_adjusted_exposure,
                         total_delta_exposure=0.0,
                         options_delta_exposure=0.0,
                     )
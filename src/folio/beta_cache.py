@@ -0,0 +1,181 @@
+"""Persistent beta cache.
+
+This module provides a SQLite-backed store for calculated betas, so reloading
+a portfolio does not redo beta calculations that cannot have changed.
+
+Betas are keyed by ticker, market index, period and the date of the most recent
+2PM Pacific cutoff (see get_cache_date in src/stockdata.py), so they expire on
+the same schedule as the price cache. Each beta also records a stamp of the
+price cache files it was calculated from, and a changed stamp makes it a miss.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date
+
+from src.stockdata import get_cache_date
+
+from .logger import logger
+
+
+class BetaCache:
+    """SQLite store of betas keyed by ticker, market index, period and date."""
+
+    def __init__(self, db_path: str):
+        """Initialize the beta cache.
+
+        The database is opened, and created if needed, on first use.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn = None
+        # Portfolio loads may calculate betas from worker threads
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database if needed. Must be called with the lock held.
+
+        Entries from before the current cache date are removed on open.
+
+        Returns:
+            The open database connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or created
+        """
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS betas (
+                    ticker TEXT NOT NULL,
+                    market_index TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    as_of TEXT NOT NULL,
+                    price_stamp TEXT NOT NULL,
+                    beta REAL NOT NULL,
+                    PRIMARY KEY (ticker, market_index, period, as_of)
+                )
+                """
+            )
+            conn.execute(
+                "DELETE FROM betas WHERE as_of < ?", (get_cache_date().isoformat(),)
+            )
+        self._conn = conn
+        return conn
+
+    def get(
+        self,
+        ticker: str,
+        market_index: str,
+        period: str,
+        price_stamp: str,
+        as_of: date | None = None,
+    ) -> float | None:
+        """Get a cached beta.
+
+        Args:
+            ticker: The instrument's symbol
+            market_index: The market index the beta is measured against
+            period: The price history period the beta is calculated over
+            price_stamp: Stamp of the price cache files the beta depends on
+            as_of: Cache date. If None, uses the current cache date.
+
+        Returns:
+            The cached beta, or None if it is missing, expired or was calculated
+            from different price data
+        """
+        as_of = as_of or get_cache_date()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT beta, price_stamp FROM betas "
+                    "WHERE ticker = ? AND market_index = ? AND period = ? AND as_of = ?",
+                    (ticker, market_index, period, as_of.isoformat()),
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Error reading beta cache for {ticker}: {e}")
+            return None
+
+        if row is None or row[1] != price_stamp:
+            return None
+        return row[0]
+
+    def put(
+        self,
+        ticker: str,
+        market_index: str,
+        period: str,
+        price_stamp: str,
+        beta: float,
+        *,
+        as_of: date | None = None,
+    ) -> None:
+        """Store a beta, replacing any entry with the same key.
+
+        Args:
+            ticker: The instrument's symbol
+            market_index: The market index the beta is measured against
+            period: The price history period the beta is calculated over
+            price_stamp: Stamp of the price cache files the beta depends on
+            beta: The calculated beta
+            as_of: Cache date. If None, uses the current cache date.
+        """
+        as_of = as_of or get_cache_date()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO betas VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            ticker,
+                            market_index,
+                            period,
+                            as_of.isoformat(),
+                            price_stamp,
+                            float(beta),
+                        ),
+                    )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Error writing beta cache for {ticker}: {e}")
+
+    def invalidate(self, ticker: str | None = None) -> None:
+        """Remove cached betas.
+
+        Args:
+            ticker: Remove only this instrument's betas, or all betas if None.
+                Invalidating the market index removes every beta measured
+                against it.
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    if ticker is None:
+                        conn.execute("DELETE FROM betas")
+                    else:
+                        conn.execute(
+                            "DELETE FROM betas WHERE ticker = ? OR market_index = ?",
+                            (ticker, ticker),
+                        )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Error invalidating beta cache: {e}")
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -10,6 +10,7 @@ from .data_model import PortfolioGroup, PortfolioSummary
 from .formatting import format_compact_currency, format_currency
 from .logger import logger
 from .portfolio import calculate_beta_adjusted_net_exposure
+from .portfolio_frame import PortfolioFrame
 from .portfolio_value import (
     calculate_component_percentages,
     get_portfolio_component_values,
@@ -193,35 +194,12 @@ def transform_for_treemap(
     colors.append("#FFFFFF")  # White for root
 
     # Group by ticker
-    # First, collect all unique tickers and calculate their total exposure
-    ticker_exposures = {}
-    for group in portfolio_groups:
-        ticker = group.ticker
-        exposure = 0
-
-        # Add stock position exposure
-        stock_exposure = 0
-        if group.stock_position:
-            # Use market exposure for stocks
-            stock_exposure = group.stock_position.market_exposure
-            logger.debug(f"Ticker {ticker} stock exposure: {stock_exposure}")
-            exposure += stock_exposure
-
-        # Add option positions exposure (delta exposure)
-        option_exposure = 0
-        for option in group.option_positions:
-            logger.debug(
-                f"Ticker {ticker} option {option.option_type} delta_exposure: {option.delta_exposure}"
-            )
-            option_exposure += option.delta_exposure
-
-        exposure += option_exposure
-        logger.debug(
-            f"Ticker {ticker} total exposure: {exposure} (stock: {stock_exposure}, options: {option_exposure})"
-        )
-
-        # Store the net exposure value for sizing (not absolute)
-        ticker_exposures[ticker] = exposure
+    # Net exposure per ticker: stock market exposure plus option delta exposure
+    frame = PortfolioFrame.from_groups(portfolio_groups)
+    ticker_exposures = dict(
+        zip(frame.tickers, frame.calculate_net_exposures().tolist(), strict=True)
+    )
+    logger.debug(f"Ticker exposures: {ticker_exposures}")
 
     # Sort tickers by absolute exposure (largest first)
     sorted_tickers = sorted(
@@ -519,6 +497,67 @@ def transform_for_allocations_chart(
     return chart_data
 
 
+def transform_for_scenario_surface(
+    surface: dict[str, Any], days_index: int = 0
+) -> dict[str, Any]:
+    """Transform a scenario surface into a P&L heatmap for one horizon.
+
+    Args:
+        surface: Results of simulate_portfolio_surface
+        days_index: Index into the surface's days_forward axis
+
+    Returns:
+        Dict containing data and layout for a heatmap of P&L by SPY change (x)
+        and volatility shift (y)
+    """
+    logger.debug("Transforming data for scenario surface")
+
+    days = surface["days_forward"][days_index]
+    pnl = surface["pnl"][days_index]
+    spy_labels = [f"{change:+.0%}" for change in surface["spy_changes"]]
+    volatility_labels = [
+        f"{shift * 100:+.0f} pts" for shift in surface["volatility_shifts"]
+    ]
+    text_values = [[format_currency(value) for value in row] for row in pnl]
+
+    return {
+        "data": [
+            {
+                "type": "heatmap",
+                "x": spy_labels,
+                "y": volatility_labels,
+                "z": pnl.tolist(),
+                "text": text_values,
+                "hovertemplate": "SPY %{x}, volatility %{y}<br>P&L: %{text}<extra></extra>",
+                # Losses shade towards the short color, gains towards the long color
+                "colorscale": [
+                    [0.0, ChartColors.SHORT],
+                    [0.5, "white"],
+                    [1.0, ChartColors.LONG],
+                ],
+                "zmid": 0,
+            }
+        ],
+        "layout": {
+            "title": {
+                "text": f"P&L in {days} Days" if days else "P&L Today",
+                "font": {"size": 16, "color": "#2C3E50"},
+                "x": 0.5,
+                "xanchor": "center",
+            },
+            "xaxis": {"title": "SPY Change", "tickfont": {"size": 11}},
+            "yaxis": {"title": "Volatility Shift", "tickfont": {"size": 11}},
+            "margin": {"l": 80, "r": 20, "t": 50, "b": 50, "pad": 4},
+            "autosize": True,
+            "plot_bgcolor": "white",
+            "paper_bgcolor": "white",
+            "font": {
+                "family": "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif"
+            },
+        },
+    }
+
+
 def create_dashboard_metrics(
     portfolio_summary: PortfolioSummary,
 ) -> list[dict[str, str]]:
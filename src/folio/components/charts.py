@@ -13,10 +13,12 @@ from ..chart_data import (
     create_dashboard_metrics,
     transform_for_allocations_chart,
     transform_for_exposure_chart,
+    transform_for_scenario_surface,
     transform_for_treemap,
 )
-from ..data_model import PortfolioGroup, PortfolioSummary
 from ..logger import logger
+from ..simulator import DEFAULT_DAYS_FORWARD, simulate_portfolio_surface
+from ..store import decode_groups, decode_summary
 from .summary_cards import create_summary_cards
 
 
@@ -157,6 +159,50 @@ def create_allocations_chart():
     )
 
 
+def create_scenario_surface_chart():
+    """Create a scenario surface heatmap component."""
+    logger.debug("Creating scenario surface chart component")
+    return html.Div(
+        [
+            dcc.Graph(
+                id="scenario-surface-chart",
+                config=get_chart_config(),
+                className="dash-chart",
+                # Add an empty figure to ensure proper initialization
+                figure={
+                    "data": [],
+                    "layout": {
+                        "height": 350,
+                        "margin": {"l": 80, "r": 20, "t": 50, "b": 50},
+                        "paper_bgcolor": "white",
+                        "plot_bgcolor": "white",
+                        "autosize": True,
+                    },
+                },
+                style={"width": "100%", "height": "100%"},
+            ),
+            # Controls for choosing the horizon
+            html.Div(
+                dbc.RadioItems(
+                    id="scenario-surface-days",
+                    options=[
+                        {"label": f"{days} Days" if days else "Today", "value": days}
+                        for days in DEFAULT_DAYS_FORWARD
+                    ],
+                    value=DEFAULT_DAYS_FORWARD[0],
+                    inline=True,
+                    className="btn-group chart-toggle-buttons",
+                    inputClassName="btn-check",
+                    labelClassName="btn btn-outline-primary btn-sm px-3",
+                    labelCheckedClassName="active",
+                ),
+                className="d-flex justify-content-center mt-3",
+            ),
+        ],
+        className="mb-4",
+    )
+
+
 # Sector chart removed for now - will be implemented in a separate task
 
 
@@ -231,6 +277,18 @@ def create_dashboard_section():
                             ],
                             className="mb-4 chart-card",
                         ),
+                        # Scenario Surface Heatmap (in its own card)
+                        dbc.Card(
+                            [
+                                dbc.CardHeader("P&L by SPY Change and Volatility"),
+                                dbc.CardBody(
+                                    [
+                                        create_scenario_surface_chart(),
+                                    ]
+                                ),
+                            ],
+                            className="mb-4 chart-card",
+                        ),
                     ]
                 ),
                 id="charts-collapse",
@@ -272,8 +330,8 @@ def register_callbacks(app):
             return html.Div("No portfolio data available")
 
         try:
-            # Convert the JSON data back to a PortfolioSummary object
-            portfolio_summary = PortfolioSummary.from_dict(summary_data)
+            # Convert the stored data back to a PortfolioSummary object
+            portfolio_summary = decode_summary(summary_data)
 
             # Create metric cards
             metrics = create_dashboard_metrics(portfolio_summary)
@@ -360,33 +418,16 @@ def register_callbacks(app):
 
             logger.debug(f"Using beta-adjusted: {use_beta_adjusted}")
 
-            # Convert the JSON data back to a PortfolioSummary object
+            # Convert the stored data back to a PortfolioSummary object
             try:
                 logger.debug("Attempting to deserialize PortfolioSummary")
-                portfolio_summary = PortfolioSummary.from_dict(summary_data)
+                portfolio_summary = decode_summary(summary_data)
                 logger.debug("Successfully deserialized PortfolioSummary")
             except Exception as deser_err:
                 logger.error(
                     f"Error deserializing PortfolioSummary: {deser_err}", exc_info=True
                 )
-                # Check if pending_activity_value is missing
-                if "pending_activity_value" not in summary_data:
-                    logger.warning("pending_activity_value missing from summary_data")
-                    # Add it with a default value
-                    summary_data["pending_activity_value"] = 0.0
-                    try:
-                        portfolio_summary = PortfolioSummary.from_dict(summary_data)
-                        logger.debug(
-                            "Successfully deserialized after adding pending_activity_value"
-                        )
-                    except Exception as retry_err:
-                        logger.error(
-                            f"Still failed after adding pending_activity_value: {retry_err}",
-                            exc_info=True,
-                        )
-                        raise
-                else:
-                    raise
+                raise
 
             # Transform the data for the chart
             try:
@@ -436,26 +477,10 @@ def register_callbacks(app):
             return {"data": [], "layout": {"height": 400}}
 
         try:
-            # Log the groups data for debugging
-            logger.debug(f"Treemap groups data count: {len(groups_data)}")
-            if groups_data:
-                logger.debug(f"First group keys: {list(groups_data[0].keys())}")
-
-            # Convert the JSON data back to a list of PortfolioGroup objects
+            # Convert the stored data back to a list of PortfolioGroup objects
             try:
                 logger.debug("Attempting to deserialize PortfolioGroups")
-                portfolio_groups = []
-                for i, group in enumerate(groups_data):
-                    try:
-                        portfolio_group = PortfolioGroup.from_dict(group)
-                        portfolio_groups.append(portfolio_group)
-                    except Exception as group_err:
-                        logger.error(
-                            f"Error deserializing group {i}: {group_err}", exc_info=True
-                        )
-                        # Log the problematic group data
-                        logger.debug(f"Problematic group data: {group}")
-                        raise
+                portfolio_groups = decode_groups(groups_data)
                 logger.debug(
                     f"Successfully deserialized {len(portfolio_groups)} PortfolioGroups"
                 )
@@ -493,6 +518,45 @@ def register_callbacks(app):
                 },
             }
 
+    # Scenario Surface callback
+    @app.callback(
+        Output("scenario-surface-chart", "figure"),
+        [
+            Input("portfolio-groups", "data"),
+            Input("scenario-surface-days", "value"),
+        ],
+    )
+    def update_scenario_surface(groups_data, days):
+        """Update the scenario surface heatmap for the selected horizon."""
+        if not groups_data:
+            # Return empty figure if no data
+            logger.debug("No groups data for scenario surface chart")
+            return {"data": [], "layout": {"height": 350}}
+
+        try:
+            portfolio_groups = decode_groups(groups_data)
+            if not portfolio_groups:
+                return {"data": [], "layout": {"height": 350}}
+
+            # Only the selected horizon is shown, so only it is simulated
+            surface = simulate_portfolio_surface(portfolio_groups, days_forward=[days])
+            return transform_for_scenario_surface(surface)
+        except Exception as e:
+            logger.error(f"Error updating scenario surface: {e}", exc_info=True)
+            return {
+                "data": [],
+                "layout": {
+                    "height": 350,
+                    "annotations": [
+                        {
+                            "text": f"Error: {e!s}",
+                            "showarrow": False,
+                            "font": {"color": "red"},
+                        }
+                    ],
+                },
+            }
+
     # Allocations Chart callback
     @app.callback(
         Output("allocations-chart", "figure"),
@@ -506,12 +570,12 @@ def register_callbacks(app):
             return {"data": [], "layout": {"height": 300}}
 
         try:
-            # Convert the JSON data back to a PortfolioSummary object
+            # Convert the stored data back to a PortfolioSummary object
             try:
                 logger.debug(
                     "Attempting to deserialize PortfolioSummary for allocations chart"
                 )
-                portfolio_summary = PortfolioSummary.from_dict(summary_data)
+                portfolio_summary = decode_summary(summary_data)
                 logger.debug(
                     "Successfully deserialized PortfolioSummary for allocations chart"
                 )
@@ -520,24 +584,7 @@ def register_callbacks(app):
                     f"Error deserializing PortfolioSummary for allocations chart: {deser_err}",
                     exc_info=True,
                 )
-                # Check if pending_activity_value is missing
-                if "pending_activity_value" not in summary_data:
-                    logger.warning("pending_activity_value missing from summary_data")
-                    # Add it with a default value
-                    summary_data["pending_activity_value"] = 0.0
-                    try:
-                        portfolio_summary = PortfolioSummary.from_dict(summary_data)
-                        logger.debug(
-                            "Successfully deserialized after adding pending_activity_value"
-                        )
-                    except Exception as retry_err:
-                        logger.error(
-                            f"Still failed after adding pending_activity_value: {retry_err}",
-                            exc_info=True,
-                        )
-                        raise
-                else:
-                    raise
+                raise
 
             # Transform the data for the chart
             try:
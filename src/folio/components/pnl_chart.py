@@ -12,10 +12,10 @@ import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from dash import ALL, Input, Output, State, callback_context, dcc, html
 
-from ..data_model import OptionPosition, PortfolioGroup, StockPosition
 from ..formatting import format_currency
 from ..logger import logger
 from ..pnl import calculate_strategy_pnl, determine_price_range, summarize_strategy_pnl
+from ..store import decode_groups
 
 
 def create_pnl_chart(
@@ -464,10 +464,9 @@ def register_callbacks(app):
             ticker = button_id.split('"index":"')[1].split('"')[0]
 
             # Find matching group by ticker
-            for group_data in groups_data:
-                group_ticker = group_data["ticker"]
-                if group_ticker == ticker:
-                    position_data = group_data
+            for group in decode_groups(groups_data):
+                if group.ticker == ticker:
+                    position_data = group
                     break
 
         # If modal is already open and we're just changing modes, we need to preserve the modal state
@@ -479,10 +478,9 @@ def register_callbacks(app):
 
             if ticker:
                 # Find matching group by ticker
-                for group_data in groups_data:
-                    group_ticker = group_data["ticker"]
-                    if group_ticker == ticker:
-                        position_data = group_data
+                for group in decode_groups(groups_data):
+                    if group.ticker == ticker:
+                        position_data = group
                         break
 
             # If we still don't have position data, show an error
@@ -528,55 +526,8 @@ def register_callbacks(app):
                     "tab-pnl",  # Reset to P&L tab
                 )
 
-        # Convert position data to objects
         if position_data:
-            # Create stock position if it exists
-            stock_position = None
-            if position_data["stock_position"]:
-                stock_data = position_data["stock_position"]
-                stock_position = StockPosition(
-                    ticker=stock_data["ticker"],
-                    quantity=stock_data["quantity"],
-                    price=stock_data["price"],
-                    beta=stock_data["beta"],
-                    market_exposure=stock_data["market_exposure"],
-                    beta_adjusted_exposure=stock_data["beta_adjusted_exposure"],
-                    cost_basis=stock_data.get("cost_basis", stock_data["price"]),
-                )
-
-            # Create option positions if they exist
-            option_positions = []
-            for opt_data in position_data["option_positions"]:
-                option_position = OptionPosition(
-                    ticker=opt_data["ticker"],
-                    position_type="option",
-                    quantity=opt_data["quantity"],
-                    strike=opt_data["strike"],
-                    expiry=opt_data["expiry"],
-                    option_type=opt_data["option_type"],
-                    price=opt_data["price"],
-                    delta=opt_data["delta"],
-                    delta_exposure=opt_data["delta_exposure"],
-                    notional_value=opt_data["notional_value"],
-                    beta=opt_data.get("beta", 1.0),
-                    beta_adjusted_exposure=opt_data["beta_adjusted_exposure"],
-                    market_exposure=opt_data["market_exposure"],
-                    underlying_beta=opt_data.get("underlying_beta", 1.0),
-                    cost_basis=opt_data.get("cost_basis", opt_data["price"]),
-                )
-                option_positions.append(option_position)
-
-            # Create portfolio group
-            group = PortfolioGroup(
-                ticker=position_data["ticker"],
-                stock_position=stock_position,
-                option_positions=option_positions,
-                net_exposure=position_data["net_exposure"],
-                beta=position_data["beta"],
-                beta_adjusted_exposure=position_data["beta_adjusted_exposure"],
-                total_delta_exposure=position_data["total_delta_exposure"],
-                options_delta_exposure=position_data["options_delta_exposure"],
-            )
+            group = position_data
 
             # Get all positions
             all_positions = []
@@ -617,10 +568,16 @@ def register_callbacks(app):
                 price_range=price_range,
                 num_points=100,
                 use_cost_basis=use_cost_basis,
+                adaptive=True,
             )
 
             # Generate summary
-            summary = summarize_strategy_pnl(pnl_data, current_price)
+            summary = summarize_strategy_pnl(
+                pnl_data,
+                current_price,
+                positions=all_positions,
+                use_cost_basis=use_cost_basis,
+            )
 
             # Create chart
             fig = create_pnl_chart(
@@ -317,8 +317,8 @@ def register_callbacks(app):
             try:
                 # Import here to avoid circular imports
                 from ..ai_utils import prepare_portfolio_data_for_analysis
-                from ..data_model import PortfolioGroup, PortfolioSummary
                 from ..gemini_client import GeminiClient
+                from ..store import decode_groups, decode_summary
 
                 # Check if the message is related to finance/portfolio
                 non_financial_keywords = [
@@ -347,8 +347,8 @@ def register_callbacks(app):
                     )
                 else:
                     # Prepare portfolio data for analysis
-                    groups = [PortfolioGroup.from_dict(g) for g in groups_data]
-                    summary = PortfolioSummary.from_dict(summary_data)
+                    groups = decode_groups(groups_data)
+                    summary = decode_summary(summary_data)
                     portfolio_data = prepare_portfolio_data_for_analysis(
                         groups, summary
                     )
@@ -11,6 +11,7 @@ from dash import html
 from ..formatting import format_currency
 from ..logger import logger
 from ..portfolio import calculate_beta_adjusted_net_exposure
+from ..store import decode_summary
 
 
 def error_values():
@@ -582,23 +583,26 @@ def register_callbacks(app):
         logger.debug("Updating summary cards")
         logger.debug(f"Summary data type: {type(summary_data)}")
 
-        # Log the structure of the summary data
-        if summary_data:
-            logger.debug("Summary data keys: %s", list(summary_data.keys()))
-            for key in summary_data.keys():
-                if isinstance(summary_data[key], dict):
-                    logger.debug(f"  {key} (dict): {list(summary_data[key].keys())}")
-                elif isinstance(summary_data[key], list):
-                    logger.debug(f"  {key} (list): {len(summary_data[key])} items")
-                else:
-                    logger.debug(f"  {key}: {summary_data[key]}")
-        else:
+        if not summary_data:
             # Return error values when no summary data is available (normal during initial load)
             return error_values()
 
         try:
+            # Convert the stored data back to a summary dictionary
+            summary_dict = decode_summary(summary_data).to_dict()
+
+            # Log the structure of the summary data
+            logger.debug("Summary data keys: %s", list(summary_dict.keys()))
+            for key, value in summary_dict.items():
+                if isinstance(value, dict):
+                    logger.debug(f"  {key} (dict): {list(value.keys())}")
+                elif isinstance(value, list):
+                    logger.debug(f"  {key} (list): {len(value)} items")
+                else:
+                    logger.debug(f"  {key}: {value}")
+
             # Call the format function
-            formatted_values = format_summary_card_values(summary_data)
+            formatted_values = format_summary_card_values(summary_dict)
 
             # Log the formatted values
             logger.debug(f"Formatted summary card values: {formatted_values}")
@@ -51,8 +51,13 @@ class DataFetcherSingleton:
             data_source = config.get("app", {}).get("data_source", "yfinance")
             logger.info(f"Using data source: {data_source}")
 
+            # Get cache settings from config (fetcher default if not specified)
+            cache_config = config.get("app", {}).get("cache")
+
             # Create data fetcher using factory
-            data_fetcher = create_data_fetcher(source=data_source)
+            data_fetcher = create_data_fetcher(
+                source=data_source, cache_config=cache_config
+            )
 
             if data_fetcher is None:
                 raise RuntimeError(
@@ -1,6 +1,7 @@
 import datetime
-from dataclasses import dataclass
-from typing import Literal, TypedDict
+import functools
+from dataclasses import dataclass, fields
+from typing import Literal, Self, TypedDict
 
 
 class PositionDict(TypedDict):
@@ -96,7 +97,34 @@ class PortfolioSummaryDict(TypedDict):
     )  # ISO format timestamp of when prices were last updated
 
 
-@dataclass
+@functools.cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    """Names of a dataclass's fields, including inherited ones."""
+    return tuple(field.name for field in fields(cls))
+
+
+def _copy_with(instance, changes: dict):
+    """Shallow-copy a slotted dataclass instance, replacing some fields.
+
+    The copy is filled in field by field without calling __init__, so none of
+    the constructor's defaults or derived values are recomputed.
+
+    Raises:
+        AttributeError: If a change names an attribute the class does not have
+    """
+    copy = object.__new__(type(instance))
+    for name in _field_names(type(instance)):
+        setattr(copy, name, getattr(instance, name))
+    for name, value in changes.items():
+        setattr(copy, name, value)
+    return copy
+
+
+# Position classes are slotted: simulations create one instance per leg per
+# scenario, and slots make each instance smaller.
+# Slotted dataclasses are rebuilt by the decorator, so subclasses call base
+# class methods explicitly rather than through zero-argument super().
+@dataclass(slots=True)
 class Position:
     """Base class for all positions"""
 
@@ -145,6 +173,20 @@ class Position:
         else:
             self.market_value = market_value
 
+    def copy_with(self, **changes) -> Self:
+        """Copy the position with some fields replaced, without re-running __init__.
+
+        The copy is shallow. Changed values are not validated or used to
+        derive other fields, so callers pass every field that changes.
+
+        Args:
+            **changes: New values for fields, by name
+
+        Returns:
+            A new instance of the same class
+        """
+        return _copy_with(self, changes)
+
     def to_dict(self) -> PositionDict:
         """Convert to a typed dictionary"""
         return {
@@ -182,7 +224,7 @@ class Position:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class OptionPosition(Position):
     """Class for option positions"""
 
@@ -241,7 +283,8 @@ class OptionPosition(Position):
             market_value = price * quantity * 100
 
         # Call the parent class constructor
-        super().__init__(
+        Position.__init__(
+            self,
             ticker=ticker,
             position_type=position_type,
             quantity=quantity,
@@ -325,28 +368,19 @@ class OptionPosition(Position):
             implied_volatility,
         )
 
-        # Create a new instance with updated values
-        return OptionPosition(
-            ticker=self.ticker,
-            position_type=self.position_type,
-            quantity=self.quantity,
-            beta=self.beta,
+        # Copy with the updated values
+        return self.copy_with(
             beta_adjusted_exposure=exposures["beta_adjusted_exposure"],
-            strike=self.strike,
-            expiry=self.expiry,
-            option_type=self.option_type,
             delta=exposures["delta"],
             delta_exposure=exposures["delta_exposure"],
             notional_value=new_notional_value,  # Use the new notional value
-            underlying_beta=self.underlying_beta,
             market_exposure=exposures["delta_exposure"],
             price=new_price,
-            cost_basis=self.cost_basis,
             market_value=new_price * self.quantity * 100,
         )
 
     def to_dict(self) -> OptionPositionDict:
-        base_dict = super().to_dict()
+        base_dict = Position.to_dict(self)
         return {
             **base_dict,
             "strike": self.strike,
@@ -414,7 +448,7 @@ class OptionPosition(Position):
             raise
 
 
-@dataclass
+@dataclass(slots=True)
 class StockPosition:
     """Details of a stock position
 
@@ -475,6 +509,10 @@ class StockPosition:
         else:
             self.market_value = market_value
 
+    def copy_with(self, **changes) -> Self:
+        """Copy the position with some fields replaced (see Position.copy_with)."""
+        return _copy_with(self, changes)
+
     def recalculate_with_price(self, new_price: float) -> "StockPosition":
         """Create a new StockPosition with recalculated values based on a new price.
 
@@ -491,16 +529,11 @@ class StockPosition:
         # For stocks, beta-adjusted exposure is simply market_exposure * beta
         new_beta_adjusted_exposure = new_market_exposure * self.beta
 
-        # Create a new instance with updated values
-        return StockPosition(
-            ticker=self.ticker,
-            quantity=self.quantity,
-            beta=self.beta,
+        # Copy with the updated values
+        return self.copy_with(
             beta_adjusted_exposure=new_beta_adjusted_exposure,
             market_exposure=new_market_exposure,
             price=new_price,
-            position_type=self.position_type,
-            cost_basis=self.cost_basis,
             market_value=new_market_exposure,
         )
 
@@ -564,7 +597,7 @@ class StockPosition:
             raise
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioGroup:
     """Group of related positions (stock + options)"""
 
@@ -615,6 +648,14 @@ class PortfolioGroup:
         # Calculate option counts
         self._calculate_option_counts()
 
+    def copy_with(self, **changes) -> Self:
+        """Copy the group with some fields replaced, without re-running __init__.
+
+        The copy shares the position objects and keeps the option counts, so
+        callers that change option_positions must keep the same calls and puts.
+        """
+        return _copy_with(self, changes)
+
     @property
     def total_value(self) -> float:
         """DEPRECATED: Use net_exposure instead.
@@ -626,8 +667,6 @@ class PortfolioGroup:
     @total_value.setter
     def total_value(self, value: float):
         """Set total_value (also sets net_exposure)."""
-        # Update both total_value and net_exposure
-        self._total_value = value
         self.net_exposure = value
 
     # net_option_value property removed as it's based on unreliable market values
@@ -782,7 +821,7 @@ class PortfolioGroup:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExposureBreakdown:
     """Detailed breakdown of exposure by type
 
@@ -837,10 +876,9 @@ class ExposureBreakdown:
         self.formula = formula
         self.components = components
 
-        # Set backward compatibility properties
-        self._stock_value = stock_exposure
-        self._option_delta_value = option_delta_exposure
-        self._total_value = total_exposure
+    def copy_with(self, **changes) -> Self:
+        """Copy the breakdown with some fields replaced (see Position.copy_with)."""
+        return _copy_with(self, changes)
 
     @property
     def stock_value(self) -> float:
@@ -850,7 +888,6 @@ class ExposureBreakdown:
     @stock_value.setter
     def stock_value(self, value: float):
         """Set stock_value (also sets stock_exposure)."""
-        self._stock_value = value
         self.stock_exposure = value
 
     @property
@@ -861,7 +898,6 @@ class ExposureBreakdown:
     @option_delta_value.setter
     def option_delta_value(self, value: float):
         """Set option_delta_value (also sets option_delta_exposure)."""
-        self._option_delta_value = value
         self.option_delta_exposure = value
 
     @property
@@ -872,7 +908,6 @@ class ExposureBreakdown:
     @total_value.setter
     def total_value(self, value: float):
         """Set total_value (also sets total_exposure)."""
-        self._total_value = value
         self.total_exposure = value
 
     def to_dict(self) -> ExposureBreakdownDict:
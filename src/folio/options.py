@@ -1,6 +1,7 @@
 """
 Options calculation module.
-Uses QuantLib for option pricing and Greeks calculations.
+Uses QuantLib for option pricing and Greeks calculations, or the vectorized
+NumPy engines in pricing.py when selected (see get_pricing_engine).
 Uses American-style options for US stocks.
 
 This module contains the canonical implementations of option-related calculations,
@@ -10,7 +11,9 @@ codebase should use these functions rather than implementing their own calculati
 
 import datetime
 import logging
+import threading
 import warnings
+from collections import OrderedDict
 
 # Import QuantLib and suppress SWIG-related DeprecationWarnings
 with warnings.catch_warnings():
@@ -31,11 +34,90 @@ with warnings.catch_warnings():
     )
     import QuantLib as ql  # noqa: N813
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from .logger import load_config
+from .pricing import (
+    NUMPY_ENGINES,
+    implied_volatility,
+    option_greeks,
+    price_options,
+)
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Pricing engines: "quantlib" runs a 100-step CRR binomial tree per contract and is
+# the reference; the NumPy engines in pricing.py price arrays of contracts at once
+PRICING_ENGINES = ("quantlib", *NUMPY_ENGINES)
+DEFAULT_PRICING_ENGINE = "quantlib"
+
+# Option settings from the `app.options` section of folio.yaml
+options_config = (load_config().get("app") or {}).get("options") or {}
+
+
+def get_pricing_engine(engine: str | None = None) -> str:
+    """Resolve the pricing engine for a calculation.
+
+    Args:
+        engine: Engine requested by the caller. If None, uses
+            `app.options.pricing_engine` from folio.yaml, or "quantlib" if unset.
+
+    Returns:
+        One of PRICING_ENGINES. Unknown names log a warning and use "quantlib".
+    """
+    if engine is None:
+        engine = options_config.get("pricing_engine", DEFAULT_PRICING_ENGINE)
+    if engine not in PRICING_ENGINES:
+        logger.warning(
+            f"Unknown pricing engine: {engine}. Using {DEFAULT_PRICING_ENGINE}."
+        )
+        return DEFAULT_PRICING_ENGINE
+    return engine
+
+
+def get_scenario_pricing_engine(engine: str | None = None) -> str:
+    """Resolve the pricing engine for scenario grids (simulator and P&L).
+
+    These price many spots per contract, where the NumPy engines are much
+    faster than QuantLib, so they can use a different engine from the
+    exposures and summaries.
+
+    Args:
+        engine: Engine requested by the caller. If None, uses
+            `app.options.scenario_pricing_engine` from folio.yaml, or the
+            default engine from get_pricing_engine if unset.
+
+    Returns:
+        One of PRICING_ENGINES.
+    """
+    if engine is None:
+        engine = options_config.get("scenario_pricing_engine")
+    return get_pricing_engine(engine)
+
+
+def calculate_time_to_expiry(
+    expiry: datetime.datetime, today: datetime.date | None = None
+) -> float:
+    """Calculate the time to expiry in years (Actual/365), as QuantLib does.
+
+    Like the QuantLib calculations, expiries that are today or in the past are
+    treated as expiring tomorrow.
+
+    Args:
+        expiry: The option's expiry date
+        today: The valuation date. Defaults to today.
+
+    Returns:
+        Time to expiry in years, at least one day
+    """
+    if today is None:
+        today = datetime.date.today()
+    days = (expiry.date() - today).days
+    return max(days, 1) / 365.0
+
 
 def calculate_notional_value(quantity: float, underlying_price: float) -> float:
     """Calculate the notional value of an option position.
@@ -163,23 +245,18 @@ class OptionContract:
         return self.current_price * 100 * self.quantity
 
 
-def calculate_black_scholes_delta(
-    option_position: OptionContract,
-    underlying_price: float,
-    risk_free_rate: float = 0.05,
-    volatility: float | None = None,
-) -> float:
-    """
-    Calculate option delta using QuantLib.
-    Uses American-style options.
-    """
-    # Use provided volatility or default
-    if volatility is None:
-        volatility = 0.3  # Default volatility
+# Number of time steps in the binomial tree for American options
+BINOMIAL_STEPS = 100
+# Volatility bump for binomial tree vegas, wide enough to smooth tree noise
+VEGA_BUMP = 0.02
 
-    # Set up dates
-    today = ql.Date.todaysDate()
 
+def _get_expiry_date(option_position: OptionContract, today: ql.Date) -> ql.Date:
+    """Convert an option's expiry to a QuantLib date after today.
+
+    Expiries that are today or in the past, or that cannot be converted, are
+    replaced with tomorrow to avoid QuantLib errors.
+    """
     # Check if expiry date is in the past
     current_date = datetime.datetime.now().date()
     option_expiry = option_position.expiry.date()
@@ -188,71 +265,256 @@ def calculate_black_scholes_delta(
         logger.warning(
             f"Option expiry date {option_expiry} is in the past. Using today + 1 day."
         )
-        # Use tomorrow as the expiry date to avoid QuantLib errors
-        expiry_date = today + 1
-    else:
-        try:
-            expiry_date = ql.Date(
-                option_position.expiry.day,
-                option_position.expiry.month,
-                option_position.expiry.year,
-            )
+        return today + 1
 
-            # Ensure expiry date is after today
-            if expiry_date <= today:
-                logger.warning(
-                    f"Adjusted option expiry date {expiry_date} is not after today. Using today + 1 day."
-                )
-                expiry_date = today + 1
+    try:
+        expiry_date = ql.Date(
+            option_position.expiry.day,
+            option_position.expiry.month,
+            option_position.expiry.year,
+        )
+    except Exception as e:
+        logger.error(f"Error creating QuantLib date for {option_position.expiry}: {e}")
+        return today + 1
 
-        except Exception as e:
-            logger.error(
-                f"Error creating QuantLib date for {option_position.expiry}: {e}"
+    # Ensure expiry date is after today
+    if expiry_date <= today:
+        logger.warning(
+            f"Adjusted option expiry date {expiry_date} is not after today. Using today + 1 day."
+        )
+        return today + 1
+    return expiry_date
+
+
+@dataclass
+class QuantLibContract:
+    """A priced QuantLib option with the quotes that drive it.
+
+    Attributes:
+        spot: Quote for the underlying price
+        volatility: Quote for the volatility
+        option: The option, with its binomial engine attached
+    """
+
+    spot: ql.SimpleQuote
+    volatility: ql.SimpleQuote
+    option: ql.VanillaOption
+    # Keep the process alive for as long as the engine refers to it
+    process: ql.BlackScholesMertonProcess = field(repr=False)
+
+
+class QuantLibPricingContext:
+    """QuantLib objects shared by option calculations for one date and rate.
+
+    The calendar, day count and rate and dividend curves are built once. Each
+    contract gets its own spot and volatility quotes, process, option and
+    binomial engine the first time it is priced, and later calculations only
+    update the quotes, so repricing a contract at another spot or volatility
+    just reruns the tree.
+
+    Contracts are kept in a bounded LRU map keyed by type, strike and expiry.
+    """
+
+    def __init__(
+        self,
+        risk_free_rate: float = 0.05,
+        evaluation_date: ql.Date | None = None,
+        max_contracts: int = 1024,
+    ):
+        """Initialize the pricing context.
+
+        Args:
+            risk_free_rate: The annualized risk-free interest rate
+            evaluation_date: The valuation date. Defaults to today.
+            max_contracts: Maximum number of contracts to keep
+        """
+        self.evaluation_date = evaluation_date or ql.Date.todaysDate()
+        self.risk_free_rate = risk_free_rate
+        self.max_contracts = max_contracts
+        self.day_count = ql.Actual365Fixed()
+        self.calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
+        self.rate_handle = ql.YieldTermStructureHandle(
+            ql.FlatForward(self.evaluation_date, risk_free_rate, self.day_count)
+        )
+        self.dividend_handle = ql.YieldTermStructureHandle(
+            ql.FlatForward(self.evaluation_date, 0.0, self.day_count)
+        )
+        self._contracts: OrderedDict[tuple, QuantLibContract] = OrderedDict()
+        # QuantLib objects are not thread-safe, and quotes are shared between calls
+        self._lock = threading.RLock()
+
+    def _create_contract(self, option_position: OptionContract) -> QuantLibContract:
+        """Build the QuantLib objects for a contract."""
+        spot = ql.SimpleQuote(option_position.strike)
+        volatility = ql.SimpleQuote(0.3)
+        vol_handle = ql.BlackVolTermStructureHandle(
+            ql.BlackConstantVol(
+                self.evaluation_date,
+                self.calendar,
+                ql.QuoteHandle(volatility),
+                self.day_count,
             )
-            # Use tomorrow as the expiry date to avoid QuantLib errors
-            expiry_date = today + 1
+        )
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(spot), self.dividend_handle, self.rate_handle, vol_handle
+        )
 
-    # Set up the option
-    option_type = (
-        ql.Option.Call if option_position.option_type == "CALL" else ql.Option.Put
-    )
-    strike = option_position.strike
+        # Create the option with American exercise
+        option_type = (
+            ql.Option.Call if option_position.option_type == "CALL" else ql.Option.Put
+        )
+        exercise = ql.AmericanExercise(
+            self.evaluation_date,
+            _get_expiry_date(option_position, self.evaluation_date),
+        )
+        option = ql.VanillaOption(
+            ql.PlainVanillaPayoff(option_type, option_position.strike), exercise
+        )
 
-    # Set up the pricing environment
-    spot_handle = ql.QuoteHandle(ql.SimpleQuote(underlying_price))
-    rate_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, risk_free_rate, ql.Actual365Fixed())
-    )
-    dividend_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, 0.0, ql.Actual365Fixed())
-    )
-    calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
-    vol_handle = ql.BlackVolTermStructureHandle(
-        ql.BlackConstantVol(today, calendar, volatility, ql.Actual365Fixed())
-    )
+        # Use a binomial tree for American options
+        option.setPricingEngine(
+            ql.BinomialVanillaEngine(process, "crr", BINOMIAL_STEPS)
+        )
+        return QuantLibContract(spot, volatility, option, process)
+
+    def get_contract(
+        self,
+        option_position: OptionContract,
+        underlying_price: float,
+        volatility: float,
+    ) -> QuantLibContract:
+        """Get a contract's QuantLib objects, with its quotes set to the given values.
+
+        Callers must hold the context lock while using the returned contract, as
+        other calls may change its quotes.
+        """
+        key = (
+            option_position.option_type,
+            option_position.strike,
+            option_position.expiry.date(),
+        )
+        with self._lock:
+            contract = self._contracts.get(key)
+            if contract is None:
+                contract = self._create_contract(option_position)
+                self._contracts[key] = contract
+                if len(self._contracts) > self.max_contracts:
+                    self._contracts.popitem(last=False)
+            else:
+                self._contracts.move_to_end(key)
+
+            contract.spot.setValue(underlying_price)
+            contract.volatility.setValue(volatility)
+            return contract
+
+    def price(
+        self,
+        option_position: OptionContract,
+        underlying_price: float,
+        volatility: float,
+    ) -> float:
+        """Calculate an option's price."""
+        with self._lock:
+            return self.get_contract(
+                option_position, underlying_price, volatility
+            ).option.NPV()
+
+    def delta(
+        self,
+        option_position: OptionContract,
+        underlying_price: float,
+        volatility: float,
+    ) -> float:
+        """Calculate an option's delta."""
+        with self._lock:
+            return self.get_contract(
+                option_position, underlying_price, volatility
+            ).option.delta()
+
+    def greeks(
+        self,
+        option_position: OptionContract,
+        underlying_price: float,
+        volatility: float,
+    ) -> dict[str, float]:
+        """Calculate an option's price, delta, gamma and theta (per year) from the tree."""
+        with self._lock:
+            option = self.get_contract(
+                option_position, underlying_price, volatility
+            ).option
+            return {
+                "price": option.NPV(),
+                "delta": option.delta(),
+                "gamma": option.gamma(),
+                "theta": option.theta(),
+            }
 
-    # Create the Black-Scholes process
-    process = ql.BlackScholesMertonProcess(
-        spot_handle, dividend_handle, rate_handle, vol_handle
-    )
+    def __len__(self) -> int:
+        """Return the number of contracts held."""
+        return len(self._contracts)
+
+
+# Pricing contexts by risk-free rate, rebuilt when the date changes
+_pricing_contexts: dict[float, QuantLibPricingContext] = {}
+_pricing_contexts_lock = threading.Lock()
+
+
+def get_pricing_context(risk_free_rate: float = 0.05) -> QuantLibPricingContext:
+    """Get the shared QuantLib pricing context for today and a risk-free rate.
+
+    Args:
+        risk_free_rate: The annualized risk-free interest rate
+
+    Returns:
+        The pricing context, created on first use and again when the date changes
+    """
+    today = ql.Date.todaysDate()
+    with _pricing_contexts_lock:
+        context = _pricing_contexts.get(risk_free_rate)
+        if context is None or context.evaluation_date != today:
+            context = QuantLibPricingContext(risk_free_rate, today)
+            _pricing_contexts[risk_free_rate] = context
+        return context
+
+
+def calculate_black_scholes_delta(
+    option_position: OptionContract,
+    underlying_price: float,
+    risk_free_rate: float = 0.05,
+    volatility: float | None = None,
+    engine: str | None = None,
+) -> float:
+    """
+    Calculate option delta using QuantLib, or a NumPy engine if selected.
+    Uses American-style options, except with the European "bsm" engine.
+    See get_pricing_engine for how the engine is chosen.
+    """
+    # Use provided volatility or default
+    if volatility is None:
+        volatility = 0.3  # Default volatility
+
+    engine = get_pricing_engine(engine)
+    if engine != "quantlib":
+        return float(
+            option_greeks(
+                underlying_price,
+                option_position.strike,
+                calculate_time_to_expiry(option_position.expiry),
+                volatility,
+                option_position.option_type == "CALL",
+                rate=risk_free_rate,
+                engine=engine,
+            )["delta"]
+        )
 
     try:
-        # Create the option with American exercise
-        exercise = ql.AmericanExercise(today, expiry_date)
-        payoff = ql.PlainVanillaPayoff(option_type, strike)
-        option = ql.VanillaOption(payoff, exercise)
-
-        # Set up the pricing engine - use binomial tree for American options
-        time_steps = 100  # Number of time steps in the tree
-        engine = ql.BinomialVanillaEngine(process, "crr", time_steps)
-        option.setPricingEngine(engine)
-
-        # Calculate delta
-        delta = option.delta()
-        return delta
+        return get_pricing_context(risk_free_rate).delta(
+            option_position, underlying_price, volatility
+        )
     except Exception as e:
         logger.error(f"Error calculating delta for {option_position.description}: {e}")
         # Return a reasonable default delta based on option type and moneyness
+        strike = option_position.strike
         if option_position.option_type == "CALL":
             return 0.5 if underlying_price > strike else 0.1
         else:  # PUT
@@ -264,91 +526,39 @@ def calculate_bs_price(
     underlying_price: float,
     risk_free_rate: float = 0.05,
     volatility: float | None = None,
+    engine: str | None = None,
 ) -> float:
     """
-    Calculate option price using QuantLib.
-    Uses American-style options.
+    Calculate option price using QuantLib, or a NumPy engine if selected.
+    Uses American-style options, except with the European "bsm" engine.
+    See get_pricing_engine for how the engine is chosen.
     """
     # Use provided volatility or default
     if volatility is None:
         volatility = 0.3  # Default volatility
 
-    # Set up dates
-    today = ql.Date.todaysDate()
-
-    # Check if expiry date is in the past
-    current_date = datetime.datetime.now().date()
-    option_expiry = option_position.expiry.date()
-
-    if option_expiry < current_date:
-        logger.warning(
-            f"Option expiry date {option_expiry} is in the past. Using today + 1 day."
-        )
-        # Use tomorrow as the expiry date to avoid QuantLib errors
-        expiry_date = today + 1
-    else:
-        try:
-            expiry_date = ql.Date(
-                option_position.expiry.day,
-                option_position.expiry.month,
-                option_position.expiry.year,
+    engine = get_pricing_engine(engine)
+    if engine != "quantlib":
+        return float(
+            price_options(
+                underlying_price,
+                option_position.strike,
+                calculate_time_to_expiry(option_position.expiry),
+                volatility,
+                option_position.option_type == "CALL",
+                rate=risk_free_rate,
+                engine=engine,
             )
-
-            # Ensure expiry date is after today
-            if expiry_date <= today:
-                logger.warning(
-                    f"Adjusted option expiry date {expiry_date} is not after today. Using today + 1 day."
-                )
-                expiry_date = today + 1
-
-        except Exception as e:
-            logger.error(
-                f"Error creating QuantLib date for {option_position.expiry}: {e}"
-            )
-            # Use tomorrow as the expiry date to avoid QuantLib errors
-            expiry_date = today + 1
-
-    # Set up the option
-    option_type = (
-        ql.Option.Call if option_position.option_type == "CALL" else ql.Option.Put
-    )
-    strike = option_position.strike
-
-    # Set up the pricing environment
-    spot_handle = ql.QuoteHandle(ql.SimpleQuote(underlying_price))
-    rate_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, risk_free_rate, ql.Actual365Fixed())
-    )
-    dividend_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, 0.0, ql.Actual365Fixed())
-    )
-    calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
-    vol_handle = ql.BlackVolTermStructureHandle(
-        ql.BlackConstantVol(today, calendar, volatility, ql.Actual365Fixed())
-    )
-
-    # Create the Black-Scholes process
-    process = ql.BlackScholesMertonProcess(
-        spot_handle, dividend_handle, rate_handle, vol_handle
-    )
+        )
 
     try:
-        # Create the option with American exercise
-        exercise = ql.AmericanExercise(today, expiry_date)
-        payoff = ql.PlainVanillaPayoff(option_type, strike)
-        option = ql.VanillaOption(payoff, exercise)
-
-        # Set up the pricing engine - use binomial tree for American options
-        time_steps = 100  # Number of time steps in the tree
-        engine = ql.BinomialVanillaEngine(process, "crr", time_steps)
-        option.setPricingEngine(engine)
-
-        # Calculate price
-        price = option.NPV()
-        return price
+        return get_pricing_context(risk_free_rate).price(
+            option_position, underlying_price, volatility
+        )
     except Exception as e:
         logger.error(f"Error calculating price for {option_position.description}: {e}")
         # Return a reasonable default price based on intrinsic value
+        strike = option_position.strike
         if option_position.option_type == "CALL":
             intrinsic = max(0, underlying_price - strike)
         else:  # PUT
@@ -357,129 +567,482 @@ def calculate_bs_price(
         return intrinsic + (underlying_price * 0.01)
 
 
-def calculate_implied_volatility(
-    option_position: OptionContract,
-    underlying_price: float,
-    option_price: float | None = None,
-    risk_free_rate: float = 0.05,
-) -> float:
+def _broadcast_contracts(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    volatilities: float | np.ndarray | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Build pricing input arrays for a list of contracts.
+
+    The last axis of the result indexes the contracts, so underlying prices and
+    volatilities of shape (n,) give one value per contract, and shape (m, 1)
+    gives m scenarios for every contract.
+
+    Returns:
+        Tuple of (underlying prices, strikes, times to expiry, volatilities,
+        is_call) arrays, broadcast to a common shape
     """
-    Calculate implied volatility using QuantLib.
-    Uses American-style options.
+    if volatilities is None:
+        volatilities = 0.3  # Default volatility
+    strikes = np.array([option.strike for option in options], dtype=float)
+    times = np.array(
+        [calculate_time_to_expiry(option.expiry) for option in options], dtype=float
+    )
+    is_call = np.array([option.option_type == "CALL" for option in options])
+    return np.broadcast_arrays(
+        np.asarray(underlying_prices, dtype=float),
+        strikes,
+        times,
+        np.asarray(volatilities, dtype=float),
+        is_call,
+    )
+
+
+def calculate_option_prices(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    risk_free_rate: float = 0.05,
+    volatilities: float | np.ndarray | None = None,
+    engine: str | None = None,
+) -> np.ndarray:
+    """Calculate prices for many option contracts in one call.
+
+    With a NumPy engine, all contracts and scenarios are priced in a single
+    vectorized call. With QuantLib, each one is priced by calculate_bs_price.
+
+    Args:
+        options: The option contracts
+        underlying_prices: Underlying price per contract, broadcast against the
+            contracts (see _broadcast_contracts)
+        risk_free_rate: The annualized risk-free interest rate. Defaults to 0.05 (5%).
+        volatilities: Volatility per contract, broadcast like underlying_prices.
+            Defaults to 0.3.
+        engine: Pricing engine. See get_pricing_engine.
+
+    Returns:
+        Prices per contract (not multiplied by 100 or quantity)
     """
-    # Use provided option price or the option's current_price
-    if option_price is None:
-        option_price = option_position.current_price
+    spots, strikes, times, vols, is_call = _broadcast_contracts(
+        options, underlying_prices, volatilities
+    )
+    engine = get_pricing_engine(engine)
+    if engine != "quantlib":
+        return price_options(
+            spots, strikes, times, vols, is_call, rate=risk_free_rate, engine=engine
+        )
 
-    # Set up dates
-    today = ql.Date.todaysDate()
+    prices = np.empty(spots.shape)
+    for index in np.ndindex(spots.shape):
+        prices[index] = calculate_bs_price(
+            options[index[-1]], spots[index], risk_free_rate, vols[index], engine
+        )
+    return prices
 
-    # Check if expiry date is in the past
-    current_date = datetime.datetime.now().date()
-    option_expiry = option_position.expiry.date()
 
-    if option_expiry < current_date:
-        logger.warning(
-            f"Option expiry date {option_expiry} is in the past. Using today + 1 day."
+def calculate_option_deltas(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    risk_free_rate: float = 0.05,
+    volatilities: float | np.ndarray | None = None,
+    engine: str | None = None,
+) -> np.ndarray:
+    """Calculate raw deltas for many option contracts in one call.
+
+    Args are the same as for calculate_option_prices.
+
+    Returns:
+        Deltas per contract, not adjusted for position direction
+    """
+    spots, strikes, times, vols, is_call = _broadcast_contracts(
+        options, underlying_prices, volatilities
+    )
+    engine = get_pricing_engine(engine)
+    if engine != "quantlib":
+        return option_greeks(
+            spots, strikes, times, vols, is_call, rate=risk_free_rate, engine=engine
+        )["delta"]
+
+    deltas = np.empty(spots.shape)
+    for index in np.ndindex(spots.shape):
+        deltas[index] = calculate_black_scholes_delta(
+            options[index[-1]], spots[index], risk_free_rate, vols[index], engine
         )
-        # Use tomorrow as the expiry date to avoid QuantLib errors
-        expiry_date = today + 1
-    else:
-        try:
-            expiry_date = ql.Date(
-                option_position.expiry.day,
-                option_position.expiry.month,
-                option_position.expiry.year,
-            )
+    return deltas
 
-            # Ensure expiry date is after today
-            if expiry_date <= today:
-                logger.warning(
-                    f"Adjusted option expiry date {expiry_date} is not after today. Using today + 1 day."
-                )
-                expiry_date = today + 1
 
-        except Exception as e:
-            logger.error(
-                f"Error creating QuantLib date for {option_position.expiry}: {e}"
-            )
-            # Use tomorrow as the expiry date to avoid QuantLib errors
-            expiry_date = today + 1
+def roll_forward(options: list[OptionContract], days: int) -> list[OptionContract]:
+    """Get contracts as they will be a number of calendar days from today.
 
-    # Set up the option
-    option_type = (
-        ql.Option.Call if option_position.option_type == "CALL" else ql.Option.Put
+    Moving the valuation date forward is the same as moving every expiry back.
+    Expiries are never moved before tomorrow, matching the one-day minimum of
+    calculate_time_to_expiry and the QuantLib calculations.
+
+    Args:
+        options: The option contracts
+        days: Calendar days to move forward
+
+    Returns:
+        Copies of the contracts with earlier expiries
+    """
+    last_expiry = datetime.datetime.combine(
+        datetime.date.today() + datetime.timedelta(days=1), datetime.time()
     )
-    strike = option_position.strike
+    return [
+        replace(
+            option,
+            expiry=max(option.expiry - datetime.timedelta(days=int(days)), last_expiry),
+        )
+        for option in options
+    ]
 
-    # Create the option with American exercise
-    try:
-        exercise = ql.AmericanExercise(today, expiry_date)
-        payoff = ql.PlainVanillaPayoff(option_type, strike)
-        option = ql.VanillaOption(payoff, exercise)
-    except Exception as e:
-        logger.error(f"Error creating option for {option_position.description}: {e}")
-        # Return a default volatility
-        return 0.3
-
-    # Set up for implied volatility calculation
-    spot = ql.SimpleQuote(underlying_price)
-    vol = ql.SimpleQuote(0.3)  # Initial guess
-    rate = ql.SimpleQuote(risk_free_rate)
-    dividend = ql.SimpleQuote(0.0)
-
-    spot_handle = ql.QuoteHandle(spot)
-    vol_handle = ql.QuoteHandle(vol)
-    rate_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, ql.QuoteHandle(rate), ql.Actual365Fixed())
+
+def calculate_option_greeks(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    risk_free_rate: float = 0.05,
+    volatilities: float | np.ndarray | None = None,
+    engine: str | None = None,
+) -> dict[str, np.ndarray]:
+    """Calculate prices and Greeks for many option contracts in one call.
+
+    NumPy engines return their own Greeks (see option_greeks). With QuantLib,
+    price, delta, gamma and theta come from each contract's binomial tree, and
+    vega is a central difference of calculate_option_prices.
+
+    Args are the same as for calculate_option_prices.
+
+    Returns:
+        A dictionary of arrays with keys 'price', 'delta', 'gamma', 'vega'
+        (per 1.0 of volatility) and 'theta' (per year), not adjusted for
+        position direction
+    """
+    spots, strikes, times, vols, is_call = _broadcast_contracts(
+        options, underlying_prices, volatilities
     )
-    dividend_handle = ql.YieldTermStructureHandle(
-        ql.FlatForward(today, ql.QuoteHandle(dividend), ql.Actual365Fixed())
+    engine = get_pricing_engine(engine)
+    if engine != "quantlib":
+        return option_greeks(
+            spots, strikes, times, vols, is_call, rate=risk_free_rate, engine=engine
+        )
+
+    context = get_pricing_context(risk_free_rate)
+    greeks = {
+        name: np.empty(spots.shape) for name in ("price", "delta", "gamma", "theta")
+    }
+    for index in np.ndindex(spots.shape):
+        for name, value in context.greeks(
+            options[index[-1]], spots[index], vols[index]
+        ).items():
+            greeks[name][index] = value
+
+    vol_up = vols + VEGA_BUMP
+    vol_down = np.maximum(vols - VEGA_BUMP, 0.001)
+    greeks["vega"] = (
+        calculate_option_prices(options, spots, risk_free_rate, vol_up, engine)
+        - calculate_option_prices(options, spots, risk_free_rate, vol_down, engine)
+    ) / (vol_up - vol_down)
+    return greeks
+
+
+# Last implied volatility solved for each contract, used to warm-start the solver
+MAX_VOLATILITY_GUESSES = 4096
+_volatility_guesses: OrderedDict[tuple, float] = OrderedDict()
+_volatility_guesses_lock = threading.Lock()
+
+
+def _get_contract_key(option_position: OptionContract) -> tuple:
+    """Identify a contract by underlying, type, strike and expiry."""
+    return (
+        option_position.underlying,
+        option_position.option_type,
+        option_position.strike,
+        option_position.expiry.date(),
     )
 
-    # Create process and pricing engine
-    process = ql.BlackScholesMertonProcess(
-        spot_handle,
-        dividend_handle,
-        rate_handle,
-        ql.BlackVolTermStructureHandle(
-            ql.BlackConstantVol(
-                today,
-                ql.UnitedStates(ql.UnitedStates.NYSE),
-                vol_handle,
-                ql.Actual365Fixed(),
-            )
-        ),
+
+def _get_initial_volatility(
+    option_position: OptionContract, underlying_price: float
+) -> float:
+    """Get the solver's starting volatility for a contract.
+
+    Returns the last implied volatility solved for the contract, or the skew
+    model's estimate for a contract that has not been solved before.
+    """
+    with _volatility_guesses_lock:
+        guess = _volatility_guesses.get(_get_contract_key(option_position))
+    if guess is not None:
+        return guess
+    return estimate_volatility_with_skew(option_position, underlying_price)
+
+
+def _remember_volatility(option_position: OptionContract, volatility: float) -> None:
+    """Store a solved implied volatility as the contract's next starting point."""
+    key = _get_contract_key(option_position)
+    with _volatility_guesses_lock:
+        _volatility_guesses[key] = volatility
+        _volatility_guesses.move_to_end(key)
+        if len(_volatility_guesses) > MAX_VOLATILITY_GUESSES:
+            _volatility_guesses.popitem(last=False)
+
+
+class ImpliedVolatilityCache:
+    """Size-bounded LRU cache of solved implied volatilities.
+
+    Keys hold everything an implied volatility depends on: the contract, its
+    price, the underlying price (rounded to cents), the rate, the date and the
+    pricing engine. Re-processing an unchanged options book is then served
+    entirely from the cache.
+
+    The cache is thread-safe.
+    """
+
+    # Decimals the underlying price is rounded to in keys
+    UNDERLYING_PRICE_DECIMALS = 2
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept. 0 disables the cache.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_key(
+        cls,
+        option_position: OptionContract,
+        option_price: float,
+        underlying_price: float,
+        risk_free_rate: float,
+        engine: str,
+        *,
+        today: datetime.date | None = None,
+    ) -> tuple:
+        """Build the cache key for an implied volatility calculation."""
+        return (
+            *_get_contract_key(option_position),
+            float(option_price),
+            round(float(underlying_price), cls.UNDERLYING_PRICE_DECIMALS),
+            risk_free_rate,
+            today or datetime.date.today(),
+            engine,
+        )
+
+    def get(self, key: tuple) -> float | None:
+        """Get a cached implied volatility, or None on a miss."""
+        with self._lock:
+            volatility = self._entries.get(key)
+            if volatility is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return volatility
+
+    def put(self, key: tuple, volatility: float) -> None:
+        """Add an implied volatility, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = volatility
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, float]:
+        """Get the cache counters.
+
+        Returns:
+            'hits', 'misses', 'evictions', 'entries', 'max_entries' and
+            'hit_rate' (hits as a fraction of lookups, 0.0 before any lookup)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared implied volatility cache, sized by `app.options.iv_cache_size` in folio.yaml
+implied_volatility_cache = ImpliedVolatilityCache(
+    options_config.get("iv_cache_size", 1024)
+)
+
+
+def _solve_implied_volatilities(
+    options: list[OptionContract],
+    underlying_prices: np.ndarray,
+    option_prices: np.ndarray,
+    risk_free_rate: float,
+    engine: str,
+) -> np.ndarray:
+    """Solve implied volatilities with pricing.implied_volatility.
+
+    Each contract starts from its last solution, or the skew estimate the first
+    time. With QuantLib, each iteration reprices the unsolved contracts through
+    the shared pricing context; a contract whose tree fails to price (e.g.
+    negative probabilities at very low volatility) is searched at higher
+    volatilities.
+    """
+    spots, strikes, times, _, is_call = _broadcast_contracts(
+        options, underlying_prices, None
+    )
+    initial = np.array(
+        [
+            _get_initial_volatility(option, spot)
+            for option, spot in zip(options, spots, strict=True)
+        ],
+        dtype=float,
     )
 
-    # For American options, we need to use a binomial tree for implied vol
-    time_steps = 100
-    engine = ql.BinomialVanillaEngine(process, "crr", time_steps)
-    option.setPricingEngine(engine)
+    price_function = None
+    if engine == "quantlib":
+        context = get_pricing_context(risk_free_rate)
+
+        def price_function(volatilities, index):
+            prices = np.empty(len(index))
+            for i, (contract, volatility) in enumerate(
+                zip(index, volatilities, strict=True)
+            ):
+                try:
+                    prices[i] = context.price(
+                        options[contract], spots[contract], volatility
+                    )
+                except RuntimeError:
+                    prices[i] = np.nan
+            return prices
+
+    volatilities = implied_volatility(
+        option_prices,
+        spots,
+        strikes,
+        times,
+        is_call,
+        rate=risk_free_rate,
+        engine=engine,
+        initial_volatility=initial,
+        price_function=price_function,
+    )
+    for option, volatility in zip(options, volatilities, strict=True):
+        _remember_volatility(option, float(volatility))
+    return volatilities
 
-    # Calculate implied volatility using bisection method - no exception handling as requested
-    min_vol = 0.001
-    max_vol = 5.0
-    tolerance = 0.0001
-    max_iterations = 100
 
-    for _i in range(max_iterations):
-        mid_vol = (min_vol + max_vol) / 2
-        vol.setValue(mid_vol)
+def calculate_implied_volatilities(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    option_prices: list[float] | np.ndarray | None = None,
+    risk_free_rate: float = 0.05,
+    engine: str | None = None,
+) -> np.ndarray:
+    """Calculate implied volatilities for many option contracts at once.
 
-        price = option.NPV()
-        price_diff = price - option_price
+    Results are memoized in implied_volatility_cache, so only contracts whose
+    option price, underlying price, rate or date changed are solved again.
+    The rest are solved together by pricing.implied_volatility (see
+    _solve_implied_volatilities).
 
-        if abs(price_diff) < tolerance:
-            return mid_vol
+    Args:
+        options: The option contracts
+        underlying_prices: Underlying price per contract
+        option_prices: Market price per contract. Defaults to each contract's
+            current_price.
+        risk_free_rate: The annualized risk-free interest rate. Defaults to 0.05 (5%).
+        engine: Pricing engine. See get_pricing_engine.
 
-        if price_diff > 0:
-            max_vol = mid_vol
+    Returns:
+        Implied volatility per contract
+    """
+    if option_prices is None:
+        option_prices = [option.current_price for option in options]
+    option_prices = np.broadcast_to(
+        np.asarray(option_prices, dtype=float), (len(options),)
+    )
+    underlying_prices = np.broadcast_to(
+        np.asarray(underlying_prices, dtype=float), (len(options),)
+    )
+    engine = get_pricing_engine(engine)
+
+    today = datetime.date.today()
+    keys = [
+        implied_volatility_cache.get_key(
+            option,
+            option_price,
+            underlying_price,
+            risk_free_rate,
+            engine,
+            today=today,
+        )
+        for option, option_price, underlying_price in zip(
+            options, option_prices, underlying_prices, strict=True
+        )
+    ]
+    volatilities = np.empty(len(options))
+    missing = []
+    for i, key in enumerate(keys):
+        cached = implied_volatility_cache.get(key)
+        if cached is None:
+            missing.append(i)
         else:
-            min_vol = mid_vol
+            volatilities[i] = cached
+
+    if missing:
+        volatilities[missing] = _solve_implied_volatilities(
+            [options[i] for i in missing],
+            underlying_prices[missing],
+            option_prices[missing],
+            risk_free_rate,
+            engine,
+        )
+        for i in missing:
+            implied_volatility_cache.put(keys[i], float(volatilities[i]))
+    return volatilities
+
+
+def calculate_implied_volatility(
+    option_position: OptionContract,
+    underlying_price: float,
+    option_price: float | None = None,
+    risk_free_rate: float = 0.05,
+    engine: str | None = None,
+) -> float:
+    """
+    Calculate implied volatility using QuantLib, or a NumPy engine if selected.
+    Uses American-style options, except with the European "bsm" engine.
+    See calculate_implied_volatilities for the solver.
+    """
+    # Use provided option price or the option's current_price
+    if option_price is None:
+        option_price = option_position.current_price
 
-    # If we reach here, we've hit max iterations
-    return (min_vol + max_vol) / 2
+    return float(
+        calculate_implied_volatilities(
+            [option_position],
+            underlying_price,
+            [option_price],
+            risk_free_rate,
+            engine,
+        )[0]
+    )
 
 
 def parse_option_description(
@@ -723,6 +1286,41 @@ def estimate_volatility_with_skew(
     return base_volatility * skew_factor
 
 
+def estimate_volatilities_with_skew(
+    options: list[OptionContract],
+    underlying_prices: float | np.ndarray,
+    base_volatility: float = 0.3,
+) -> np.ndarray:
+    """Vectorized estimate_volatility_with_skew for many contracts and prices.
+
+    Args:
+        options: The option contracts
+        underlying_prices: Underlying price per contract, broadcast against the
+            contracts (see _broadcast_contracts)
+        base_volatility: Base volatility to adjust from (default: 0.3 or 30%)
+
+    Returns:
+        Adjusted implied volatility estimates, of the broadcast shape
+    """
+    spots, strikes, _, _, is_call = _broadcast_contracts(
+        options, underlying_prices, base_volatility
+    )
+    with np.errstate(divide="ignore"):
+        moneyness = np.where(is_call, strikes / spots, spots / strikes)
+
+    skew_factor = np.select(
+        [moneyness < 0.8, moneyness < 0.9, moneyness > 1.2, moneyness > 1.1],
+        [1.2, 1.1, 1.2, 1.1],
+        default=1.0,
+    )
+
+    now = datetime.datetime.now()
+    long_dated = np.array([(option.expiry - now).days > 180 for option in options])
+    skew_factor = np.where(long_dated, (skew_factor + 1.0) / 2.0, skew_factor)
+
+    return base_volatility * skew_factor
+
+
 def get_implied_volatility(
     option: OptionContract,
     underlying_price: float,
@@ -13,7 +13,244 @@ import numpy as np
 
 from .data_model import OptionPosition, StockPosition
 from .logger import logger
-from .options import OptionContract, calculate_bs_price
+from .options import (
+    OptionContract,
+    calculate_option_prices,
+    get_scenario_pricing_engine,
+)
+
+# Each option contract controls 100 shares
+CONTRACT_MULTIPLIER = 100
+
+# Breakevens and extremes are refined until they are located to within this
+# many dollars of underlying price, or the iteration limit is reached
+PRICE_TOLERANCE = 0.001
+MAX_SOLVER_ITERATIONS = 50
+
+# Shrink factor of golden-section search, 1/phi
+GOLDEN_RATIO_CONJUGATE = (np.sqrt(5) - 1) / 2
+
+# Adaptive sampling starts from this many evenly spaced points plus the strikes,
+# and refines until linear interpolation between points is within this
+# fraction of the P&L range
+ADAPTIVE_INITIAL_POINTS = 17
+ADAPTIVE_TOLERANCE = 0.002
+
+
+def _get_entry_price(
+    position: StockPosition | OptionPosition, use_cost_basis: bool
+) -> float:
+    """Get the entry price P&L is measured from.
+
+    Args:
+        position: The position
+        use_cost_basis: If True, use cost_basis (for historical P&L tracking).
+            If False, use the current price (for future P&L projections).
+
+    Returns:
+        The entry price per share or per contract
+    """
+    if use_cost_basis:
+        return getattr(position, "cost_basis", position.price)
+    return position.price
+
+
+def _create_option_contract(position: OptionPosition) -> OptionContract | None:
+    """Create an OptionContract for pricing an option position.
+
+    Returns:
+        The contract, or None if the position's expiry cannot be parsed
+    """
+    if isinstance(position.expiry, str):
+        try:
+            expiry_date = datetime.datetime.strptime(position.expiry, "%Y-%m-%d")
+        except ValueError:
+            logger.warning(f"Invalid expiry date format: {position.expiry}")
+            return None
+    else:
+        expiry_date = position.expiry
+
+    return OptionContract(
+        underlying=position.ticker,
+        expiry=expiry_date,
+        strike=position.strike,
+        option_type=position.option_type,
+        quantity=position.quantity,
+        current_price=position.price,
+        cost_basis=getattr(position, "cost_basis", position.price),
+        description=f"{position.ticker} {position.option_type} {position.strike}",
+    )
+
+
+def calculate_pnl_grid(
+    positions: list[StockPosition | OptionPosition],
+    price_points: np.ndarray,
+    use_cost_basis: bool = False,
+    engine: str | None = None,
+) -> np.ndarray:
+    """
+    Calculate P&L for every position at every underlying price at once.
+
+    All option legs are priced across all price points in a single
+    calculate_option_prices call, so with a NumPy engine the whole grid is
+    one vectorized evaluation (see get_scenario_pricing_engine).
+
+    Args:
+        positions: The positions to calculate P&L for
+        price_points: Underlying prices to evaluate at
+        use_cost_basis: If True, use cost_basis as entry price. If False, use current price.
+        engine: Pricing engine for option legs. See get_scenario_pricing_engine.
+
+    Returns:
+        Array of shape (len(positions), len(price_points)) with the P&L of each
+        position at each price. Positions that cannot be priced get zero P&L.
+    """
+    price_points = np.asarray(price_points, dtype=float)
+    pnl_grid = np.zeros((len(positions), len(price_points)))
+
+    option_rows = []
+    contracts = []
+    for row, position in enumerate(positions):
+        if isinstance(position, StockPosition):
+            # For stock positions, P&L is linear
+            entry_price = _get_entry_price(position, use_cost_basis)
+            pnl_grid[row] = (price_points - entry_price) * position.quantity
+        elif isinstance(position, OptionPosition):
+            contract = _create_option_contract(position)
+            if contract is not None:
+                option_rows.append(row)
+                contracts.append(contract)
+        else:
+            logger.warning(f"Unsupported position type: {type(position)}")
+
+    if contracts and len(price_points) > 0:
+        try:
+            # Shape (price points, contracts)
+            theo_prices = calculate_option_prices(
+                contracts,
+                price_points[:, np.newaxis],
+                engine=get_scenario_pricing_engine(engine),
+            )
+        except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+            raise
+        except Exception as e:
+            logger.warning(f"Error calculating option prices for P&L grid: {e}")
+        else:
+            for column, row in enumerate(option_rows):
+                position = positions[row]
+                entry_price = _get_entry_price(position, use_cost_basis)
+                pnl_grid[row] = (
+                    (theo_prices[:, column] - entry_price)
+                    * position.quantity
+                    * CONTRACT_MULTIPLIER
+                )
+
+    return pnl_grid
+
+
+def _estimate_interpolation_errors(
+    price_points: np.ndarray, pnl_values: np.ndarray
+) -> np.ndarray:
+    """Estimate the error of linear interpolation within each price interval.
+
+    The error of interpolating f linearly over an interval of width h is about
+    |f''| * h**2 / 8. f'' is estimated by second divided differences, and each
+    interval uses the larger estimate of its two end points.
+
+    Returns:
+        Estimated errors, one per interval between adjacent price points
+    """
+    widths = np.diff(price_points)
+    slopes = np.diff(pnl_values) / widths
+    curvature = np.zeros(len(price_points))
+    curvature[1:-1] = np.abs(
+        2 * np.diff(slopes) / (price_points[2:] - price_points[:-2])
+    )
+    # End points take the curvature of their only neighbour
+    if len(price_points) > 2:
+        curvature[0] = curvature[1]
+        curvature[-1] = curvature[-2]
+    return np.maximum(curvature[:-1], curvature[1:]) * widths**2 / 8
+
+
+def sample_pnl_adaptively(
+    positions: list[StockPosition | OptionPosition],
+    price_range: tuple[float, float],
+    max_points: int = 100,
+    *,
+    use_cost_basis: bool = False,
+    tolerance: float = ADAPTIVE_TOLERANCE,
+    engine: str | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sample P&L with more price points where the P&L curve bends.
+
+    Sampling starts from evenly spaced points plus every strike in the range.
+    Each round then bisects the intervals where linear interpolation is
+    estimated to be off by more than tolerance, largest errors first, and
+    prices all new points in one calculate_pnl_grid call. It stops when every
+    interval is within tolerance or max_points have been priced.
+
+    Args:
+        positions: The positions to calculate P&L for
+        price_range: Tuple of (min_price, max_price)
+        max_points: Maximum number of price points to price
+        use_cost_basis: If True, use cost_basis as entry price. If False, use current price.
+        tolerance: Allowed interpolation error, as a fraction of the range of
+            the combined P&L
+        engine: Pricing engine for option legs. See get_scenario_pricing_engine.
+
+    Returns:
+        Tuple of (increasing price points, P&L grid of shape
+        (len(positions), len(price points)))
+    """
+    min_price, max_price = price_range
+    num_initial = max(min(ADAPTIVE_INITIAL_POINTS, max_points), 2)
+    price_points = np.linspace(min_price, max_price, num_initial)
+
+    # P&L bends most around the strikes, so always sample them
+    strikes = np.unique(
+        [
+            position.strike
+            for position in positions
+            if getattr(position, "strike", None) is not None
+            and min_price < position.strike < max_price
+        ]
+    )
+    strikes = np.setdiff1d(strikes, price_points)
+    price_points = np.sort(
+        np.concatenate([price_points, strikes[: max(max_points - num_initial, 0)]])
+    )
+    pnl_grid = calculate_pnl_grid(
+        positions, price_points, use_cost_basis=use_cost_basis, engine=engine
+    )
+
+    pnl_values = pnl_grid.sum(axis=0)
+    allowed_error = tolerance * max(np.ptp(pnl_values), 1.0)
+
+    while len(price_points) < max_points:
+        errors = _estimate_interpolation_errors(price_points, pnl_values)
+        errors[np.diff(price_points) <= 2 * PRICE_TOLERANCE] = 0
+        candidates = np.flatnonzero(errors > allowed_error)
+        if len(candidates) == 0:
+            break
+
+        # Spend the remaining budget on the worst intervals first
+        candidates = candidates[np.argsort(errors[candidates])[::-1]]
+        candidates = candidates[: max_points - len(price_points)]
+        new_points = (price_points[candidates] + price_points[candidates + 1]) / 2
+        new_grid = calculate_pnl_grid(
+            positions, new_points, use_cost_basis=use_cost_basis, engine=engine
+        )
+
+        price_points = np.concatenate([price_points, new_points])
+        pnl_grid = np.concatenate([pnl_grid, new_grid], axis=1)
+        order = np.argsort(price_points)
+        price_points = price_points[order]
+        pnl_grid = pnl_grid[:, order]
+        pnl_values = pnl_grid.sum(axis=0)
+
+    return price_points, pnl_grid
 
 
 def calculate_position_pnl(
@@ -44,78 +281,11 @@ def calculate_position_pnl(
     min_price, max_price = price_range
     price_points = np.linspace(min_price, max_price, num_points)
 
-    # Calculate P&L for each price point
-    pnl_values = []
-
-    for price in price_points:
-        if isinstance(position, StockPosition):
-            # For stock positions, P&L is linear
-            if use_cost_basis:
-                # Use cost_basis as entry price (for historical P&L tracking)
-                entry_price = getattr(position, "cost_basis", position.price)
-            else:
-                # Use current price as entry price (for future P&L projections)
-                entry_price = position.price
-            pnl = (price - entry_price) * position.quantity
-        elif isinstance(position, OptionPosition):
-            # For option positions, calculate using QuantLib
-            # Convert expiry string to datetime if needed
-            if isinstance(position.expiry, str):
-                try:
-                    expiry_date = datetime.datetime.strptime(
-                        position.expiry, "%Y-%m-%d"
-                    )
-                except ValueError:
-                    logger.warning(f"Invalid expiry date format: {position.expiry}")
-                    pnl = 0
-                    continue
-            else:
-                expiry_date = position.expiry
-
-            option_contract = OptionContract(
-                underlying=position.ticker,  # Use ticker as underlying
-                expiry=expiry_date,
-                strike=position.strike,
-                option_type=position.option_type,
-                quantity=position.quantity,
-                current_price=position.price,  # Use price attribute
-                cost_basis=getattr(
-                    position, "cost_basis", position.price
-                ),  # Use cost_basis if available
-                description=f"{position.ticker} {position.option_type} {position.strike}",  # Create description
-            )
-
-            # Calculate theoretical price at the given underlying price
-            try:
-                # Call calculate_bs_price without evaluation_date parameter
-                theo_price = calculate_bs_price(
-                    option_contract,
-                    underlying_price=price,
-                )
-
-                # P&L = (current theoretical value - entry price) * quantity * 100
-                # Each option contract controls 100 shares
-                if use_cost_basis:
-                    # Use cost_basis as entry price (for historical P&L tracking)
-                    entry_price = getattr(position, "cost_basis", position.price)
-                else:
-                    # Use current price as entry price (for future P&L projections)
-                    entry_price = position.price
-                contract_multiplier = 100  # Standard contract size for equity options
-                pnl = (
-                    (theo_price - entry_price) * position.quantity * contract_multiplier
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Error calculating option price for {position.ticker} {position.option_type} {position.strike}: {e}"
-                )
-                pnl = 0
-        else:
-            # Unsupported position type
-            logger.warning(f"Unsupported position type: {type(position)}")
-            pnl = 0
-
-        pnl_values.append(pnl)
+    # Price through the same grid as calculate_strategy_pnl, so a leg gets the
+    # same P&L on its own and within a strategy
+    pnl_values = calculate_pnl_grid(
+        [position], price_points, use_cost_basis=use_cost_basis
+    )[0].tolist()
 
     return {
         "price_points": price_points.tolist(),
@@ -128,8 +298,10 @@ def calculate_strategy_pnl(
     positions: list[StockPosition | OptionPosition],
     price_range: tuple[float, float] | None = None,
     num_points: int = 50,
-    evaluation_date: datetime.datetime | None = None,
+    evaluation_date: datetime.datetime | None = None,  # noqa: ARG001 - kept for API compatibility
     use_cost_basis: bool = False,
+    *,
+    adaptive: bool = False,
 ) -> dict[str, Any]:
     """
     Calculate P&L for a group of positions (strategy) across a range of underlying prices.
@@ -137,9 +309,12 @@ def calculate_strategy_pnl(
     Args:
         positions: List of positions in the strategy
         price_range: Optional tuple of (min_price, max_price). If None, auto-calculated.
-        num_points: Number of price points to calculate
+        num_points: Number of price points to calculate, or with adaptive the
+            maximum number
         evaluation_date: Date to evaluate P&L at. If None, uses current date.
         use_cost_basis: If True, use cost_basis as entry price. If False, use current price.
+        adaptive: If True, place price points with sample_pnl_adaptively
+            instead of spacing them evenly
 
     Returns:
         Dictionary with price points and corresponding P&L values
@@ -160,26 +335,29 @@ def calculate_strategy_pnl(
         )
         price_range = determine_price_range(positions, current_price)
 
-    min_price, max_price = price_range
-    price_points = np.linspace(min_price, max_price, num_points)
+    if adaptive:
+        price_points, pnl_grid = sample_pnl_adaptively(
+            positions, price_range, num_points, use_cost_basis=use_cost_basis
+        )
+    else:
+        min_price, max_price = price_range
+        price_points = np.linspace(min_price, max_price, num_points)
 
-    # Calculate P&L for each position at each price point
-    position_pnls = []
-    for position in positions:
-        position_pnl = calculate_position_pnl(
-            position,
-            price_range=(min_price, max_price),
-            num_points=num_points,
-            evaluation_date=evaluation_date,
-            use_cost_basis=use_cost_basis,
+        # Calculate P&L for all positions at all price points in one batch
+        pnl_grid = calculate_pnl_grid(
+            positions, price_points, use_cost_basis=use_cost_basis
         )
-        position_pnls.append(position_pnl)
+    position_pnls = [
+        {
+            "price_points": price_points.tolist(),
+            "pnl_values": pnl_values.tolist(),
+            "position": position.to_dict() if hasattr(position, "to_dict") else {},
+        }
+        for position, pnl_values in zip(positions, pnl_grid, strict=True)
+    ]
 
     # Combine P&L values for all positions
-    # This is the most accurate way to calculate combined P&L
-    combined_pnl = np.zeros(num_points)
-    for pos_pnl in position_pnls:
-        combined_pnl += np.array(pos_pnl["pnl_values"])
+    combined_pnl = pnl_grid.sum(axis=0)
 
     # Create position summaries for the response
     position_summaries = [position.to_dict() for position in positions]
@@ -226,12 +404,22 @@ def determine_price_range(
     return (min_price, max_price)
 
 
-def calculate_breakeven_points(pnl_data: dict[str, Any]) -> list[float]:
+def calculate_breakeven_points(
+    pnl_data: dict[str, Any],
+    positions: list[StockPosition | OptionPosition] | None = None,
+    use_cost_basis: bool = False,
+) -> list[float]:
     """
     Calculate breakeven points from P&L data.
 
+    Without positions, breakevens are interpolated between the sampled price
+    points. With positions, they are solved for exactly with
+    solve_breakeven_points, using the sampled points as brackets.
+
     Args:
         pnl_data: P&L data from calculate_strategy_pnl
+        positions: The positions pnl_data was calculated for, to solve exactly
+        use_cost_basis: The use_cost_basis pnl_data was calculated with
 
     Returns:
         List of price points where P&L crosses zero
@@ -239,6 +427,11 @@ def calculate_breakeven_points(pnl_data: dict[str, Any]) -> list[float]:
     price_points = np.array(pnl_data["price_points"])
     pnl_values = np.array(pnl_data["pnl_values"])
 
+    if positions:
+        return solve_breakeven_points(
+            positions, price_points, pnl_values, use_cost_basis=use_cost_basis
+        )
+
     # Find where P&L crosses zero
     breakeven_points = []
     for i in range(1, len(pnl_values)):
@@ -257,205 +450,260 @@ def calculate_breakeven_points(pnl_data: dict[str, Any]) -> list[float]:
     return breakeven_points
 
 
-def analyze_asymptotic_behavior(positions: list) -> dict[str, bool]:
+def _calculate_total_pnl(
+    positions: list[StockPosition | OptionPosition],
+    price_points: np.ndarray,
+    use_cost_basis: bool,
+    engine: str | None,
+) -> np.ndarray:
+    """Calculate the combined P&L of the positions at each price point."""
+    return calculate_pnl_grid(
+        positions, price_points, use_cost_basis=use_cost_basis, engine=engine
+    ).sum(axis=0)
+
+
+def solve_breakeven_points(
+    positions: list[StockPosition | OptionPosition],
+    price_points: np.ndarray,
+    pnl_values: np.ndarray | None = None,
+    *,
+    use_cost_basis: bool = False,
+    tolerance: float = PRICE_TOLERANCE,
+    engine: str | None = None,
+) -> list[float]:
     """
-    Analyze whether profit/loss is unbounded as price approaches extreme values.
+    Find the underlying prices where a strategy's P&L is exactly zero.
 
-    Uses the effective delta at very high and very low prices to determine
-    if the P&L is bounded or unbounded in either direction.
+    Sign changes on the (possibly coarse) price grid bracket the breakevens,
+    which are then refined together with the Illinois variant of regula falsi.
+    Each iteration prices all unconverged breakevens in one calculate_pnl_grid
+    call, so a handful of calls replaces a dense grid.
 
     Args:
-        positions: List of stock and option positions
+        positions: The positions in the strategy
+        price_points: Increasing underlying prices to bracket breakevens on
+        pnl_values: Combined P&L at price_points, if already calculated
+        use_cost_basis: If True, use cost_basis as entry price. If False, use current price.
+        tolerance: Width in dollars to locate each breakeven to
+        engine: Pricing engine for option legs. See get_scenario_pricing_engine.
 
     Returns:
-        Dict with unbounded_profit and unbounded_loss flags
+        Sorted list of breakeven prices
     """
-    # Check if this is a SPY position for debugging
-    is_spy_position = any(p.get("ticker", "") == "SPY" for p in positions)
-    if is_spy_position:
-        logger.info(f"SPY position detected with {len(positions)} positions")
-        for i, pos in enumerate(positions):
-            logger.info(
-                f"Position {i}: {pos.get('ticker')} {pos.get('position_type')} {pos.get('option_type', '')} {pos.get('quantity')}"
-            )
+    price_points = np.asarray(price_points, dtype=float)
+    if pnl_values is None:
+        pnl_values = _calculate_total_pnl(
+            positions, price_points, use_cost_basis, engine
+        )
+    pnl_values = np.asarray(pnl_values, dtype=float)
+
+    # Grid points that are exact breakevens need no refinement
+    breakeven_points = price_points[pnl_values == 0].tolist()
+
+    crossings = np.flatnonzero(pnl_values[:-1] * pnl_values[1:] < 0)
+    low = price_points[crossings]
+    high = price_points[crossings + 1]
+    pnl_low = pnl_values[crossings]
+    pnl_high = pnl_values[crossings + 1]
+    roots = (low + high) / 2
+    # Which end of each bracket was replaced last: -1 low, 1 high, 0 neither
+    last_side = np.zeros(len(crossings), dtype=int)
+    active = np.ones(len(crossings), dtype=bool)
+
+    for _ in range(MAX_SOLVER_ITERATIONS):
+        if not active.any():
+            break
+        index = np.flatnonzero(active)
+        previous = roots[index]
+        guess = low[index] - pnl_low[index] * (high[index] - low[index]) / (
+            pnl_high[index] - pnl_low[index]
+        )
+        pnl = _calculate_total_pnl(positions, guess, use_cost_basis, engine)
+        roots[index] = guess
+
+        # Replace the end of the bracket with the same sign as the guess
+        replace_low = pnl * pnl_low[index] > 0
+        replace_high = ~replace_low & (pnl != 0)
+        low_index = index[replace_low]
+        high_index = index[replace_high]
+
+        # Illinois: halve the value kept at the end that did not move twice
+        pnl_high[low_index[last_side[low_index] == -1]] /= 2
+        pnl_low[high_index[last_side[high_index] == 1]] /= 2
+        low[low_index] = guess[replace_low]
+        pnl_low[low_index] = pnl[replace_low]
+        high[high_index] = guess[replace_high]
+        pnl_high[high_index] = pnl[replace_high]
+        last_side[low_index] = -1
+        last_side[high_index] = 1
+
+        converged = (
+            (pnl == 0)
+            | (high[index] - low[index] <= tolerance)
+            | (np.abs(guess - previous) <= tolerance / 2)
+        )
+        active[index[converged]] = False
 
-    # Use fixed extreme price points to approximate infinity and near-zero
-    # This removes dependency on current_price and provides consistent behavior
-    high_price = 1_000_000  # $1 million per share
-    low_price = 0.0001  # A tenth of a cent per share - small but not zero to avoid division issues
+    breakeven_points.extend(roots.tolist())
+    return sorted(breakeven_points)
 
-    # Calculate the total "effective delta" at these extreme prices
-    high_price_delta = 0
-    low_price_delta = 0
 
-    # For debugging, track individual position deltas
-    position_deltas = []
+def solve_max_profit_loss(
+    positions: list[StockPosition | OptionPosition],
+    price_points: np.ndarray,
+    pnl_values: np.ndarray | None = None,
+    *,
+    use_cost_basis: bool = False,
+    tolerance: float = PRICE_TOLERANCE,
+    engine: str | None = None,
+) -> dict[str, float]:
+    """
+    Find a strategy's maximum profit and loss within a price range.
 
-    for position in positions:
-        # For options, use their delta calculation
-        if position.get("position_type") == "option":
-            # Create an OptionContract for delta calculation
-            import datetime
-
-            from src.folio.options import OptionContract
-
-            # Parse expiry date from string format (assuming YYYY-MM-DD)
-            expiry_str = position.get("expiration", "2025-01-01")
-            if isinstance(expiry_str, str):
-                try:
-                    year, month, day = map(int, expiry_str.split("-"))
-                    expiry = datetime.datetime(year, month, day)
-                except (ValueError, AttributeError):
-                    # Default to 1 year from now if parsing fails
-                    expiry = datetime.datetime.now() + datetime.timedelta(days=365)
-            elif isinstance(expiry_str, datetime.date):
-                expiry = datetime.datetime.combine(
-                    expiry_str, datetime.datetime.min.time()
-                )
-            else:
-                # Default to 1 year from now
-                expiry = datetime.datetime.now() + datetime.timedelta(days=365)
-
-            option_contract = OptionContract(
-                underlying=position.get("ticker", ""),
-                expiry=expiry,
-                strike=position.get("strike", 0),
-                option_type=position.get("option_type", "CALL"),
-                quantity=position.get("quantity", 0),
-                current_price=position.get("price", 0),
-                cost_basis=position.get("cost_basis", 0),
-                description=position.get("description", ""),
+    The extremes on the (possibly coarse) price grid are refined together by
+    golden-section search between their neighbouring grid points, with one
+    calculate_pnl_grid call per iteration. Extremes at the ends of the grid
+    are bounded by the range and are returned as they are.
+
+    Args:
+        positions: The positions in the strategy
+        price_points: Increasing underlying prices to search
+        pnl_values: Combined P&L at price_points, if already calculated
+        use_cost_basis: If True, use cost_basis as entry price. If False, use current price.
+        tolerance: Width in dollars to locate each extreme to
+        engine: Pricing engine for option legs. See get_scenario_pricing_engine.
+
+    Returns:
+        Dictionary with max_profit, max_profit_price, max_loss and max_loss_price
+    """
+    price_points = np.asarray(price_points, dtype=float)
+    if pnl_values is None:
+        pnl_values = _calculate_total_pnl(
+            positions, price_points, use_cost_basis, engine
+        )
+    pnl_values = np.asarray(pnl_values, dtype=float)
+
+    # Search for the maximum of P&L and of -P&L
+    signs = np.array([1.0, -1.0])
+    grid_index = np.array([np.argmax(pnl_values), np.argmin(pnl_values)])
+    best_price = price_points[grid_index]
+    best_value = signs * pnl_values[grid_index]
+
+    last_index = len(price_points) - 1
+    interior = (grid_index > 0) & (grid_index < last_index)
+    if interior.any():
+        low = price_points[np.maximum(grid_index - 1, 0)]
+        high = price_points[np.minimum(grid_index + 1, last_index)]
+        step = GOLDEN_RATIO_CONJUGATE * (high - low)
+        inner_low = high - step
+        inner_high = low + step
+        values = np.tile(signs, 2) * _calculate_total_pnl(
+            positions,
+            np.concatenate([inner_low, inner_high]),
+            use_cost_basis,
+            engine,
+        )
+        value_low, value_high = values[:2], values[2:]
+
+        for _ in range(MAX_SOLVER_ITERATIONS):
+            if not np.any(interior & (high - low > tolerance)):
+                break
+            # Keep the side of the bracket holding the better inner point
+            keep_low = value_low >= value_high
+            high = np.where(keep_low, inner_high, high)
+            low = np.where(keep_low, low, inner_low)
+            step = GOLDEN_RATIO_CONJUGATE * (high - low)
+            new_price = np.where(keep_low, high - step, low + step)
+            new_value = signs * _calculate_total_pnl(
+                positions, new_price, use_cost_basis, engine
+            )
+            # The kept inner point becomes the other inner point
+            inner_low, inner_high = (
+                np.where(keep_low, new_price, inner_high),
+                np.where(keep_low, inner_low, new_price),
+            )
+            value_low, value_high = (
+                np.where(keep_low, new_value, value_high),
+                np.where(keep_low, value_low, new_value),
             )
 
-            # Get option type and quantity for delta calculation
-            option_type = position.get("option_type", "")
-            quantity = position.get("quantity", 0)
+        # Never report less than the grid found
+        refined_better = value_low >= value_high
+        refined_price = np.where(refined_better, inner_low, inner_high)
+        refined_value = np.where(refined_better, value_low, value_high)
+        improved = interior & (refined_value > best_value)
+        best_price = np.where(improved, refined_price, best_price)
+        best_value = np.where(improved, refined_value, best_value)
 
-            # Calculate delta at extreme prices
-            from src.folio.options import calculate_black_scholes_delta
+    return {
+        "max_profit": float(best_value[0]),
+        "max_profit_price": float(best_price[0]),
+        "max_loss": float(-best_value[1]),
+        "max_loss_price": float(best_price[1]),
+    }
 
-            try:
-                delta_at_high_price = calculate_black_scholes_delta(
-                    option_contract, high_price
-                )
-                delta_at_low_price = calculate_black_scholes_delta(
-                    option_contract, low_price
-                )
 
-                # Scale by position size (100 shares per contract)
-                contract_multiplier = 100
-                position_high_delta = (
-                    delta_at_high_price * quantity * contract_multiplier
-                )
-                position_low_delta = delta_at_low_price * quantity * contract_multiplier
-                high_price_delta += position_high_delta
-                low_price_delta += position_low_delta
-
-                # Track individual position deltas for debugging
-                position_deltas.append(
-                    {
-                        "type": "option",
-                        "option_type": position.get("option_type", ""),
-                        "strike": position.get("strike", 0),
-                        "quantity": quantity,
-                        "high_delta": position_high_delta,
-                        "low_delta": position_low_delta,
-                    }
-                )
-            except Exception:
-                # If delta calculation fails, use simplified approach based on option type
-                if option_type == "CALL":
-                    # For calls: delta approaches 1 at high prices, 0 at low prices
-                    position_high_delta = 1 * quantity * 100
-                    position_low_delta = 0
-                    high_price_delta += position_high_delta
-                    # No contribution at low prices (delta approaches 0)
-
-                    # Track individual position deltas for debugging
-                    position_deltas.append(
-                        {
-                            "type": "option (fallback)",
-                            "option_type": "CALL",
-                            "strike": position.get("strike", 0),
-                            "quantity": quantity,
-                            "high_delta": position_high_delta,
-                            "low_delta": position_low_delta,
-                        }
-                    )
-                elif option_type == "PUT":
-                    # For puts: delta approaches 0 at high prices, -1 at low prices
-                    position_high_delta = 0
-                    position_low_delta = -1 * quantity * 100
-                    low_price_delta += position_low_delta
-                    # No contribution at high prices (delta approaches 0)
-
-                    # Track individual position deltas for debugging
-                    position_deltas.append(
-                        {
-                            "type": "option (fallback)",
-                            "option_type": "PUT",
-                            "strike": position.get("strike", 0),
-                            "quantity": quantity,
-                            "high_delta": position_high_delta,
-                            "low_delta": position_low_delta,
-                        }
-                    )
+# Delta of each option type as the underlying price goes to infinity and to zero
+TERMINAL_DELTAS = {
+    "CALL": (1.0, 0.0),
+    "PUT": (0.0, -1.0),
+}
+
+
+def analyze_asymptotic_behavior(positions: list) -> dict[str, bool]:
+    """
+    Analyze whether profit/loss is unbounded as price approaches extreme values.
+
+    Uses the net delta of the position as the price goes to infinity and to
+    zero to determine if the P&L is bounded or unbounded in either direction.
+    These deltas follow from the structure of the position: stock always has
+    a delta of 1 per share, calls end with a delta of 1 at high prices and 0
+    at low prices, and puts 0 at high prices and -1 at low prices.
+
+    Args:
+        positions: List of stock and option positions
+
+    Returns:
+        Dict with unbounded_profit and unbounded_loss flags
+    """
+    high_price_delta = 0
+    low_price_delta = 0
+
+    for position in positions:
+        position_type = position.get("position_type")
+        quantity = position.get("quantity", 0)
 
         # For stocks, delta is always 1 (or -1 for short positions)
-        elif position.get("position_type") == "stock":
-            quantity = position.get("quantity", 0)
-            position_high_delta = quantity
-            position_low_delta = quantity
-            high_price_delta += position_high_delta
-            low_price_delta += position_low_delta
-
-            # Track individual position deltas for debugging
-            position_deltas.append(
-                {
-                    "type": "stock",
-                    "ticker": position.get("ticker", ""),
-                    "quantity": quantity,
-                    "high_delta": position_high_delta,
-                    "low_delta": position_low_delta,
-                }
-            )
+        if position_type == "stock":
+            high_price_delta += quantity
+            low_price_delta += quantity
+
+        elif position_type == "option":
+            option_type = str(position.get("option_type", "")).upper()
+            if option_type not in TERMINAL_DELTAS:
+                logger.warning(f"Skipping option with unknown type: {option_type}")
+                continue
+            delta_at_high_price, delta_at_low_price = TERMINAL_DELTAS[option_type]
+
+            # Scale by position size (100 shares per contract)
+            high_price_delta += delta_at_high_price * quantity * CONTRACT_MULTIPLIER
+            low_price_delta += delta_at_low_price * quantity * CONTRACT_MULTIPLIER
 
         # Skip unknown position types
-        else:
-            continue
 
     # Threshold for considering delta significant
     delta_threshold = 2.0  # Higher threshold to avoid false positives
 
-    # Log delta values and position details for debugging
-    logger.info(
-        f"Delta values: high_price_delta={high_price_delta}, low_price_delta={low_price_delta}"
+    logger.debug(
+        f"Terminal deltas: high_price_delta={high_price_delta}, low_price_delta={low_price_delta}"
     )
-    logger.info(f"Using delta_threshold={delta_threshold}")
-
-    # Log individual position deltas
-    logger.info("Individual position deltas:")
-    for pos in position_deltas:
-        logger.info(
-            f"  {pos['type']} {pos.get('option_type', '')} {pos.get('strike', '')} qty={pos['quantity']}: high_delta={pos['high_delta']:.2f}, low_delta={pos['low_delta']:.2f}"
-        )
 
     # Determine unbounded profit/loss based on delta
-    unbounded_profit_high = high_price_delta > delta_threshold
-    unbounded_loss_high = high_price_delta < -delta_threshold
-    unbounded_profit_low = low_price_delta < -delta_threshold
-    unbounded_loss_low = low_price_delta > delta_threshold
-
-    # Log the final determination
-    logger.info(
-        f"Final determination: unbounded_profit_high={unbounded_profit_high}, unbounded_loss_high={unbounded_loss_high}, unbounded_profit_low={unbounded_profit_low}, unbounded_loss_low={unbounded_loss_low}"
-    )
-
     return {
-        "unbounded_profit_high": unbounded_profit_high,
-        "unbounded_loss_high": unbounded_loss_high,
-        "unbounded_profit_low": unbounded_profit_low,
-        "unbounded_loss_low": unbounded_loss_low,
+        "unbounded_profit_high": high_price_delta > delta_threshold,
+        "unbounded_loss_high": high_price_delta < -delta_threshold,
+        "unbounded_profit_low": low_price_delta < -delta_threshold,
+        "unbounded_loss_low": low_price_delta > delta_threshold,
     }
 
 
@@ -502,12 +750,21 @@ def determine_boundedness(pnl_data: dict[str, Any]) -> tuple[bool, bool]:
     return unbounded_profit, unbounded_loss
 
 
-def calculate_max_profit_loss(pnl_data: dict[str, Any]) -> dict[str, Any]:
+def calculate_max_profit_loss(
+    pnl_data: dict[str, Any],
+    positions: list[StockPosition | OptionPosition] | None = None,
+    use_cost_basis: bool = False,
+) -> dict[str, Any]:
     """
     Calculate maximum profit and loss from P&L data.
 
+    Without positions, the extremes are the largest and smallest sampled
+    values. With positions, they are refined with solve_max_profit_loss.
+
     Args:
         pnl_data: P&L data from calculate_strategy_pnl
+        positions: The positions pnl_data was calculated for, to refine extremes
+        use_cost_basis: The use_cost_basis pnl_data was calculated with
 
     Returns:
         Dictionary with max_profit, max_loss, and their corresponding prices,
@@ -540,6 +797,15 @@ def calculate_max_profit_loss(pnl_data: dict[str, Any]) -> dict[str, Any]:
     max_loss_idx = pnl_values.index(max_loss)
     max_loss_price = price_points[max_loss_idx]
 
+    if positions:
+        extremes = solve_max_profit_loss(
+            positions, price_points, pnl_values, use_cost_basis=use_cost_basis
+        )
+        max_profit = extremes["max_profit"]
+        max_profit_price = extremes["max_profit_price"]
+        max_loss = extremes["max_loss"]
+        max_loss_price = extremes["max_loss_price"]
+
     # Initialize unbounded flags
     unbounded_profit = False
     unbounded_loss = False
@@ -568,7 +834,10 @@ def calculate_max_profit_loss(pnl_data: dict[str, Any]) -> dict[str, Any]:
 
 
 def summarize_strategy_pnl(
-    pnl_data: dict[str, Any], current_price: float
+    pnl_data: dict[str, Any],
+    current_price: float,
+    positions: list[StockPosition | OptionPosition] | None = None,
+    use_cost_basis: bool = False,
 ) -> dict[str, Any]:
     """
     Generate a summary of the P&L data for a strategy.
@@ -576,15 +845,19 @@ def summarize_strategy_pnl(
     Args:
         pnl_data: P&L data from calculate_strategy_pnl
         current_price: Current price of the underlying
+        positions: The positions pnl_data was calculated for. If given,
+            breakevens and max profit/loss are solved for rather than read
+            off the sampled points.
+        use_cost_basis: The use_cost_basis pnl_data was calculated with
 
     Returns:
         Dictionary with summary information
     """
     # Calculate breakeven points
-    breakeven_points = calculate_breakeven_points(pnl_data)
+    breakeven_points = calculate_breakeven_points(pnl_data, positions, use_cost_basis)
 
     # Calculate max profit/loss
-    max_pl = calculate_max_profit_loss(pnl_data)
+    max_pl = calculate_max_profit_loss(pnl_data, positions, use_cost_basis)
 
     # Calculate P&L at current price
     price_points = np.array(pnl_data["price_points"])
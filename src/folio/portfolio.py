@@ -8,10 +8,13 @@ This module provides core functionality for portfolio analysis, including:
 """
 
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import pandas as pd
 import yaml
 
+from src.price_cache import MemoryCache
 from src.stockdata import get_data_fetcher
 
 from .cash_detection import is_cash_or_short_term
@@ -24,6 +27,7 @@ from .data_model import (
 )
 from .formatting import format_beta, format_currency
 from .logger import logger
+from .portfolio_frame import PortfolioFrame
 from .portfolio_value import (
     calculate_portfolio_metrics,
     calculate_portfolio_values,
@@ -31,7 +35,7 @@ from .portfolio_value import (
     process_option_positions,
     process_stock_positions,
 )
-from .utils import clean_currency_value, get_beta
+from .utils import clean_currency_value, get_beta, get_betas
 
 # Load configuration
 config_path = os.path.join(os.path.dirname(__file__), "folio.yaml")
@@ -247,6 +251,57 @@ def process_portfolio_data(
         f"Unique Option Descriptions: {unique_options}"
     )  # Might include duplicates if format varies slightly
 
+    def needs_price_fetch(row) -> bool:
+        """Checks whether a stock row has no usable price in the CSV.
+
+        Args:
+            row: A row from the stock DataFrame.
+
+        Returns:
+            True if the latest price must be fetched for this row, False otherwise.
+        """
+        last_price = row["Last Price"]
+        if pd.isna(last_price) or last_price in ("--", ""):
+            symbol = str(row["Symbol"]).rstrip("*")
+            return not is_cash_or_short_term(
+                symbol, beta=None, description=row["Description"]
+            )
+        try:
+            return clean_currency_value(last_price) == 0
+        except (ValueError, TypeError):
+            return False
+
+    # Batch the work up front: one request for all missing prices, and one
+    # request plus one vectorized pass for the betas of all stocks and underlyings
+    valid_symbol_rows = stock_df[
+        stock_df["Symbol"].apply(lambda s: isinstance(s, str) and bool(s.strip()))
+    ]
+    price_fetch_symbols = [
+        row["Symbol"].rstrip("*")
+        for _, row in valid_symbol_rows.iterrows()
+        if needs_price_fetch(row)
+    ]
+    fetched_prices = _fetch_latest_prices(price_fetch_symbols, data_fetcher)
+
+    beta_symbols = [
+        row["Symbol"].rstrip("*")
+        for _, row in valid_symbol_rows.iterrows()
+        if not is_cash_or_short_term(
+            row["Symbol"].rstrip("*"), beta=None, description=row["Description"]
+        )
+    ]
+    beta_symbols += option_df["Description"].str.split().str[0].tolist()
+    betas = {}
+    if beta_symbols:
+        try:
+            betas = get_betas(beta_symbols)
+        except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+            # These are programming errors that should never be caught silently
+            raise
+        except Exception as e:
+            # Each position falls back to get_beta and handles its own errors
+            logger.warning(f"Batch beta calculation failed: {e}")
+
     # Create a map of stock positions and prices for option delta calculations
     stock_positions = {}
     cash_like_positions = []
@@ -316,25 +371,15 @@ def process_portfolio_data(
                     logger.debug(
                         f"Row {index}: Cash-like position {symbol} missing price. Using defaults."
                     )
+                elif symbol in fetched_prices:
+                    # Use the price fetched for non-cash positions with missing price
+                    price = fetched_prices[symbol]
+                    logger.info(f"Row {index}: Updated price for {symbol}: {price}")
                 else:
-                    # Try to fetch the current price for non-cash positions with missing price
-                    try:
-                        df = data_fetcher.fetch_data(symbol, period="1d")
-                        if not df.empty:
-                            price = df.iloc[-1]["Close"]
-                            logger.info(
-                                f"Row {index}: Updated price for {symbol}: {price}"
-                            )
-                        else:
-                            logger.warning(
-                                f"Row {index}: Could not fetch price for {symbol}. Skipping."
-                            )
-                            continue
-                    except Exception as e:
-                        logger.warning(
-                            f"Row {index}: Error fetching price for {symbol}: {e}. Skipping."
-                        )
-                        continue
+                    logger.warning(
+                        f"Row {index}: Could not fetch price for {symbol}. Skipping."
+                    )
+                    continue
             else:
                 price = clean_currency_value(row["Last Price"])
                 if price < 0:
@@ -343,24 +388,13 @@ def process_portfolio_data(
                     )
                     continue
                 elif price == 0:
-                    # Try to fetch the current price if the price is zero
-                    try:
-                        logger.debug(
-                            f"Row {index}: {symbol} has zero price. Attempting to fetch current price."
-                        )
-                        df = data_fetcher.fetch_data(symbol, period="1d")
-                        if not df.empty:
-                            price = df.iloc[-1]["Close"]
-                            logger.info(
-                                f"Row {index}: Updated price for {symbol}: {price}"
-                            )
-                        else:
-                            logger.warning(
-                                f"Row {index}: Could not fetch price for {symbol}. Calculations may be affected."
-                            )
-                    except Exception as e:
+                    # Use the current price fetched for zero-price positions
+                    if symbol in fetched_prices:
+                        price = fetched_prices[symbol]
+                        logger.info(f"Row {index}: Updated price for {symbol}: {price}")
+                    else:
                         logger.warning(
-                            f"Row {index}: Error fetching price for {symbol}: {e}. Calculations may be affected."
+                            f"Row {index}: Could not fetch price for {symbol}. Calculations may be affected."
                         )
 
             # Calculate position value
@@ -372,7 +406,7 @@ def process_portfolio_data(
             )
 
             # Get Beta - requires valid ticker and fetcher
-            beta = get_beta(symbol, description)
+            beta = betas[symbol] if symbol in betas else get_beta(symbol, description)
 
             # Determine if position is cash-like
             is_cash_like = is_cash_or_short_term(
@@ -649,6 +683,11 @@ def process_portfolio_data(
                     f"  - Could not extract underlying from option description: {opt_desc}"
                 )
 
+        # Fetch the latest prices for all orphaned underlyings in one request
+        orphan_price_data, _ = _fetch_histories(
+            list(orphaned_options_by_underlying), data_fetcher
+        )
+
         # Process each group of orphaned options
         for underlying, option_indices in orphaned_options_by_underlying.items():
             logger.debug(
@@ -667,7 +706,9 @@ def process_portfolio_data(
 
             # Get beta for the underlying
             try:
-                beta = get_beta(underlying)
+                beta = (
+                    betas[underlying] if underlying in betas else get_beta(underlying)
+                )
             except ValueError as beta_err:
                 # Only handle specific ValueError cases that we know how to handle
                 if "No historical data available" in str(beta_err):
@@ -691,8 +732,8 @@ def process_portfolio_data(
 
             # Get the latest price for the underlying
             try:
-                # Try to fetch the latest price
-                price_data = data_fetcher.fetch_data(underlying, period="1d")
+                # Use the latest price from the batched fetch
+                price_data = orphan_price_data.get(underlying)
                 if price_data is not None and not price_data.empty:
                     underlying_price = price_data.iloc[-1]["Close"]
                     if underlying_price <= 0:
@@ -912,6 +953,10 @@ def process_portfolio_data(
         # Decide how to handle summary failure - raise or return groups with None summary?
         raise  # Raising seems safer to indicate incomplete results
 
+    memory_cache = getattr(data_fetcher, "memory_cache", None)
+    if isinstance(memory_cache, MemoryCache):
+        logger.debug(f"Data fetcher memory cache: {memory_cache.stats()}")
+
     logger.info(
         f"=== Portfolio Loading Finished: {len(groups)} groups created, {len(cash_like_positions)} cash-like positions identified. ==="
     )
@@ -1001,27 +1046,30 @@ def calculate_portfolio_summary(
     if cash_like_positions is None:
         cash_like_positions = []
 
-    # Recalculate net exposure for each group using the canonical function
+    # Recalculate net exposure for each group using the canonical formulas,
+    # as column reductions over the portfolio's positions
     logger.debug(
         "Recalculating net exposure for all groups using the canonical function"
     )
-    for group in groups:
-        # Store the original net exposure for logging
-        original_net_exposure = group.net_exposure
-
-        # Recalculate net exposure using the canonical function
-        group.recalculate_net_exposure()
-
+    frame = PortfolioFrame.from_groups(groups)
+    net_exposures = frame.calculate_net_exposures().tolist()
+    beta_adjusted_exposures = frame.calculate_beta_adjusted_exposures().tolist()
+    for group, net_exposure, beta_adjusted_exposure in zip(
+        groups, net_exposures, beta_adjusted_exposures, strict=True
+    ):
         # Log the change if there's a significant difference
-        if abs(original_net_exposure - group.net_exposure) > 0.01:
+        if abs(group.net_exposure - net_exposure) > 0.01:
             logger.debug(
-                f"Group {group.ticker}: Net exposure recalculated from {format_currency(original_net_exposure)} to {format_currency(group.net_exposure)}"
+                f"Group {group.ticker}: Net exposure recalculated from {format_currency(group.net_exposure)} to {format_currency(net_exposure)}"
             )
 
+        group.net_exposure = net_exposure
+        group.beta_adjusted_exposure = beta_adjusted_exposure
+
     try:
         # Process positions using modular functions
-        long_stocks, short_stocks = process_stock_positions(groups)
-        long_options, short_options = process_option_positions(groups)
+        long_stocks, short_stocks = process_stock_positions(frame)
+        long_options, short_options = process_option_positions(frame)
 
         # Create value breakdowns
         long_value, short_value, options_value = create_value_breakdowns(
@@ -1041,7 +1089,7 @@ def calculate_portfolio_summary(
             portfolio_estimate_value,
             cash_percentage,
         ) = calculate_portfolio_values(
-            groups, cash_like_positions, pending_activity_value
+            frame, cash_like_positions, pending_activity_value
         )
 
         # Convert cash-like positions to StockPosition objects for consistent handling
@@ -1093,6 +1141,165 @@ def calculate_portfolio_summary(
         raise RuntimeError("Failed to calculate portfolio summary") from e
 
 
+def _fetch_latest_prices(
+    tickers: list[str], data_fetcher, refresh_config: dict | None = None
+) -> dict[str, float]:
+    """Fetch the latest close price for each ticker.
+
+    The refresh mode is read from the `app.price_refresh` section of folio.yaml:
+    - "batch" (default): a single `fetch_many` request for all tickers
+    - "concurrent": one `fetch_data` call per ticker on a bounded thread pool,
+      so refresh latency follows the slowest ticker rather than the sum
+
+    Unknown modes log a warning and use "batch". Failures are collected and
+    logged as a single aggregated report.
+
+    Args:
+        tickers: Tickers to fetch prices for
+        data_fetcher: Data fetcher to use for price updates
+        refresh_config: Optional override for the `app.price_refresh` settings
+
+    Returns:
+        Dictionary mapping each ticker with available data to its latest close price
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+
+    if refresh_config is None:
+        refresh_config = config.get("app", {}).get("price_refresh", {})
+    mode = refresh_config.get("mode", "batch")
+    if mode not in ("batch", "concurrent"):
+        logger.warning(f"Unknown price refresh mode: {mode}. Using batch.")
+        mode = "batch"
+
+    # Use a small period to get just the latest price
+    if mode == "concurrent":
+        histories, errors = _fetch_prices_concurrently(
+            tickers,
+            data_fetcher,
+            max_workers=refresh_config.get("max_workers", 8),
+            timeout=refresh_config.get("timeout", 10.0),
+        )
+    else:
+        histories, errors = _fetch_histories(tickers, data_fetcher)
+
+    latest_prices = {}
+    for ticker in tickers:
+        df = histories.get(ticker)
+        if df is not None and not df.empty:
+            latest_prices[ticker] = df.iloc[-1]["Close"]
+            logger.debug(f"Fetched price for {ticker}: {latest_prices[ticker]}")
+        elif ticker not in errors:
+            errors[ticker] = "no price data available"
+
+    if errors:
+        details = ", ".join(f"{ticker} ({reason})" for ticker, reason in errors.items())
+        logger.warning(
+            f"Price refresh failed for {len(errors)} of {len(tickers)} tickers: {details}"
+        )
+
+    return latest_prices
+
+
+def _fetch_histories(
+    tickers: list[str], data_fetcher
+) -> tuple[dict[str, pd.DataFrame], dict[str, str]]:
+    """Fetch one day of price data for all tickers with a single `fetch_many` call.
+
+    If the batch request fails, each ticker is fetched on its own, so one bad
+    ticker or cache write cannot fail the whole refresh.
+
+    Args:
+        tickers: Tickers to fetch prices for
+        data_fetcher: Data fetcher to use for price updates
+
+    Returns:
+        A tuple of (histories by ticker, error message by ticker)
+    """
+    try:
+        return data_fetcher.fetch_many(tickers, period="1d"), {}
+    except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+        # These are programming errors that should never be caught silently
+        raise
+    except Exception as e:
+        logger.warning(f"Batch price fetch failed, fetching per ticker: {e}")
+
+    histories = {}
+    errors = {}
+    for ticker in tickers:
+        try:
+            histories[ticker] = data_fetcher.fetch_data(ticker, period="1d")
+        except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+            raise
+        except Exception as e:
+            errors[ticker] = str(e)
+    return histories, errors
+
+
+def _fetch_prices_concurrently(
+    tickers: list[str], data_fetcher, max_workers: int, timeout: float
+) -> tuple[dict[str, pd.DataFrame], dict[str, str]]:
+    """Fetch one day of price data per ticker on a bounded thread pool.
+
+    Each ticker gets its own timeout, measured from when its fetch starts rather
+    than when it was queued. Fetches that exceed it are abandoned and reported.
+    Tickers still queued once every wave of workers could have timed out are
+    reported as timed out too, so hung fetches cannot stall the refresh.
+
+    Args:
+        tickers: Tickers to fetch prices for
+        data_fetcher: Data fetcher to use for price updates
+        max_workers: Maximum number of concurrent fetches
+        timeout: Per-ticker timeout in seconds
+
+    Returns:
+        A tuple of (histories by ticker, error message by ticker)
+    """
+    started_at = {}
+
+    def fetch(ticker: str) -> pd.DataFrame:
+        started_at[ticker] = time.monotonic()
+        return data_fetcher.fetch_data(ticker, period="1d")
+
+    histories = {}
+    errors = {}
+    workers = max(1, min(max_workers, len(tickers)))
+    waves = -(-len(tickers) // workers)
+    deadline = time.monotonic() + timeout * waves
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="price-refresh"
+    )
+    try:
+        pending = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+        while pending:
+            done, _ = wait(
+                pending, timeout=min(timeout, 0.1), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                ticker = pending.pop(future)
+                try:
+                    histories[ticker] = future.result()
+                except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+                    # These are programming errors that should never be caught silently
+                    raise
+                except Exception as e:
+                    errors[ticker] = str(e)
+
+            now = time.monotonic()
+            for future, ticker in list(pending.items()):
+                started = started_at.get(ticker)
+                if (started is not None and now - started > timeout) or now > deadline:
+                    future.cancel()
+                    errors[ticker] = f"timed out after {timeout}s"
+                    del pending[future]
+    finally:
+        # Don't block on abandoned fetches; their threads finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return histories, errors
+
+
 def update_portfolio_prices(
     portfolio_groups: list[PortfolioGroup], data_fetcher=None
 ) -> str:
@@ -1132,20 +1339,7 @@ def update_portfolio_prices(
     # Fetch latest prices for all tickers
     logger.info(f"Fetching latest prices for {len(tickers)} tickers")
 
-    # Use a small period to get just the latest price
-    latest_prices = {}
-    for ticker in tickers:
-        try:
-            # Fetch data for the last day
-            df = data_fetcher.fetch_data(ticker, period="1d")
-            if not df.empty:
-                # Get the latest close price
-                latest_prices[ticker] = df.iloc[-1]["Close"]
-                logger.debug(f"Updated price for {ticker}: {latest_prices[ticker]}")
-            else:
-                logger.warning(f"No price data available for {ticker}")
-        except Exception as e:
-            logger.error(f"Error fetching price for {ticker}: {e!s}")
+    latest_prices = _fetch_latest_prices(tickers, data_fetcher)
 
     # Update prices for all positions
     for group in portfolio_groups:
@@ -1225,36 +1419,26 @@ def update_zero_price_positions(
     )
 
     # Fetch prices for tickers with zero prices
-    for ticker in zero_price_tickers:
-        try:
-            # Fetch data for the last day
-            df = data_fetcher.fetch_data(ticker, period="1d")
-            if not df.empty:
-                # Get the latest close price
-                new_price = df.iloc[-1]["Close"]
-                logger.info(f"Fetched price for {ticker}: {new_price}")
-
-                # Update the price in all matching groups
-                for group in portfolio_groups:
-                    if group.ticker == ticker and group.stock_position:
-                        # Update the stock position
-                        group.stock_position.price = new_price
-                        group.stock_position.market_exposure = (
-                            new_price * group.stock_position.quantity
-                        )
-                        group.stock_position.market_value = (
-                            new_price * group.stock_position.quantity
-                        )
-                        group.stock_position.beta_adjusted_exposure = (
-                            group.stock_position.market_exposure
-                            * group.stock_position.beta
-                        )
+    latest_prices = _fetch_latest_prices(zero_price_tickers, data_fetcher)
+    for ticker, new_price in latest_prices.items():
+        logger.info(f"Fetched price for {ticker}: {new_price}")
+
+        # Update the price in all matching groups
+        for group in portfolio_groups:
+            if group.ticker == ticker and group.stock_position:
+                # Update the stock position
+                group.stock_position.price = new_price
+                group.stock_position.market_exposure = (
+                    new_price * group.stock_position.quantity
+                )
+                group.stock_position.market_value = (
+                    new_price * group.stock_position.quantity
+                )
+                group.stock_position.beta_adjusted_exposure = (
+                    group.stock_position.market_exposure * group.stock_position.beta
+                )
 
-                        logger.info(f"Updated price for {ticker} to {new_price}")
-            else:
-                logger.warning(f"Could not fetch price data for {ticker}")
-        except Exception as e:
-            logger.error(f"Error fetching price for {ticker}: {e!s}")
+                logger.info(f"Updated price for {ticker} to {new_price}")
 
     # Recalculate net exposure for each group using the canonical function
     logger.debug("Recalculating net exposure for groups with updated prices")
@@ -1306,36 +1490,24 @@ def update_all_prices(
     logger.info(f"Updating prices for {len(tickers_to_update)} positions")
 
     # Fetch prices for all tickers
-    for ticker in tickers_to_update:
-        try:
-            # Fetch data for the last day
-            df = data_fetcher.fetch_data(ticker, period="1d")
-            if not df.empty:
-                # Get the latest close price
-                new_price = df.iloc[-1]["Close"]
-                logger.debug(f"Fetched price for {ticker}: {new_price}")
-
-                # Update the price in all matching groups
-                for group in portfolio_groups:
-                    if group.ticker == ticker and group.stock_position:
-                        # Update the stock position
-                        group.stock_position.price = new_price
-                        group.stock_position.market_exposure = (
-                            new_price * group.stock_position.quantity
-                        )
-                        group.stock_position.market_value = (
-                            new_price * group.stock_position.quantity
-                        )
-                        group.stock_position.beta_adjusted_exposure = (
-                            group.stock_position.market_exposure
-                            * group.stock_position.beta
-                        )
+    latest_prices = _fetch_latest_prices(tickers_to_update, data_fetcher)
+    for ticker, new_price in latest_prices.items():
+        # Update the price in all matching groups
+        for group in portfolio_groups:
+            if group.ticker == ticker and group.stock_position:
+                # Update the stock position
+                group.stock_position.price = new_price
+                group.stock_position.market_exposure = (
+                    new_price * group.stock_position.quantity
+                )
+                group.stock_position.market_value = (
+                    new_price * group.stock_position.quantity
+                )
+                group.stock_position.beta_adjusted_exposure = (
+                    group.stock_position.market_exposure * group.stock_position.beta
+                )
 
-                        logger.debug(f"Updated price for {ticker} to {new_price}")
-            else:
-                logger.warning(f"Could not fetch price data for {ticker}")
-        except Exception as e:
-            logger.error(f"Error fetching price for {ticker}: {e!s}")
+                logger.debug(f"Updated price for {ticker} to {new_price}")
 
     return portfolio_groups
 
@@ -1573,9 +1745,9 @@ def recalculate_portfolio_with_prices(
         total_delta_exposure = sum(opt.delta_exposure for opt in recalculated_options)
         options_delta_exposure = sum(opt.delta_exposure for opt in recalculated_options)
 
-        # Create new portfolio group
-        recalculated_group = PortfolioGroup(
-            ticker=ticker,
+        # Copy the group with the recalculated positions; the option counts
+        # are unchanged
+        recalculated_group = group.copy_with(
             stock_position=recalculated_stock,
             option_positions=recalculated_options,
             net_exposure=net_exposure,
@@ -0,0 +1,231 @@
+"""Columnar portfolio representation.
+
+This module provides PortfolioFrame, which holds the positions of a list of
+PortfolioGroup objects as NumPy columns, so summary and chart aggregation are
+array reductions rather than walks over position objects.
+
+Stock columns have one entry per group, since a group holds at most one stock
+position. Option columns have one entry per option leg, ordered by group, with
+index arrays between groups and legs:
+- option_groups: the group index of each leg
+- option_offsets: legs of group i are option_offsets[i]:option_offsets[i + 1]
+
+Sign conventions match the position classes: short values are negative.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+from .data_model import OptionPosition, PortfolioGroup, StockPosition
+
+
+def _column(items: list, name: str) -> np.ndarray:
+    """Get one attribute of every item as a float array.
+
+    Missing values (None) become NaN rather than raising.
+    """
+    return np.array(list(map(attrgetter(name), items)), dtype=float)
+
+
+def _quantity(value: np.float64) -> int | float:
+    """Convert a quantity back to a Python number, as an int if it is whole."""
+    value = value.item()
+    return int(value) if value.is_integer() else value
+
+
+@dataclass
+class PortfolioFrame:
+    """Positions of a list of portfolio groups as NumPy columns."""
+
+    # Group columns
+    tickers: list[str]
+    betas: np.ndarray
+    net_exposures: np.ndarray
+    beta_adjusted_exposures: np.ndarray
+    total_delta_exposures: np.ndarray
+    options_delta_exposures: np.ndarray
+
+    # Stock columns, one entry per group; zero where has_stock is False
+    has_stock: np.ndarray
+    stock_tickers: list[str | None]
+    stock_quantities: np.ndarray
+    stock_prices: np.ndarray
+    stock_betas: np.ndarray
+    stock_market_exposures: np.ndarray
+    stock_beta_adjusted_exposures: np.ndarray
+    stock_market_values: np.ndarray
+    stock_cost_bases: np.ndarray
+
+    # Option columns, one entry per leg
+    option_groups: np.ndarray
+    option_offsets: np.ndarray
+    option_tickers: list[str]
+    option_expiries: list
+    option_is_call: np.ndarray
+    option_strikes: np.ndarray
+    option_quantities: np.ndarray
+    option_prices: np.ndarray
+    option_betas: np.ndarray
+    option_underlying_betas: np.ndarray
+    option_deltas: np.ndarray
+    option_notionals: np.ndarray
+    option_delta_exposures: np.ndarray
+    option_market_exposures: np.ndarray
+    option_beta_adjusted_exposures: np.ndarray
+    option_market_values: np.ndarray
+    option_cost_bases: np.ndarray
+
+    @classmethod
+    def from_groups(cls, portfolio_groups: list[PortfolioGroup]) -> "PortfolioFrame":
+        """Build the columns for a list of portfolio groups."""
+        stocks = [group.stock_position for group in portfolio_groups]
+        has_stock = np.array([stock is not None for stock in stocks], dtype=bool)
+        present = [stock for stock in stocks if stock is not None]
+        options = list(
+            chain.from_iterable(group.option_positions for group in portfolio_groups)
+        )
+        counts = np.array(
+            [len(group.option_positions) for group in portfolio_groups], dtype=int
+        )
+
+        def stock_column(name: str) -> np.ndarray:
+            values = np.zeros(len(portfolio_groups))
+            values[has_stock] = _column(present, name)
+            return values
+
+        return cls(
+            tickers=[group.ticker for group in portfolio_groups],
+            betas=_column(portfolio_groups, "beta"),
+            net_exposures=_column(portfolio_groups, "net_exposure"),
+            beta_adjusted_exposures=_column(portfolio_groups, "beta_adjusted_exposure"),
+            total_delta_exposures=_column(portfolio_groups, "total_delta_exposure"),
+            options_delta_exposures=_column(portfolio_groups, "options_delta_exposure"),
+            has_stock=has_stock,
+            stock_tickers=[stock.ticker if stock else None for stock in stocks],
+            stock_quantities=stock_column("quantity"),
+            stock_prices=stock_column("price"),
+            stock_betas=stock_column("beta"),
+            stock_market_exposures=stock_column("market_exposure"),
+            stock_beta_adjusted_exposures=stock_column("beta_adjusted_exposure"),
+            stock_market_values=stock_column("market_value"),
+            stock_cost_bases=stock_column("cost_basis"),
+            option_groups=np.repeat(np.arange(len(portfolio_groups)), counts),
+            option_offsets=np.concatenate(([0], np.cumsum(counts))),
+            option_tickers=[option.ticker for option in options],
+            option_expiries=[option.expiry for option in options],
+            option_is_call=np.array(
+                [option.option_type == "CALL" for option in options], dtype=bool
+            ),
+            option_strikes=_column(options, "strike"),
+            option_quantities=_column(options, "quantity"),
+            option_prices=_column(options, "price"),
+            option_betas=_column(options, "beta"),
+            option_underlying_betas=_column(options, "underlying_beta"),
+            option_deltas=_column(options, "delta"),
+            option_notionals=_column(options, "notional_value"),
+            option_delta_exposures=_column(options, "delta_exposure"),
+            option_market_exposures=_column(options, "market_exposure"),
+            option_beta_adjusted_exposures=_column(options, "beta_adjusted_exposure"),
+            option_market_values=_column(options, "market_value"),
+            option_cost_bases=_column(options, "cost_basis"),
+        )
+
+    def __len__(self) -> int:
+        """Number of groups."""
+        return len(self.tickers)
+
+    def to_groups(self) -> list[PortfolioGroup]:
+        """Rebuild the portfolio groups from the columns."""
+        groups = []
+        for index, ticker in enumerate(self.tickers):
+            stock_position = None
+            if self.has_stock[index]:
+                stock_position = StockPosition(
+                    ticker=self.stock_tickers[index],
+                    quantity=_quantity(self.stock_quantities[index]),
+                    beta=self.stock_betas[index].item(),
+                    beta_adjusted_exposure=self.stock_beta_adjusted_exposures[
+                        index
+                    ].item(),
+                    market_exposure=self.stock_market_exposures[index].item(),
+                    price=self.stock_prices[index].item(),
+                    cost_basis=self.stock_cost_bases[index].item(),
+                    market_value=self.stock_market_values[index].item(),
+                )
+
+            option_positions = [
+                OptionPosition(
+                    ticker=self.option_tickers[leg],
+                    position_type="option",
+                    quantity=_quantity(self.option_quantities[leg]),
+                    beta=self.option_betas[leg].item(),
+                    beta_adjusted_exposure=self.option_beta_adjusted_exposures[
+                        leg
+                    ].item(),
+                    strike=self.option_strikes[leg].item(),
+                    expiry=self.option_expiries[leg],
+                    option_type="CALL" if self.option_is_call[leg] else "PUT",
+                    delta=self.option_deltas[leg].item(),
+                    delta_exposure=self.option_delta_exposures[leg].item(),
+                    notional_value=self.option_notionals[leg].item(),
+                    underlying_beta=self.option_underlying_betas[leg].item(),
+                    market_exposure=self.option_market_exposures[leg].item(),
+                    price=self.option_prices[leg].item(),
+                    cost_basis=self.option_cost_bases[leg].item(),
+                    market_value=self.option_market_values[leg].item(),
+                )
+                for leg in range(
+                    self.option_offsets[index], self.option_offsets[index + 1]
+                )
+            ]
+
+            groups.append(
+                PortfolioGroup(
+                    ticker=ticker,
+                    stock_position=stock_position,
+                    option_positions=option_positions,
+                    net_exposure=self.net_exposures[index].item(),
+                    beta=self.betas[index].item(),
+                    beta_adjusted_exposure=self.beta_adjusted_exposures[index].item(),
+                    total_delta_exposure=self.total_delta_exposures[index].item(),
+                    options_delta_exposure=self.options_delta_exposures[index].item(),
+                )
+            )
+        return groups
+
+    def sum_by_group(self, option_values: np.ndarray) -> np.ndarray:
+        """Sum a per-leg option column within each group."""
+        return np.bincount(
+            self.option_groups, weights=option_values, minlength=len(self)
+        )
+
+    def calculate_net_exposures(self) -> np.ndarray:
+        """Net exposure of each group, as calculate_net_exposure computes it.
+
+        Returns:
+            Stock market exposure plus the sum of option delta exposures, per group
+        """
+        return self.stock_market_exposures + self.sum_by_group(
+            self.option_delta_exposures
+        )
+
+    def calculate_beta_adjusted_exposures(self) -> np.ndarray:
+        """Beta-adjusted exposure of each group, as calculate_beta_adjusted_exposure computes it.
+
+        Returns:
+            Stock plus option beta-adjusted exposures, per group
+        """
+        return self.stock_beta_adjusted_exposures + self.sum_by_group(
+            self.option_beta_adjusted_exposures
+        )
+
+    def valid_options(self) -> np.ndarray:
+        """Mask of option legs whose values are all present."""
+        return (
+            np.isfinite(self.option_delta_exposures)
+            & np.isfinite(self.option_market_values)
+            & np.isfinite(self.option_beta_adjusted_exposures)
+        )
@@ -12,6 +12,8 @@ For stocks, these are typically the same, but for options, the market value (wha
 can be much less than the exposure (delta * notional value).
 """
 
+import numpy as np
+
 from .data_model import (
     ExposureBreakdown,
     OptionPosition,
@@ -21,6 +23,14 @@ from .data_model import (
 )
 from .formatting import format_currency
 from .logger import logger
+from .portfolio_frame import PortfolioFrame
+
+
+def _as_frame(groups: list[PortfolioGroup] | PortfolioFrame) -> PortfolioFrame:
+    """Get the columnar form of a list of portfolio groups."""
+    if isinstance(groups, PortfolioFrame):
+        return groups
+    return PortfolioFrame.from_groups(groups)
 
 
 def calculate_net_exposure(
@@ -79,40 +89,42 @@ def calculate_beta_adjusted_exposure(
     return stock_beta_adjusted + options_beta_adjusted
 
 
-def process_stock_positions(groups: list[PortfolioGroup]) -> tuple[dict, dict]:
+def process_stock_positions(
+    groups: list[PortfolioGroup] | PortfolioFrame,
+) -> tuple[dict, dict]:
     """Process stock positions from portfolio groups.
 
     Extracts and categorizes stock positions into long and short components.
     Short values are stored as negative numbers.
 
     Args:
-        groups: List of portfolio groups
+        groups: List of portfolio groups, or their PortfolioFrame
 
     Returns:
         Tuple of (long_stocks, short_stocks) dictionaries with keys:
         - 'value': Market value
         - 'beta_adjusted': Beta-adjusted value
     """
-    long_stocks = {"value": 0.0, "beta_adjusted": 0.0}
-    short_stocks = {"value": 0.0, "beta_adjusted": 0.0}  # Will contain negative values
-
-    for group in groups:
-        if group.stock_position:
-            stock = group.stock_position
-            if stock.quantity >= 0:  # Long position
-                long_stocks["value"] += stock.market_value
-                long_stocks["beta_adjusted"] += stock.beta_adjusted_exposure
-            else:  # Short position
-                # Keep negative values for short positions
-                short_stocks["value"] += stock.market_value  # Already negative
-                short_stocks["beta_adjusted"] += (
-                    stock.beta_adjusted_exposure
-                )  # Already negative
+    frame = _as_frame(groups)
+    long = frame.has_stock & (frame.stock_quantities >= 0)
+    short = frame.has_stock & ~long
+
+    long_stocks = {
+        "value": float(frame.stock_market_values[long].sum()),
+        "beta_adjusted": float(frame.stock_beta_adjusted_exposures[long].sum()),
+    }
+    # Short values are already negative
+    short_stocks = {
+        "value": float(frame.stock_market_values[short].sum()),
+        "beta_adjusted": float(frame.stock_beta_adjusted_exposures[short].sum()),
+    }
 
     return long_stocks, short_stocks
 
 
-def process_option_positions(groups: list[PortfolioGroup]) -> tuple[dict, dict]:
+def process_option_positions(
+    groups: list[PortfolioGroup] | PortfolioFrame,
+) -> tuple[dict, dict]:
     """Process option positions from portfolio groups.
 
     Extracts and categorizes option positions into long and short components
@@ -122,12 +134,12 @@ def process_option_positions(groups: list[PortfolioGroup]) -> tuple[dict, dict]:
     - Positive delta exposure (long calls, short puts) => Long position
     - Negative delta exposure (short calls, long puts) => Short position
 
-    This function handles option positions safely, logging any errors but continuing
-    processing to ensure the chart can still be displayed even if some options
-    have issues.
+    This function handles option positions safely, logging options with missing
+    values but leaving them out of the totals, to ensure the chart can still be
+    displayed even if some options have issues.
 
     Args:
-        groups: List of portfolio groups
+        groups: List of portfolio groups, or their PortfolioFrame
 
     Returns:
         Tuple of (long_options, short_options) dictionaries with keys:
@@ -135,37 +147,29 @@ def process_option_positions(groups: list[PortfolioGroup]) -> tuple[dict, dict]:
         - 'beta_adjusted': Beta-adjusted value
         - 'delta_exposure': Delta exposure
     """
-    # Import the canonical notional value calculation function
-
-    long_options = {"value": 0.0, "beta_adjusted": 0.0, "delta_exposure": 0.0}
-    short_options = {
-        "value": 0.0,
-        "beta_adjusted": 0.0,
-        "delta_exposure": 0.0,
-    }  # Will contain negative values
-
-    for group in groups:
-        for opt in group.option_positions:
-            try:
-                # Categorize options based on delta exposure, not quantity
-                # Long Call / Short Put => Positive Delta Exposure => Long position
-                # Short Call / Long Put => Negative Delta Exposure => Short position
-                if opt.delta_exposure >= 0:  # Positive delta exposure = Long position
-                    long_options["value"] += opt.market_value
-                    long_options["beta_adjusted"] += opt.beta_adjusted_exposure
-                    long_options["delta_exposure"] += opt.delta_exposure
-                else:  # Negative delta exposure = Short position
-                    # Keep negative values for short positions
-                    short_options["value"] += opt.market_value
-                    short_options["beta_adjusted"] += opt.beta_adjusted_exposure
-                    short_options["delta_exposure"] += opt.delta_exposure
-            except Exception as e:
-                # Log the error but continue processing other options
-                logger.error(
-                    f"Error processing option {opt.option_type} {opt.strike} {opt.expiry} for {group.ticker}: {e}"
-                )
-                # Don't add this option to the totals
-                continue
+    frame = _as_frame(groups)
+    valid = frame.valid_options()
+    for leg in np.flatnonzero(~valid):
+        logger.error(
+            f"Error processing option {'CALL' if frame.option_is_call[leg] else 'PUT'} "
+            f"{frame.option_strikes[leg]} {frame.option_expiries[leg]} for "
+            f"{frame.tickers[frame.option_groups[leg]]}: missing values"
+        )
+
+    # Long Call / Short Put => Positive Delta Exposure => Long position
+    # Short Call / Long Put => Negative Delta Exposure => Short position
+    long = valid & (frame.option_delta_exposures >= 0)
+    short = valid & (frame.option_delta_exposures < 0)
+
+    def totals(mask: np.ndarray) -> dict:
+        return {
+            "value": float(frame.option_market_values[mask].sum()),
+            "beta_adjusted": float(frame.option_beta_adjusted_exposures[mask].sum()),
+            "delta_exposure": float(frame.option_delta_exposures[mask].sum()),
+        }
+
+    long_options = totals(long)
+    short_options = totals(short)  # Will contain negative values
 
     logger.debug(
         f"Processed option positions: Long={format_currency(long_options['value'])}, Short={format_currency(short_options['value'])}"
@@ -319,7 +323,7 @@ def calculate_portfolio_metrics(
 
 
 def calculate_portfolio_values(
-    groups: list[PortfolioGroup],
+    groups: list[PortfolioGroup] | PortfolioFrame,
     cash_like_positions: list[dict],
     pending_activity_value: float,
 ) -> tuple[float, float, float, float, float]:
@@ -330,31 +334,17 @@ def calculate_portfolio_values(
     even if some positions have issues.
 
     Args:
-        groups: List of portfolio groups
+        groups: List of portfolio groups, or their PortfolioFrame
         cash_like_positions: List of cash-like positions
         pending_activity_value: Value of pending activity
 
     Returns:
         Tuple of (stock_value, option_value, cash_like_value, portfolio_estimate_value, cash_percentage)
     """
-    # Calculate stock and option values
-    stock_value = 0.0
-    option_value = 0.0
-
-    for group in groups:
-        try:
-            if group.stock_position:
-                stock_value += group.stock_position.market_value
-        except Exception as e:
-            logger.error(f"Error processing stock position for {group.ticker}: {e}")
-            # Continue with other positions
-
-        for opt in group.option_positions:
-            try:
-                option_value += opt.market_value
-            except Exception as e:
-                logger.error(f"Error processing option position in {group.ticker}: {e}")
-                # Continue with other positions
+    # Calculate stock and option values, leaving out missing values
+    frame = _as_frame(groups)
+    stock_value = float(np.nansum(frame.stock_market_values))
+    option_value = float(np.nansum(frame.option_market_values))
 
     # Calculate cash-like value
     cash_like_value = 0.0
@@ -4,18 +4,175 @@ This module provides functionality for simulating portfolio performance
 under different market scenarios, particularly changes in the SPY index.
 """
 
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
 import numpy as np
+import pandas as pd
 
 from .data_model import PortfolioGroup
-from .logger import logger
+from .logger import load_config, logger
+from .options import (
+    OptionContract,
+    calculate_notional_value,
+    calculate_option_deltas,
+    calculate_option_greeks,
+    calculate_option_prices,
+    estimate_volatilities_with_skew,
+    get_scenario_pricing_engine,
+    roll_forward,
+)
 from .portfolio import recalculate_portfolio_with_prices
 
+# Simulation methods: "objects" rebuilds every position and the portfolio summary
+# per scenario with recalculate_portfolio_with_prices; "vectorized" evaluates all
+# positions across all scenarios as arrays with batched pricing calls; "taylor"
+# expands option values around today's prices (see TaylorApproximation)
+SIMULATION_METHODS = ("objects", "vectorized", "taylor")
+DEFAULT_SIMULATION_METHOD = "vectorized"
+
+# Simulator settings from the `app.simulator` section of folio.yaml
+simulator_config = (load_config().get("app") or {}).get("simulator") or {}
+
+# Worker processes for scenario sweeps; 1 evaluates in-process
+DEFAULT_WORKER_COUNT = 1
+
+# Default axes of the spot x volatility x time surface
+DEFAULT_VOLATILITY_SHIFTS = (-0.10, -0.05, 0.0, 0.05, 0.10)
+DEFAULT_DAYS_FORWARD = (0, 7, 30, 90)
+# Options are valued at the default pricing volatility plus the shift, floored
+BASE_VOLATILITY = 0.3
+MIN_VOLATILITY = 0.01
+
+# Largest relative underlying move the "taylor" method approximates; scenarios
+# that move any option's underlying further are fully repriced
+DEFAULT_TAYLOR_MAX_MOVE = 0.05
+# Gammas sampled per side of today's prices, out to the largest move, to bound
+# the Taylor error
+TAYLOR_BOUND_POINTS = 4
+
+# Monte Carlo paths are simulated and priced in chunks of this many paths, so
+# memory use is bounded by the chunk size rather than the number of paths
+MONTE_CARLO_CHUNK_SIZE = 10_000
+MONTE_CARLO_CONFIDENCE_LEVELS = (0.95, 0.99)
+MONTE_CARLO_HISTOGRAM_BINS = 50
+# Return histories shorter than this are not used to estimate covariances
+MIN_RETURN_OBSERVATIONS = 20
+
+# Historical windows to replay against the current book, as (start, end) dates
+HISTORICAL_SCENARIOS = {
+    "2018-q4-selloff": ("2018-09-20", "2018-12-24"),
+    "2020-covid-crash": ("2020-02-19", "2020-03-23"),
+    "2022-drawdown": ("2022-01-03", "2022-10-12"),
+    "2025-tariff-shock": ("2025-02-19", "2025-04-08"),
+}
+# Price history loaded for replays, long enough to cover every scenario above
+DEFAULT_REPLAY_PERIOD = "10y"
+
+
+def get_simulation_method(method: str | None = None) -> str:
+    """Resolve the simulation method.
+
+    Args:
+        method: Method requested by the caller. If None, uses
+            `app.simulator.method` from folio.yaml, or "vectorized" if unset.
+
+    Returns:
+        One of SIMULATION_METHODS. Unknown names log a warning and use "vectorized".
+    """
+    if method is None:
+        method = simulator_config.get("method", DEFAULT_SIMULATION_METHOD)
+    if method not in SIMULATION_METHODS:
+        logger.warning(
+            f"Unknown simulation method: {method}. Using {DEFAULT_SIMULATION_METHOD}."
+        )
+        return DEFAULT_SIMULATION_METHOD
+    return method
+
+
+def get_worker_count(workers: int | None = None) -> int:
+    """Resolve the number of worker processes for scenario sweeps.
+
+    Args:
+        workers: Worker count requested by the caller. If None, uses
+            `app.simulator.workers` from folio.yaml, or 1 if unset. 0 uses one
+            worker per CPU core.
+
+    Returns:
+        The number of workers, at least 1. Invalid counts log a warning and use 1.
+    """
+    if workers is None:
+        workers = simulator_config.get("workers", DEFAULT_WORKER_COUNT)
+    if not isinstance(workers, int) or workers < 0:
+        logger.warning(
+            f"Invalid worker count: {workers}. Using {DEFAULT_WORKER_COUNT}."
+        )
+        return DEFAULT_WORKER_COUNT
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _get_position_details(portfolio_groups: list[PortfolioGroup]) -> dict:
+    """Collect details about each group's current positions, keyed by ticker."""
+    position_details = {}
+    for group in portfolio_groups:
+        stock_value = group.stock_position.market_value if group.stock_position else 0
+        option_value = (
+            sum(op.market_value for op in group.option_positions)
+            if group.option_positions
+            else 0
+        )
+        total_value = stock_value + option_value
+
+        position_details[group.ticker] = {
+            "beta": group.beta,
+            "initial_value": total_value,
+            "has_stock": group.stock_position is not None,
+            "has_options": len(group.option_positions) > 0
+            if group.option_positions
+            else False,
+            "stock_quantity": group.stock_position.quantity
+            if group.stock_position
+            else 0,
+            "stock_price": group.stock_position.price if group.stock_position else 0,
+            "option_count": len(group.option_positions)
+            if group.option_positions
+            else 0,
+        }
+    return position_details
+
+
+def _calculate_position_changes(
+    position_values: dict[str, list[float]], zero_index: int | None
+) -> dict:
+    """Calculate each position's value changes relative to the 0% scenario."""
+    position_changes = {}
+    if zero_index is not None:
+        for ticker, values in position_values.items():
+            if len(values) > zero_index:
+                base_value = values[zero_index]
+                changes = [value - base_value for value in values]
+                pct_changes = calculate_percentage_changes(values, base_value)
+
+                position_changes[ticker] = {
+                    "values": values,
+                    "changes": changes,
+                    "pct_changes": pct_changes,
+                }
+    return position_changes
+
 
 def simulate_portfolio_with_spy_changes(
     portfolio_groups: list[PortfolioGroup],
     spy_changes: list[float] | None = None,
     cash_like_positions: list[dict] | None = None,
     pending_activity_value: float = 0.0,
+    *,
+    method: str | None = None,
+    workers: int | None = None,
 ) -> dict:
     """Simulate portfolio performance across different SPY price changes.
 
@@ -25,6 +182,9 @@ def simulate_portfolio_with_spy_changes(
                     If None, uses default range from -30% to +30% in 5% increments
         cash_like_positions: Cash-like positions
         pending_activity_value: Value of pending activity
+        method: Simulation method. See get_simulation_method.
+        workers: Number of worker processes to shard scenarios across, for the
+            vectorized method. See get_worker_count.
 
     Returns:
         Dictionary with simulation results containing:
@@ -48,6 +208,17 @@ def simulate_portfolio_with_spy_changes(
     if spy_changes is None:
         spy_changes = np.arange(-0.30, 0.31, 0.05).tolist()
 
+    method = get_simulation_method(method)
+    if method != "objects":
+        return _simulate_vectorized(
+            portfolio_groups,
+            spy_changes,
+            cash_like_positions,
+            pending_activity_value,
+            workers=workers,
+            taylor=method == "taylor",
+        )
+
     # Initialize results
     portfolio_values = []
     portfolio_exposures = []
@@ -55,38 +226,12 @@ def simulate_portfolio_with_spy_changes(
     # Initialize position-level tracking
     position_values = {}  # ticker -> list of values at each SPY change
     position_exposures = {}  # ticker -> list of exposures at each SPY change
-    position_details = {}  # ticker -> details about the position
+    position_details = _get_position_details(portfolio_groups)
 
     # Initialize with all tickers in the portfolio
     for group in portfolio_groups:
-        ticker = group.ticker
-        position_values[ticker] = []
-        position_exposures[ticker] = []
-
-        # Store position details
-        stock_value = group.stock_position.market_value if group.stock_position else 0
-        option_value = (
-            sum(op.market_value for op in group.option_positions)
-            if group.option_positions
-            else 0
-        )
-        total_value = stock_value + option_value
-
-        position_details[ticker] = {
-            "beta": group.beta,
-            "initial_value": total_value,
-            "has_stock": group.stock_position is not None,
-            "has_options": len(group.option_positions) > 0
-            if group.option_positions
-            else False,
-            "stock_quantity": group.stock_position.quantity
-            if group.stock_position
-            else 0,
-            "stock_price": group.stock_position.price if group.stock_position else 0,
-            "option_count": len(group.option_positions)
-            if group.option_positions
-            else 0,
-        }
+        position_values[group.ticker] = []
+        position_exposures[group.ticker] = []
 
     # Get current portfolio value and exposure (at 0% change)
     current_value = 0.0
@@ -171,21 +316,6 @@ def simulate_portfolio_with_spy_changes(
             current_value = recalculated_summary.portfolio_estimate_value
             current_exposure = recalculated_summary.net_market_exposure
 
-    # Calculate position-level changes
-    position_changes = {}
-    if zero_index is not None:
-        for ticker, values in position_values.items():
-            if len(values) > zero_index:
-                base_value = values[zero_index]
-                changes = [value - base_value for value in values]
-                pct_changes = calculate_percentage_changes(values, base_value)
-
-                position_changes[ticker] = {
-                    "values": values,
-                    "changes": changes,
-                    "pct_changes": pct_changes,
-                }
-
     return {
         "spy_changes": spy_changes,
         "portfolio_values": portfolio_values,
@@ -195,7 +325,1089 @@ def simulate_portfolio_with_spy_changes(
         "position_values": position_values,
         "position_exposures": position_exposures,
         "position_details": position_details,
-        "position_changes": position_changes,
+        "position_changes": _calculate_position_changes(position_values, zero_index),
+    }
+
+
+@dataclass
+class PortfolioArrays:
+    """Portfolio groups as arrays, for evaluating many price scenarios at once.
+
+    Built once per portfolio, so repeated evaluations (e.g. Monte Carlo chunks)
+    do not rebuild option contracts. Options are priced as
+    OptionPosition.recalculate_with_price does: at the moved price of their
+    group's stock, with prices at the default volatility and deltas at the
+    skew-adjusted volatility. Options in groups without a stock position have
+    no underlying price to move and keep their current value and exposure.
+    """
+
+    tickers: list[str]
+    betas: np.ndarray
+    stock_quantities: np.ndarray
+    stock_prices: np.ndarray
+    contracts: list[OptionContract]
+    option_quantities: np.ndarray
+    # Group index of each contract
+    option_groups: np.ndarray
+    # Value and exposure per group of options that are not repriced
+    fixed_option_values: np.ndarray
+    fixed_option_exposures: np.ndarray
+
+    @classmethod
+    def from_groups(cls, portfolio_groups: list[PortfolioGroup]) -> "PortfolioArrays":
+        """Build the arrays for a list of portfolio groups."""
+        contracts = []
+        option_quantities = []
+        option_groups = []
+        fixed_option_values = np.zeros(len(portfolio_groups))
+        fixed_option_exposures = np.zeros(len(portfolio_groups))
+        for index, group in enumerate(portfolio_groups):
+            for option in group.option_positions:
+                if group.stock_position is None:
+                    fixed_option_values[index] += option.market_value
+                    fixed_option_exposures[index] += option.delta_exposure
+                    continue
+                contracts.append(
+                    OptionContract(
+                        underlying=option.ticker,
+                        expiry=datetime.datetime.strptime(option.expiry, "%Y-%m-%d")
+                        if isinstance(option.expiry, str)
+                        else option.expiry,
+                        strike=option.strike,
+                        option_type=option.option_type,
+                        quantity=option.quantity,
+                        current_price=option.price,
+                        description=f"{option.ticker} {option.option_type} {option.strike} {option.expiry}",
+                    )
+                )
+                option_quantities.append(option.quantity)
+                option_groups.append(index)
+
+        return cls(
+            tickers=[group.ticker for group in portfolio_groups],
+            betas=np.array([group.beta for group in portfolio_groups], dtype=float),
+            stock_quantities=np.array(
+                [
+                    group.stock_position.quantity if group.stock_position else 0.0
+                    for group in portfolio_groups
+                ],
+                dtype=float,
+            ),
+            stock_prices=np.array(
+                [
+                    group.stock_position.price if group.stock_position else 0.0
+                    for group in portfolio_groups
+                ],
+                dtype=float,
+            ),
+            contracts=contracts,
+            option_quantities=np.array(option_quantities, dtype=float),
+            option_groups=np.array(option_groups, dtype=int),
+            fixed_option_values=fixed_option_values,
+            fixed_option_exposures=fixed_option_exposures,
+        )
+
+    def evaluate(
+        self, adjustments: np.ndarray, with_exposures: bool = True
+    ) -> dict[str, np.ndarray]:
+        """Value every group under price scenarios.
+
+        All options in all scenarios are priced in one calculate_option_prices
+        and one calculate_option_deltas call.
+
+        Args:
+            adjustments: Price adjustment factors of shape (scenarios, groups)
+            with_exposures: If False, skip the option deltas and return only
+                the values
+
+        Returns:
+            Dictionary of (scenarios, groups) arrays: 'stock_values',
+            'option_values', 'group_values' (stock plus option values) and,
+            with exposures, 'option_exposures' and 'group_exposures' (stock
+            value plus option delta exposure)
+        """
+        underlying_prices = self.stock_prices * adjustments
+        stock_values = self.stock_quantities * underlying_prices
+        option_values = np.zeros_like(stock_values) + self.fixed_option_values
+        option_exposures = np.zeros_like(stock_values) + self.fixed_option_exposures
+
+        if self.contracts:
+            # One row per scenario, one column per option
+            spots = underlying_prices[:, self.option_groups]
+            engine = get_scenario_pricing_engine()
+            prices = calculate_option_prices(self.contracts, spots, engine=engine)
+            quantities = self.option_quantities
+
+            # Sum each group's options
+            membership = np.zeros((len(self.contracts), len(self.tickers)))
+            membership[np.arange(len(self.contracts)), self.option_groups] = 1.0
+            option_values += (prices * quantities * 100) @ membership
+
+            if with_exposures:
+                deltas = calculate_option_deltas(
+                    self.contracts,
+                    spots,
+                    volatilities=estimate_volatilities_with_skew(self.contracts, spots),
+                    engine=engine,
+                )
+                # Short positions have inverted delta
+                deltas = np.where(quantities >= 0, deltas, -deltas)
+                exposures = deltas * calculate_notional_value(quantities, spots)
+                option_exposures += exposures @ membership
+
+        results = {
+            "stock_values": stock_values,
+            "option_values": option_values,
+            "group_values": stock_values + option_values,
+        }
+        if with_exposures:
+            results["option_exposures"] = option_exposures
+            results["group_exposures"] = stock_values + option_exposures
+        return results
+
+    def evaluate_surface(
+        self,
+        adjustments: np.ndarray,
+        volatility_shifts: np.ndarray,
+        days_forward: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """Value every group over price, volatility and time scenarios.
+
+        Stock values depend only on the price scenario, so they are computed
+        once and broadcast over the other axes. Options are priced one horizon
+        at a time: moving the valuation date forward is the same as moving
+        every expiry back, so each horizon prices copies of the contracts with
+        earlier expiries, across all price and volatility scenarios in one
+        calculate_option_prices call. As in calculate_time_to_expiry, options
+        never have less than a day left.
+
+        Args:
+            adjustments: Price adjustment factors of shape (scenarios, groups)
+            volatility_shifts: Shifts added to the pricing volatility of every
+                option, e.g. 0.05 for five volatility points
+            days_forward: Calendar days to move the valuation date forward
+
+        Returns:
+            Dictionary of (days, volatility shifts, scenarios, groups) arrays:
+            'stock_values', 'option_values' and 'group_values'
+        """
+        underlying_prices = self.stock_prices * adjustments
+        shape = (len(days_forward), len(volatility_shifts), *adjustments.shape)
+        stock_values = np.broadcast_to(self.stock_quantities * underlying_prices, shape)
+        option_values = np.zeros(shape) + self.fixed_option_values
+
+        if self.contracts:
+            # One row per volatility shift, then one per price scenario, then
+            # one column per option
+            spots = underlying_prices[np.newaxis, :, self.option_groups]
+            volatilities = np.maximum(
+                BASE_VOLATILITY + np.asarray(volatility_shifts, dtype=float),
+                MIN_VOLATILITY,
+            )[:, np.newaxis, np.newaxis]
+
+            membership = np.zeros((len(self.contracts), len(self.tickers)))
+            membership[np.arange(len(self.contracts)), self.option_groups] = 1.0
+            weights = membership * (self.option_quantities * 100)[:, np.newaxis]
+
+            engine = get_scenario_pricing_engine()
+            for index, days in enumerate(days_forward):
+                prices = calculate_option_prices(
+                    roll_forward(self.contracts, days),
+                    spots,
+                    volatilities=volatilities,
+                    engine=engine,
+                )
+                option_values[index] += prices @ weights
+
+        return {
+            "stock_values": stock_values,
+            "option_values": option_values,
+            "group_values": stock_values + option_values,
+        }
+
+
+# Portfolio arrays of the pool a worker process belongs to, set once per
+# worker by _init_worker so shards only carry their scenarios
+_worker_state = {}
+
+
+def _init_worker(portfolio: PortfolioArrays) -> None:
+    """Store the portfolio arrays in a new worker process."""
+    _worker_state["portfolio"] = portfolio
+
+
+def _evaluate_in_worker(
+    adjustments: np.ndarray, with_exposures: bool
+) -> dict[str, np.ndarray]:
+    """Evaluate one shard of scenarios in a worker process."""
+    return _worker_state["portfolio"].evaluate(adjustments, with_exposures)
+
+
+class ScenarioPool:
+    """Evaluate PortfolioArrays across a pool of worker processes.
+
+    The portfolio arrays are sent to each worker once, when it starts. Each
+    evaluate call then splits its scenarios into one contiguous shard per
+    worker and concatenates the results in scenario order, so results match
+    PortfolioArrays.evaluate exactly. With one worker, scenarios are evaluated
+    in-process and no pool is started.
+
+    Use as a context manager, or call close when done.
+    """
+
+    def __init__(self, portfolio: PortfolioArrays, workers: int | None = None):
+        """Start the worker processes.
+
+        Args:
+            portfolio: Portfolio arrays to evaluate
+            workers: Number of worker processes. See get_worker_count.
+        """
+        self.portfolio = portfolio
+        self.workers = get_worker_count(workers)
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(portfolio,),
+            )
+
+    def evaluate(
+        self, adjustments: np.ndarray, with_exposures: bool = True
+    ) -> dict[str, np.ndarray]:
+        """Value every group under price scenarios, sharded across workers.
+
+        Args:
+            adjustments: Price adjustment factors of shape (scenarios, groups)
+            with_exposures: If False, skip the option deltas. See
+                PortfolioArrays.evaluate.
+
+        Returns:
+            The same arrays as PortfolioArrays.evaluate
+        """
+        shard_count = min(self.workers, len(adjustments))
+        if self._executor is None or shard_count <= 1:
+            return self.portfolio.evaluate(adjustments, with_exposures)
+
+        shards = np.array_split(adjustments, shard_count)
+        results = list(
+            self._executor.map(
+                _evaluate_in_worker, shards, [with_exposures] * shard_count
+            )
+        )
+        return {
+            key: np.concatenate([result[key] for result in results])
+            for key in results[0]
+        }
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ScenarioPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class TaylorApproximation:
+    """Taylor expansion of a portfolio's options around today's prices.
+
+    Greeks are calculated once, at today's prices and time, and scenarios are
+    then valued with arithmetic only:
+
+        price change = delta * dS + gamma * dS**2 / 2 + vega * dvol + theta * dt
+
+    Deltas for exposures are expanded as delta + gamma * dS at the
+    skew-adjusted volatility, as PortfolioArrays.evaluate calculates them.
+
+    Each scenario reports a bound on the error of its option values from the
+    price move: the remainder of the expansion is at most
+    dS**2 / 2 * max|gamma(S) - gamma|, with the maximum taken over gammas
+    sampled between today's price and the move. The volatility and time terms
+    are first order and not covered by the bound. Scenarios that move any
+    option's underlying by more than max_move are fully repriced with
+    PortfolioArrays instead.
+    """
+
+    portfolio: PortfolioArrays
+    max_move: float
+    # Per-option Greeks at today's prices and the default pricing volatility
+    prices: np.ndarray
+    deltas: np.ndarray
+    gammas: np.ndarray
+    vegas: np.ndarray
+    thetas: np.ndarray
+    # Per-option delta and gamma at the skew-adjusted volatility
+    exposure_deltas: np.ndarray
+    exposure_gammas: np.ndarray
+    # Spot distance between gamma samples, per option
+    bound_steps: np.ndarray
+    # Largest gamma deviation from today's within k samples of today's price,
+    # indexed by side (0 for down, 1 for up), then k, then option
+    gamma_envelopes: np.ndarray
+
+    @classmethod
+    def from_portfolio(
+        cls, portfolio: PortfolioArrays, max_move: float | None = None
+    ) -> "TaylorApproximation":
+        """Calculate the Greeks of a portfolio's options at today's prices.
+
+        Args:
+            portfolio: Portfolio arrays to expand
+            max_move: Largest relative underlying move to approximate. If None,
+                uses `app.simulator.taylor_max_move` from folio.yaml, or
+                DEFAULT_TAYLOR_MAX_MOVE if unset.
+
+        Returns:
+            The expansion, ready to evaluate scenarios
+        """
+        if max_move is None:
+            max_move = simulator_config.get("taylor_max_move", DEFAULT_TAYLOR_MAX_MOVE)
+
+        spots = portfolio.stock_prices[portfolio.option_groups]
+        # Today's prices first, then TAYLOR_BOUND_POINTS samples down and up
+        steps = np.arange(-TAYLOR_BOUND_POINTS, TAYLOR_BOUND_POINTS + 1)
+        steps = np.concatenate([[0], steps[steps != 0]])
+        bound_steps = spots * max_move / TAYLOR_BOUND_POINTS
+        engine = get_scenario_pricing_engine()
+        greeks = calculate_option_greeks(
+            portfolio.contracts,
+            spots + steps[:, np.newaxis] * bound_steps,
+            volatilities=BASE_VOLATILITY,
+            engine=engine,
+        )
+        exposure_greeks = calculate_option_greeks(
+            portfolio.contracts,
+            spots,
+            volatilities=estimate_volatilities_with_skew(portfolio.contracts, spots),
+            engine=engine,
+        )
+
+        # Samples ordered outwards from today's price on each side
+        deviations = np.abs(greeks["gamma"][1:] - greeks["gamma"][0])
+        down = deviations[:TAYLOR_BOUND_POINTS][::-1]
+        up = deviations[TAYLOR_BOUND_POINTS:]
+        envelopes = np.maximum.accumulate(np.stack([down, up]), axis=1)
+        gamma_envelopes = np.concatenate(
+            [np.zeros((2, 1, len(spots))), envelopes], axis=1
+        )
+
+        return cls(
+            portfolio=portfolio,
+            max_move=float(max_move),
+            prices=greeks["price"][0],
+            deltas=greeks["delta"][0],
+            gammas=greeks["gamma"][0],
+            vegas=greeks["vega"][0],
+            thetas=greeks["theta"][0],
+            exposure_deltas=exposure_greeks["delta"],
+            exposure_gammas=exposure_greeks["gamma"],
+            bound_steps=bound_steps,
+            gamma_envelopes=gamma_envelopes,
+        )
+
+    def evaluate(
+        self,
+        adjustments: np.ndarray,
+        volatility_shift: float = 0.0,
+        days_forward: int = 0,
+        with_exposures: bool = True,
+    ) -> dict[str, np.ndarray]:
+        """Value every group under price scenarios from the expansion.
+
+        Args:
+            adjustments: Price adjustment factors of shape (scenarios, groups)
+            volatility_shift: Shift added to every option's pricing volatility
+            days_forward: Calendar days to move the valuation date forward
+            with_exposures: If False, skip the exposures
+
+        Returns:
+            The arrays of PortfolioArrays.evaluate, plus 'error_bounds' (the
+            estimated bound on each scenario's option value error, zero for
+            repriced scenarios) and 'repriced' (whether each scenario was
+            fully repriced)
+        """
+        portfolio = self.portfolio
+        underlying_prices = portfolio.stock_prices * adjustments
+        stock_values = portfolio.stock_quantities * underlying_prices
+        option_values = np.zeros_like(stock_values) + portfolio.fixed_option_values
+        option_exposures = (
+            np.zeros_like(stock_values) + portfolio.fixed_option_exposures
+        )
+        error_bounds = np.zeros(len(adjustments))
+        repriced = np.zeros(len(adjustments), dtype=bool)
+
+        if portfolio.contracts:
+            # One row per scenario, one column per option
+            spots = underlying_prices[:, portfolio.option_groups]
+            moves = spots - portfolio.stock_prices[portfolio.option_groups]
+            volatility_change = (
+                max(BASE_VOLATILITY + volatility_shift, MIN_VOLATILITY)
+                - BASE_VOLATILITY
+            )
+            prices = (
+                self.prices
+                + self.deltas * moves
+                + self.gammas * moves**2 / 2.0
+                + self.vegas * volatility_change
+                + self.thetas * days_forward / 365.0
+            )
+            quantities = portfolio.option_quantities
+
+            membership = np.zeros((len(portfolio.contracts), len(portfolio.tickers)))
+            membership[np.arange(len(portfolio.contracts)), portfolio.option_groups] = (
+                1.0
+            )
+            option_values += (prices * quantities * 100) @ membership
+            # Gamma deviation up to the sample at or beyond each move
+            samples = np.clip(
+                np.ceil(np.abs(moves) / np.maximum(self.bound_steps, 1e-12)),
+                0,
+                TAYLOR_BOUND_POINTS,
+            ).astype(int)
+            envelopes = self.gamma_envelopes[
+                (moves > 0).astype(int), samples, np.arange(len(quantities))
+            ]
+            error_bounds = (moves**2 / 2.0 * envelopes * np.abs(quantities) * 100).sum(
+                axis=1
+            )
+
+            if with_exposures:
+                deltas = self.exposure_deltas + self.exposure_gammas * moves
+                deltas = np.where(quantities >= 0, deltas, -deltas)
+                exposures = deltas * calculate_notional_value(quantities, spots)
+                option_exposures += exposures @ membership
+
+            # Fully reprice scenarios beyond the range of the expansion
+            option_adjustments = adjustments[:, portfolio.option_groups]
+            repriced = np.any(np.abs(option_adjustments - 1.0) > self.max_move, axis=1)
+            if repriced.any():
+                exact = portfolio.evaluate_surface(
+                    adjustments[repriced],
+                    np.array([volatility_shift]),
+                    np.array([days_forward]),
+                )
+                option_values[repriced] = exact["option_values"][0, 0]
+                error_bounds[repriced] = 0.0
+                if with_exposures:
+                    option_exposures[repriced] = portfolio.evaluate(
+                        adjustments[repriced]
+                    )["option_exposures"]
+
+        results = {
+            "stock_values": stock_values,
+            "option_values": option_values,
+            "group_values": stock_values + option_values,
+            "error_bounds": error_bounds,
+            "repriced": repriced,
+        }
+        if with_exposures:
+            results["option_exposures"] = option_exposures
+            results["group_exposures"] = stock_values + option_exposures
+        return results
+
+
+def _get_cash_like_value(cash_like_positions: list | None) -> float:
+    """Sum the market value of cash-like positions (objects or dictionaries)."""
+    cash_like_value = 0.0
+    for pos in cash_like_positions or []:
+        if hasattr(pos, "to_dict"):
+            cash_like_value += pos.market_value
+        else:
+            cash_like_value += pos.get("market_value", 0.0)
+    return cash_like_value
+
+
+def _simulate_vectorized(
+    portfolio_groups: list[PortfolioGroup],
+    spy_changes: list[float],
+    cash_like_positions: list | None,
+    pending_activity_value: float,
+    *,
+    workers: int | None = None,
+    taylor: bool = False,
+) -> dict:
+    """Simulate SPY changes with arrays of shape (scenarios, groups).
+
+    Produces the same results as recalculating the portfolio per scenario,
+    with stock prices moving by 1 + spy_change * beta of their group. See
+    PortfolioArrays for how options are valued, and ScenarioPool for how
+    scenarios are sharded across workers. With taylor, options are valued
+    with a TaylorApproximation instead, and the results also include its
+    'error_bounds' and 'repriced' per scenario.
+    """
+    portfolio = PortfolioArrays.from_groups(portfolio_groups)
+    changes = np.asarray(spy_changes, dtype=float)
+    # One row per scenario, one column per group
+    adjustments = 1.0 + changes[:, np.newaxis] * portfolio.betas
+    if taylor:
+        results = TaylorApproximation.from_portfolio(portfolio).evaluate(adjustments)
+    else:
+        with ScenarioPool(portfolio, workers) as pool:
+            results = pool.evaluate(adjustments)
+    stock_values = results["stock_values"]
+    option_values = results["option_values"]
+    group_values = results["group_values"]
+    group_exposures = results["group_exposures"]
+
+    portfolio_values = (
+        group_values.sum(axis=1)
+        + _get_cash_like_value(cash_like_positions)
+        + pending_activity_value
+    )
+    portfolio_exposures = group_exposures.sum(axis=1)
+
+    position_values = {}
+    position_exposures = {}
+    for index, group in enumerate(portfolio_groups):
+        position_values[group.ticker] = group_values[:, index].tolist()
+        position_exposures[group.ticker] = group_exposures[:, index].tolist()
+
+    # Use the last 0% scenario, as the per-scenario method does
+    position_details = _get_position_details(portfolio_groups)
+    current_value = 0.0
+    current_exposure = 0.0
+    zero_indices = np.flatnonzero(np.abs(changes) < 0.001)
+    zero_index = int(zero_indices[-1]) if len(zero_indices) else None
+    if zero_index is not None:
+        current_value = float(portfolio_values[zero_index])
+        current_exposure = float(portfolio_exposures[zero_index])
+        for index, group in enumerate(portfolio_groups):
+            position_details[group.ticker].update(
+                {
+                    "current_value": float(group_values[zero_index, index]),
+                    "current_exposure": float(group_exposures[zero_index, index]),
+                    "stock_value": float(stock_values[zero_index, index]),
+                    "option_value": float(option_values[zero_index, index]),
+                }
+            )
+
+    simulation = {
+        "spy_changes": spy_changes,
+        "portfolio_values": portfolio_values.tolist(),
+        "portfolio_exposures": portfolio_exposures.tolist(),
+        "current_value": current_value,
+        "current_exposure": current_exposure,
+        "position_values": position_values,
+        "position_exposures": position_exposures,
+        "position_details": position_details,
+        "position_changes": _calculate_position_changes(position_values, zero_index),
+    }
+    if taylor:
+        simulation["error_bounds"] = results["error_bounds"].tolist()
+        simulation["repriced"] = results["repriced"].tolist()
+    return simulation
+
+
+def simulate_portfolio_surface(
+    portfolio_groups: list[PortfolioGroup],
+    spy_changes: list[float] | None = None,
+    volatility_shifts: list[float] | None = None,
+    days_forward: list[int] | None = None,
+    *,
+    cash_like_positions: list | None = None,
+    pending_activity_value: float = 0.0,
+) -> dict:
+    """Simulate portfolio value over SPY changes, volatility shifts and time.
+
+    Stock prices move by 1 + spy_change * beta of their group, as in
+    simulate_portfolio_with_spy_changes. See PortfolioArrays.evaluate_surface
+    for how options are valued and how work is shared across the axes.
+
+    Args:
+        portfolio_groups: Portfolio groups to simulate
+        spy_changes: SPY price changes. If None, uses -30% to +30% in 5%
+            increments.
+        volatility_shifts: Shifts added to option volatilities. If None, uses
+            DEFAULT_VOLATILITY_SHIFTS.
+        days_forward: Calendar days to move the valuation date forward. If
+            None, uses DEFAULT_DAYS_FORWARD.
+        cash_like_positions: Cash-like positions
+        pending_activity_value: Value of pending activity
+
+    Returns:
+        Dictionary with simulation results containing:
+        - 'spy_changes', 'volatility_shifts', 'days_forward': The axes
+        - 'tickers': Ticker of each group, in group order
+        - 'current_value': Portfolio value with no change on any axis
+        - 'portfolio_values': Array of portfolio values of shape
+          (days, volatility shifts, SPY changes)
+        - 'pnl': portfolio_values less current_value
+        - 'group_values': Array of group values of shape
+          (days, volatility shifts, SPY changes, groups)
+    """
+    if spy_changes is None:
+        spy_changes = np.arange(-0.30, 0.31, 0.05).tolist()
+    if volatility_shifts is None:
+        volatility_shifts = list(DEFAULT_VOLATILITY_SHIFTS)
+    if days_forward is None:
+        days_forward = list(DEFAULT_DAYS_FORWARD)
+    shape = (len(days_forward), len(volatility_shifts), len(spy_changes))
+
+    if not portfolio_groups:
+        logger.warning("Cannot simulate an empty portfolio")
+        return {
+            "spy_changes": spy_changes,
+            "volatility_shifts": volatility_shifts,
+            "days_forward": days_forward,
+            "tickers": [],
+            "current_value": 0.0,
+            "portfolio_values": np.zeros(shape),
+            "pnl": np.zeros(shape),
+            "group_values": np.zeros((*shape, 0)),
+        }
+
+    portfolio = PortfolioArrays.from_groups(portfolio_groups)
+    changes = np.asarray(spy_changes, dtype=float)
+    results = portfolio.evaluate_surface(
+        1.0 + changes[:, np.newaxis] * portfolio.betas,
+        np.asarray(volatility_shifts, dtype=float),
+        np.asarray(days_forward, dtype=int),
+    )
+    base = portfolio.evaluate_surface(
+        np.ones((1, len(portfolio.tickers))), np.zeros(1), np.zeros(1, dtype=int)
+    )
+
+    other_value = _get_cash_like_value(cash_like_positions) + pending_activity_value
+    group_values = results["group_values"]
+    portfolio_values = group_values.sum(axis=-1) + other_value
+    current_value = float(base["group_values"].sum()) + other_value
+
+    return {
+        "spy_changes": spy_changes,
+        "volatility_shifts": volatility_shifts,
+        "days_forward": days_forward,
+        "tickers": portfolio.tickers,
+        "current_value": current_value,
+        "portfolio_values": portfolio_values,
+        "pnl": portfolio_values - current_value,
+        "group_values": group_values,
+    }
+
+
+def estimate_return_covariance(
+    tickers: list[str],
+    data_fetcher,
+    period: str = "1y",
+    market_index: str = "SPY",
+) -> pd.DataFrame:
+    """Estimate the covariance of daily log returns from cached price histories.
+
+    Histories are loaded with data_fetcher.fetch_many, so they come from the
+    fetcher's cache when it is fresh and cache misses are fetched together.
+    Tickers without enough history are left out; simulate_portfolio_monte_carlo maps them to the market index by beta,
+    so the market index is always included.
+
+    Args:
+        tickers: Tickers to estimate covariances for
+        data_fetcher: Data fetcher to load histories with
+        period: History period to estimate over
+        market_index: Market index to include
+
+    Returns:
+        Covariance matrix of daily log returns, indexed by ticker on both axes
+
+    Raises:
+        ValueError: If no ticker has enough history
+    """
+    try:
+        histories = data_fetcher.fetch_many(
+            list(dict.fromkeys([*tickers, market_index])), period=period
+        )
+    except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+        raise
+    except Exception as e:
+        logger.warning(f"Could not load price histories: {e}")
+        histories = {}
+
+    returns = {}
+    for ticker in dict.fromkeys([*tickers, market_index]):
+        df = histories.get(ticker)
+        if df is None or "Close" not in df or len(df) <= MIN_RETURN_OBSERVATIONS:
+            logger.warning(f"Not enough price history for {ticker}")
+            continue
+        returns[ticker] = np.log(df["Close"]).diff()
+
+    if not returns:
+        raise ValueError("No price history available to estimate covariances")
+
+    # Pairwise covariances use every date both tickers have a price for
+    return pd.DataFrame(returns).cov(min_periods=MIN_RETURN_OBSERVATIONS).fillna(0.0)
+
+
+def _get_return_factors(
+    portfolio: PortfolioArrays, covariance: pd.DataFrame, market_index: str
+) -> np.ndarray:
+    """Factor the covariance of group returns for sampling correlated returns.
+
+    Groups without a covariance estimate follow the market index scaled by
+    their beta, or do not move if the market index has no estimate either.
+
+    Returns:
+        Matrix F of shape (groups, groups) with F @ F.T the covariance of the
+        groups' daily log returns
+    """
+    assets = list(covariance.index)
+    loadings = np.zeros((len(portfolio.tickers), len(assets)))
+    for index, ticker in enumerate(portfolio.tickers):
+        if ticker in covariance.index:
+            loadings[index, assets.index(ticker)] = 1.0
+        elif market_index in covariance.index:
+            loadings[index, assets.index(market_index)] = portfolio.betas[index]
+        else:
+            logger.warning(f"No return estimate for {ticker}, holding its price")
+
+    group_covariance = loadings @ covariance.to_numpy() @ loadings.T
+    # Eigen-decomposition handles singular covariances (e.g. groups mapped to
+    # the market), which Cholesky does not; clip rounding noise below zero
+    eigenvalues, eigenvectors = np.linalg.eigh(group_covariance)
+    return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def simulate_portfolio_monte_carlo(
+    portfolio_groups: list[PortfolioGroup],
+    covariance: pd.DataFrame,
+    cash_like_positions: list | None = None,
+    pending_activity_value: float = 0.0,
+    *,
+    num_paths: int = 10_000,
+    horizon_days: int = 1,
+    seed: int | None = None,
+    chunk_size: int = MONTE_CARLO_CHUNK_SIZE,
+    confidence_levels: tuple[float, ...] = MONTE_CARLO_CONFIDENCE_LEVELS,
+    market_index: str = "SPY",
+    workers: int | None = None,
+) -> dict:
+    """Simulate portfolio P&L over random correlated price moves.
+
+    Each path draws zero-mean, jointly normal log returns for every group over
+    the horizon, with the covariance of daily returns scaled by the horizon
+    (see estimate_return_covariance). Positions are then repriced per path
+    with PortfolioArrays, the array engine behind
+    simulate_portfolio_with_spy_changes. Paths are generated in chunks of
+    chunk_size, and each worker prices one chunk at a time. Results for a seed
+    do not depend on the chunk size or the number of workers.
+
+    Options are repriced with the same time to expiry, and cash-like positions
+    and pending activity do not move, so they only add to the portfolio value.
+
+    Args:
+        portfolio_groups: Portfolio groups to simulate
+        covariance: Covariance matrix of daily log returns by ticker
+        cash_like_positions: Cash-like positions
+        pending_activity_value: Value of pending activity
+        num_paths: Number of paths to simulate
+        horizon_days: Number of trading days the returns are over
+        seed: Seed for the random number generator, for reproducible results
+        chunk_size: Number of paths to price at once
+        confidence_levels: Confidence levels to report VaR and expected
+            shortfall at
+        market_index: Market index that groups without a covariance estimate
+            follow by beta
+        workers: Number of worker processes to price paths with. See
+            get_worker_count.
+
+    Returns:
+        Dictionary with simulation results containing:
+        - 'current_value': Portfolio value with no price moves
+        - 'pnl_values': Array of P&L per path
+        - 'mean_pnl', 'std_pnl': Mean and standard deviation of the P&L
+        - 'var': VaR per confidence level, as a positive loss
+        - 'expected_shortfall': Mean loss beyond the VaR per confidence level
+        - 'histogram': Dictionary of 'counts' and bin 'edges' of the P&L
+    """
+    if not portfolio_groups or num_paths <= 0:
+        logger.warning("Cannot simulate an empty portfolio")
+        return {
+            "current_value": 0.0,
+            "pnl_values": np.array([]),
+            "mean_pnl": 0.0,
+            "std_pnl": 0.0,
+            "var": {},
+            "expected_shortfall": {},
+            "histogram": {"counts": [], "edges": []},
+        }
+
+    portfolio = PortfolioArrays.from_groups(portfolio_groups)
+    factors = _get_return_factors(portfolio, covariance, market_index) * np.sqrt(
+        horizon_days
+    )
+    rng = np.random.default_rng(seed)
+
+    base_values = portfolio.evaluate(
+        np.ones((1, len(portfolio.tickers))), with_exposures=False
+    )
+    base_value = float(base_values["group_values"].sum())
+
+    pnl_values = np.empty(num_paths)
+    with ScenarioPool(portfolio, workers) as pool:
+        batch_size = chunk_size * pool.workers
+        for start in range(0, num_paths, batch_size):
+            stop = min(start + batch_size, num_paths)
+            shocks = rng.standard_normal((stop - start, len(portfolio.tickers)))
+            adjustments = np.exp(shocks @ factors.T)
+            values = pool.evaluate(adjustments, with_exposures=False)
+            pnl_values[start:stop] = values["group_values"].sum(axis=1) - base_value
+
+    var = {}
+    expected_shortfall = {}
+    for level in confidence_levels:
+        threshold = np.quantile(pnl_values, 1.0 - level)
+        var[level] = float(-threshold)
+        expected_shortfall[level] = float(-pnl_values[pnl_values <= threshold].mean())
+
+    counts, edges = np.histogram(pnl_values, bins=MONTE_CARLO_HISTOGRAM_BINS)
+
+    return {
+        "current_value": base_value
+        + _get_cash_like_value(cash_like_positions)
+        + pending_activity_value,
+        "pnl_values": pnl_values,
+        "mean_pnl": float(pnl_values.mean()),
+        "std_pnl": float(pnl_values.std()),
+        "var": var,
+        "expected_shortfall": expected_shortfall,
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
+
+
+def load_price_history(
+    tickers: list[str],
+    data_fetcher,
+    period: str = DEFAULT_REPLAY_PERIOD,
+    market_index: str = "SPY",
+) -> pd.DataFrame:
+    """Load daily closes for historical replays from cached price histories.
+
+    Histories are loaded with data_fetcher.fetch_many, so they come from the
+    fetcher's cache when it is fresh and cache misses are fetched together.
+    Dates are those the market index traded on; other tickers' gaps (e.g.
+    foreign holidays) carry the last close forward.
+
+    Args:
+        tickers: Tickers to load
+        data_fetcher: Data fetcher to load histories with
+        period: History period to load
+        market_index: Market index to include, which sets the trading dates
+
+    Returns:
+        Daily closes indexed by date, one column per ticker with history.
+        Tickers without history are left out; replays move them with the
+        market index by beta.
+
+    Raises:
+        ValueError: If the market index has no history
+    """
+    histories = data_fetcher.fetch_many(
+        list(dict.fromkeys([*tickers, market_index])), period=period
+    )
+    closes = {
+        ticker: df["Close"]
+        for ticker, df in histories.items()
+        if df is not None and "Close" in df and not df.empty
+    }
+    if market_index not in closes:
+        raise ValueError(f"No price history available for {market_index}")
+
+    prices = pd.DataFrame(closes).sort_index()
+    prices = prices[prices[market_index].notna()]
+    return prices.ffill()
+
+
+def _get_price_relatives(
+    portfolio: PortfolioArrays,
+    prices: pd.DataFrame,
+    start_indices: np.ndarray,
+    end_indices: np.ndarray,
+    market_index: str,
+) -> np.ndarray:
+    """Price changes of every group between pairs of dates in a price history.
+
+    Groups without a price on either date follow the market index scaled by
+    their beta, as in _get_return_factors.
+
+    Returns:
+        Price adjustment factors of shape (pairs, groups)
+    """
+    levels = prices.reindex(columns=portfolio.tickers).to_numpy(dtype=float)
+    market = prices[market_index].to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relatives = levels[end_indices] / levels[start_indices]
+    market_relatives = market[end_indices] / market[start_indices]
+    fallback = 1.0 + np.outer(market_relatives - 1.0, portfolio.betas)
+    return np.where(np.isfinite(relatives), relatives, fallback)
+
+
+def simulate_historical_replay(
+    portfolio_groups: list[PortfolioGroup],
+    prices: pd.DataFrame,
+    start: str | None = None,
+    end: str | None = None,
+    *,
+    cash_like_positions: list | None = None,
+    pending_activity_value: float = 0.0,
+    market_index: str = "SPY",
+) -> dict:
+    """Replay a historical window against the current portfolio.
+
+    Each day of the window moves every group's price by its realized change
+    since the first day, and the book is revalued with PortfolioArrays, the
+    array engine matching recalculate_portfolio_with_prices. All days are
+    priced in one batch. Options keep their current time to expiry, so the
+    replay isolates price moves from time decay.
+
+    Args:
+        portfolio_groups: Portfolio groups to replay
+        prices: Daily closes from load_price_history
+        start: First date of the window. If None, the start of the history.
+        end: Last date of the window. If None, the end of the history.
+        cash_like_positions: Cash-like positions
+        pending_activity_value: Value of pending activity
+        market_index: Market index that groups without history follow by beta
+
+    Returns:
+        Dictionary with replay results containing:
+        - 'dates': Trading dates of the window
+        - 'portfolio_values': Array of portfolio values per date
+        - 'pnl': portfolio_values less current_value
+        - 'group_values': Array of group values of shape (dates, groups)
+        - 'tickers': Ticker of each group, in group order
+        - 'current_value': Portfolio value on the first date (today's prices)
+        - 'max_drawdown': Largest fall from a running peak of portfolio_values
+
+    Raises:
+        ValueError: If the window has no trading dates
+    """
+    window = prices.loc[start:end]
+    if window.empty:
+        raise ValueError(f"No price history between {start} and {end}")
+
+    if not portfolio_groups:
+        logger.warning("Cannot simulate an empty portfolio")
+        zeros = np.zeros(len(window))
+        return {
+            "dates": list(window.index),
+            "portfolio_values": zeros,
+            "pnl": zeros,
+            "group_values": np.zeros((len(window), 0)),
+            "tickers": [],
+            "current_value": 0.0,
+            "max_drawdown": 0.0,
+        }
+
+    portfolio = PortfolioArrays.from_groups(portfolio_groups)
+    days = np.arange(len(window))
+    adjustments = _get_price_relatives(
+        portfolio, window, np.zeros_like(days), days, market_index
+    )
+    group_values = portfolio.evaluate(adjustments, with_exposures=False)["group_values"]
+    portfolio_values = (
+        group_values.sum(axis=1)
+        + _get_cash_like_value(cash_like_positions)
+        + pending_activity_value
+    )
+    current_value = float(portfolio_values[0])
+
+    return {
+        "dates": list(window.index),
+        "portfolio_values": portfolio_values,
+        "pnl": portfolio_values - current_value,
+        "group_values": group_values,
+        "tickers": portfolio.tickers,
+        "current_value": current_value,
+        "max_drawdown": float(
+            np.max(np.maximum.accumulate(portfolio_values) - portfolio_values)
+        ),
+    }
+
+
+def simulate_rolling_replays(
+    portfolio_groups: list[PortfolioGroup],
+    prices: pd.DataFrame,
+    window_days: int = 20,
+    *,
+    step_days: int = 1,
+    market_index: str = "SPY",
+    chunk_size: int = MONTE_CARLO_CHUNK_SIZE,
+    workers: int | None = None,
+) -> dict:
+    """Replay every rolling window of a price history against the portfolio.
+
+    Each window starts at today's prices, and every day in it is revalued as
+    in simulate_historical_replay, so the worst point inside a window is
+    found as well as where it ends. The days of all windows are priced
+    together in chunks of chunk_size, sharded across workers (see
+    ScenarioPool).
+
+    Args:
+        portfolio_groups: Portfolio groups to replay
+        prices: Daily closes from load_price_history
+        window_days: Trading days per window
+        step_days: Trading days between window starts
+        market_index: Market index that groups without history follow by beta
+        chunk_size: Number of window days to price at once
+        workers: Number of worker processes. See get_worker_count.
+
+    Returns:
+        Dictionary with replay results containing:
+        - 'start_dates', 'end_dates': First and last date of each window
+        - 'final_pnl': Array of P&L at the end of each window
+        - 'worst_pnl': Array of the lowest P&L inside each window
+        - 'worst_dates': Date of each window's lowest P&L
+    """
+    window_count = max(len(prices) - window_days, 0)
+    starts = np.arange(0, window_count, step_days)
+    if not portfolio_groups or len(starts) == 0:
+        if portfolio_groups:
+            logger.warning(f"Price history is shorter than {window_days} days")
+        return {
+            "start_dates": [],
+            "end_dates": [],
+            "final_pnl": np.array([]),
+            "worst_pnl": np.array([]),
+            "worst_dates": [],
+        }
+
+    portfolio = PortfolioArrays.from_groups(portfolio_groups)
+    base_value = float(
+        portfolio.evaluate(np.ones((1, len(portfolio.tickers))), with_exposures=False)[
+            "group_values"
+        ].sum()
+    )
+
+    # One row per window, one column per day after its start
+    offsets = np.arange(1, window_days + 1)
+    start_indices = np.repeat(starts, window_days)
+    end_indices = start_indices + np.tile(offsets, len(starts))
+    pnl = np.empty(len(start_indices))
+    with ScenarioPool(portfolio, workers) as pool:
+        batch_size = chunk_size * pool.workers
+        for first in range(0, len(start_indices), batch_size):
+            last = min(first + batch_size, len(start_indices))
+            adjustments = _get_price_relatives(
+                portfolio,
+                prices,
+                start_indices[first:last],
+                end_indices[first:last],
+                market_index,
+            )
+            values = pool.evaluate(adjustments, with_exposures=False)
+            pnl[first:last] = values["group_values"].sum(axis=1) - base_value
+    pnl = pnl.reshape(len(starts), window_days)
+
+    worst_offsets = pnl.argmin(axis=1)
+    return {
+        "start_dates": list(prices.index[starts]),
+        "end_dates": list(prices.index[starts + window_days]),
+        "final_pnl": pnl[:, -1],
+        "worst_pnl": pnl[np.arange(len(starts)), worst_offsets],
+        "worst_dates": list(prices.index[starts + 1 + worst_offsets]),
     }
 
 
@@ -0,0 +1,183 @@
+"""Encoding of portfolio data for dcc.Store.
+
+The Dash app keeps the loaded portfolio in dcc.Store components, and nearly
+every callback needs it back as PortfolioGroup and PortfolioSummary objects.
+This module encodes them into versioned payloads and decodes them with a cache,
+so repeated callbacks on the same portfolio skip decoding and rehydration.
+
+Payloads are JSON objects with:
+- schema: "portfolio-groups" or "portfolio-summary"
+- version: STORE_SCHEMA_VERSION when written
+- encoding: how "data" is encoded
+- data: the encoded portfolio, as a string
+
+Groups use the "columnar" encoding: the columns of a PortfolioFrame packed into
+one base64 string, with a JSON header naming each column's dtype and length.
+The summary is small, so it uses the "json" encoding of its to_dict() form.
+
+Decoded objects are cached by payload data and shared between callers, so they
+must be treated as read-only. Decoders also accept the plain to_dict() forms
+stored before payloads were versioned.
+"""
+
+import base64
+import functools
+import json
+import struct
+from dataclasses import fields
+
+import numpy as np
+
+from .data_model import PortfolioGroup, PortfolioGroupDict, PortfolioSummary
+from .portfolio_frame import PortfolioFrame
+
+STORE_SCHEMA_VERSION = 1
+GROUPS_SCHEMA = "portfolio-groups"
+SUMMARY_SCHEMA = "portfolio-summary"
+
+# Decoded payloads kept per schema; a session usually holds one portfolio, so
+# a few entries cover reloads without holding on to stale books
+STORE_CACHE_SIZE = 4
+
+# Column buffers start on 8-byte boundaries so they can be read in place
+_ALIGNMENT = 8
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def _padding(length: int) -> int:
+    """Bytes needed to pad a length to the alignment."""
+    return -length % _ALIGNMENT
+
+
+def _check_payload(payload: dict, schema: str) -> None:
+    """Check that a payload is a supported version of a schema.
+
+    Raises:
+        ValueError: If the payload has another schema, version or encoding
+    """
+    if not isinstance(payload, dict) or payload.get("schema") != schema:
+        raise ValueError(f"Not a {schema} payload")
+    if payload.get("version") != STORE_SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported {schema} payload version: {payload.get('version')}"
+        )
+    expected = "columnar" if schema == GROUPS_SCHEMA else "json"
+    if payload.get("encoding") != expected:
+        raise ValueError(
+            f"Unsupported {schema} payload encoding: {payload.get('encoding')}"
+        )
+
+
+def encode_groups(groups: list[PortfolioGroup]) -> dict:
+    """Encode portfolio groups for a dcc.Store.
+
+    Args:
+        groups: Portfolio groups to encode
+
+    Returns:
+        A JSON-compatible payload
+    """
+    frame = PortfolioFrame.from_groups(groups)
+    columns = []
+    lists = {}
+    buffers = []
+    for field in fields(PortfolioFrame):
+        value = getattr(frame, field.name)
+        if isinstance(value, np.ndarray):
+            columns.append([field.name, value.dtype.str, len(value)])
+            buffer = value.tobytes()
+            buffers.append(buffer + bytes(_padding(len(buffer))))
+        else:
+            lists[field.name] = value
+
+    # Expiries may be dates rather than strings; they are stored as text, as
+    # JSON would store them
+    header = json.dumps({"columns": columns, "lists": lists}, default=str).encode()
+    header += b" " * _padding(_HEADER_LENGTH.size + len(header))
+    data = b"".join([_HEADER_LENGTH.pack(len(header)), header, *buffers])
+
+    return {
+        "schema": GROUPS_SCHEMA,
+        "version": STORE_SCHEMA_VERSION,
+        "encoding": "columnar",
+        "data": base64.b64encode(data).decode("ascii"),
+    }
+
+
+@functools.lru_cache(maxsize=STORE_CACHE_SIZE)
+def _decode_groups_data(data: str) -> tuple[PortfolioGroup, ...]:
+    """Decode the data of a groups payload into portfolio groups."""
+    raw = base64.b64decode(data)
+    (header_length,) = _HEADER_LENGTH.unpack_from(raw)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(raw[offset : offset + header_length])
+    offset += header_length
+
+    values = dict(header["lists"])
+    for name, dtype, length in header["columns"]:
+        column = np.frombuffer(raw, dtype=np.dtype(dtype), count=length, offset=offset)
+        values[name] = column
+        offset += column.nbytes + _padding(column.nbytes)
+
+    return tuple(PortfolioFrame(**values).to_groups())
+
+
+def decode_groups(payload: dict | list[PortfolioGroupDict]) -> list[PortfolioGroup]:
+    """Decode portfolio groups from a dcc.Store.
+
+    Args:
+        payload: A payload from encode_groups, or a list of group dictionaries
+
+    Returns:
+        The portfolio groups. Groups decoded from a payload are cached and
+        shared, so callers must not modify them.
+
+    Raises:
+        ValueError: If the payload is not a supported groups payload
+    """
+    if isinstance(payload, list):
+        return [PortfolioGroup.from_dict(group) for group in payload]
+    _check_payload(payload, GROUPS_SCHEMA)
+    return list(_decode_groups_data(payload["data"]))
+
+
+def encode_summary(summary: PortfolioSummary) -> dict:
+    """Encode a portfolio summary for a dcc.Store.
+
+    Args:
+        summary: Portfolio summary to encode
+
+    Returns:
+        A JSON-compatible payload
+    """
+    return {
+        "schema": SUMMARY_SCHEMA,
+        "version": STORE_SCHEMA_VERSION,
+        "encoding": "json",
+        "data": json.dumps(summary.to_dict()),
+    }
+
+
+@functools.lru_cache(maxsize=STORE_CACHE_SIZE)
+def _decode_summary_data(data: str) -> PortfolioSummary:
+    """Decode the data of a summary payload into a portfolio summary."""
+    return PortfolioSummary.from_dict(json.loads(data))
+
+
+def decode_summary(payload: dict) -> PortfolioSummary:
+    """Decode a portfolio summary from a dcc.Store.
+
+    Args:
+        payload: A payload from encode_summary, or a summary dictionary
+
+    Returns:
+        The portfolio summary. Summaries decoded from a payload are cached and
+        shared, so callers must not modify them.
+
+    Raises:
+        ValueError: If the payload is not a supported summary payload
+    """
+    if isinstance(payload, dict) and "schema" not in payload:
+        return PortfolioSummary.from_dict(payload)
+    _check_payload(payload, SUMMARY_SCHEMA)
+    return _decode_summary_data(payload["data"])
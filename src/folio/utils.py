@@ -4,15 +4,21 @@ TODO: eventually should be split into smaller modular pieces
 
 import os
 
+import numpy as np
 import pandas as pd
 import yaml
 
 from src.stockdata import get_data_fetcher
 
+from .beta_cache import BetaCache
+
 # Import cash detection functions
 from .cash_detection import is_cash_or_short_term
 from .logger import logger
 
+# Market index that betas are measured against
+BETA_MARKET_INDEX = "SPY"
+
 
 # Load configuration from folio.yaml
 def load_config():
@@ -35,6 +41,66 @@ config = load_config()
 data_fetcher = get_data_fetcher(config=config)
 
 
+def create_beta_cache() -> BetaCache | None:
+    """Creates the persistent beta cache next to the data fetcher's price cache.
+
+    Returns:
+        BetaCache | None: The beta cache, or None if it is disabled in folio.yaml
+            or the data fetcher has no cache directory
+    """
+    if not (config or {}).get("app", {}).get("beta", {}).get("cache", False):
+        return None
+
+    cache_dir = getattr(data_fetcher, "cache_dir", None)
+    if not isinstance(cache_dir, str):
+        return None
+
+    return BetaCache(os.path.join(cache_dir, "betas.sqlite"))
+
+
+# Get the persistent beta cache (None if disabled)
+beta_cache = create_beta_cache()
+
+
+def _get_price_stamp(ticker: str, period: str) -> str | None:
+    """Gets a stamp of the price cache files a beta for ticker is calculated from.
+
+    Args:
+        ticker: The instrument's symbol
+        period: The price history period
+
+    Returns:
+        str | None: The files' modification times, or None if the fetcher does not
+            expose its cache files or they do not exist yet
+    """
+    mtimes = []
+    for symbol in (ticker, BETA_MARKET_INDEX):
+        path = data_fetcher.get_cache_path(symbol, period)
+        if not isinstance(path, str) or not os.path.exists(path):
+            return None
+        mtimes.append(f"{os.path.getmtime(path):.6f}")
+    return ":".join(mtimes)
+
+
+def _get_cached_beta(ticker: str, period: str) -> float | None:
+    """Gets a beta from the persistent cache if its price data is unchanged."""
+    if beta_cache is None:
+        return None
+    price_stamp = _get_price_stamp(ticker, period)
+    if price_stamp is None:
+        return None
+    return beta_cache.get(ticker, BETA_MARKET_INDEX, period, price_stamp)
+
+
+def _cache_beta(ticker: str, period: str, beta: float) -> None:
+    """Stores a beta in the persistent cache, stamped with its current price data."""
+    if beta_cache is None:
+        return
+    price_stamp = _get_price_stamp(ticker, period)
+    if price_stamp is not None:
+        beta_cache.put(ticker, BETA_MARKET_INDEX, period, price_stamp, beta)
+
+
 def get_beta(ticker: str, description: str = "") -> float:
     # TODO: move to stockdata.py?
     """Calculates the beta (systematic risk) for a given financial instrument.
@@ -47,6 +113,9 @@ def get_beta(ticker: str, description: str = "") -> float:
         ticker: The instrument's symbol
         description: Description of the security, used to identify cash-like positions
 
+    Betas are kept in the persistent beta cache, if enabled, until the next 2PM
+    Pacific cutoff or until the price data they were calculated from changes.
+
     Returns:
         float: The calculated beta value, or 0.0 if beta cannot be meaningfully calculated
 
@@ -63,9 +132,35 @@ def get_beta(ticker: str, description: str = "") -> float:
     if not data_fetcher:
         raise RuntimeError("DataFetcher not initialized - check API key configuration")
 
+    period = data_fetcher.beta_period
+    beta = _get_cached_beta(ticker, period)
+    if beta is not None:
+        logger.debug(f"Using cached beta of {beta:.2f} for {ticker}")
+        return beta
+
+    beta = _calculate_beta(ticker, period)
+    _cache_beta(ticker, period, beta)
+    return beta
+
+
+def _calculate_beta(ticker: str, period: str) -> float:
+    """Calculates the beta for a non-cash instrument from its price history.
+
+    Args:
+        ticker: The instrument's symbol
+        period: The price history period to calculate over
+
+    Returns:
+        float: The calculated beta value, or 0.0 if beta cannot be meaningfully calculated
+
+    Raises:
+        RuntimeError: If the DataFetcher fails to fetch data
+        ValueError: If the data is invalid or calculations result in invalid values
+        KeyError: If the data format is invalid (missing required columns)
+    """
     # Fetch required data
-    stock_data = data_fetcher.fetch_data(ticker)
-    market_data = data_fetcher.fetch_market_data()
+    stock_data = data_fetcher.fetch_data(ticker, period=period)
+    market_data = data_fetcher.fetch_market_data(BETA_MARKET_INDEX, period=period)
 
     if stock_data is None:
         raise RuntimeError(f"Failed to fetch data for ticker {ticker}")
@@ -128,6 +223,118 @@ def get_beta(ticker: str, description: str = "") -> float:
             raise
 
 
+def get_betas(
+    tickers: list[str], descriptions: dict[str, str] | None = None
+) -> dict[str, float]:
+    """Calculates betas for several instruments in one vectorized pass.
+
+    Applies the same rules as get_beta: cash-like instruments and instruments
+    with fewer than two returns overlapping the market, or a near-zero market
+    variance over that overlap, get a beta of 0.0. Price histories are fetched
+    with one fetch_many call, all return series are aligned with the market
+    once, and every covariance and variance is computed in a single NumPy pass
+    that skips each instrument's own NaN gaps.
+
+    Instruments whose data cannot be fetched or whose beta is not a finite
+    number are omitted, so callers can fall back to get_beta for them and get
+    its specific error. Betas are read from and written to the persistent beta
+    cache like in get_beta.
+
+    Args:
+        tickers: The instruments' symbols
+        descriptions: Descriptions by symbol, used to identify cash-like positions
+
+    Returns:
+        dict[str, float]: Beta by symbol
+
+    Raises:
+        RuntimeError: If the DataFetcher has not been initialized or fails to fetch
+            the market index data
+        KeyError: If the data format is invalid (missing required columns)
+    """
+    descriptions = descriptions or {}
+    betas = {}
+    symbols = []
+    for ticker in dict.fromkeys(tickers):
+        if is_cash_or_short_term(
+            ticker, beta=None, description=descriptions.get(ticker, "")
+        ):
+            logger.debug(f"Using default beta of 0.0 for cash-like position: {ticker}")
+            betas[ticker] = 0.0
+        else:
+            symbols.append(ticker)
+
+    if not symbols:
+        return betas
+
+    if not data_fetcher:
+        raise RuntimeError("DataFetcher not initialized - check API key configuration")
+
+    period = data_fetcher.beta_period
+    for ticker in symbols:
+        beta = _get_cached_beta(ticker, period)
+        if beta is not None:
+            betas[ticker] = beta
+    symbols = [s for s in symbols if s not in betas]
+    if not symbols:
+        return betas
+
+    histories = data_fetcher.fetch_many(symbols, period=period)
+    market_data = data_fetcher.fetch_market_data(BETA_MARKET_INDEX, period=period)
+    if market_data is None:
+        raise RuntimeError("Failed to fetch market index data")
+
+    symbols = [s for s in symbols if histories.get(s) is not None]
+    if not symbols:
+        return betas
+
+    # Returns are taken per instrument before aligning, as in get_beta, so a
+    # date one instrument lacks does not break the others' return series
+    stock_returns = pd.concat(
+        {s: histories[s]["Close"].pct_change(fill_method=None) for s in symbols},
+        axis=1,
+    )
+    market_returns = market_data["Close"].pct_change(fill_method=None)
+    stock_returns, market_returns = stock_returns.align(
+        market_returns, join="inner", axis=0
+    )
+
+    returns = stock_returns.to_numpy(dtype=float)
+    market = market_returns.to_numpy(dtype=float)[:, np.newaxis]
+    valid = ~np.isnan(returns) & ~np.isnan(market)
+
+    # Sample statistics over each instrument's valid overlap with the market
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = valid.sum(axis=0)
+        returns_mean = np.where(valid, returns, 0.0).sum(axis=0) / count
+        market_mean = np.where(valid, market, 0.0).sum(axis=0) / count
+        market_dev = np.where(valid, market - market_mean, 0.0)
+        returns_dev = np.where(valid, returns - returns_mean, 0.0)
+        market_variance = (market_dev**2).sum(axis=0) / (count - 1)
+        covariance = (returns_dev * market_dev).sum(axis=0) / (count - 1)
+        beta_values = covariance / market_variance
+
+    for i, ticker in enumerate(symbols):
+        if count[i] < 2:
+            logger.debug(
+                f"Insufficient overlapping data points for {ticker}, cannot calculate meaningful beta"
+            )
+            betas[ticker] = 0.0
+        elif np.isfinite(market_variance[i]) and abs(market_variance[i]) < 1e-12:
+            logger.debug(
+                f"Market variance is near-zero for {ticker}, cannot calculate meaningful beta"
+            )
+            betas[ticker] = 0.0
+        elif np.isfinite(beta_values[i]):
+            betas[ticker] = float(beta_values[i])
+        else:
+            logger.warning(f"Beta calculation for {ticker} is not finite")
+            continue
+        _cache_beta(ticker, period, betas[ticker])
+
+    return betas
+
+
 def clean_currency_value(value_str: str) -> float:
     """Converts a formatted currency string into a float.
     TODO: this belongs in formatting.py
@@ -0,0 +1,666 @@
+"""
+Price history cache backends.
+
+This module provides:
+1. A common interface for cache storage backends (PriceCache)
+2. A CSV backend storing one file per cache entry (CSVPriceCache)
+3. A Parquet backend storing typed, columnar files in one store per ticker
+   (ParquetPriceCache)
+4. A factory function to create the configured backend (create_price_cache)
+5. A loader for cache settings from config/app.yaml (load_cache_config)
+6. A canonical per-ticker history store built on any backend (HistoryStore)
+7. An in-process LRU memory tier in front of the disk cache (MemoryCache)
+
+Data fetchers decide *whether* a cache entry is valid (see should_use_cache in
+src/stockdata.py); backends only decide *how* entries are stored on disk.
+Backends write through a temporary file and rename it into place, so readers
+never see a partially written entry.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.stockdata import get_cache_expiry, period_to_start, should_use_cache
+
+logger = logging.getLogger(__name__)
+
+# Errors raised when a cache entry exists but cannot be read.
+# pandas parser errors and pyarrow's ArrowInvalid are ValueError subclasses.
+CACHE_READ_ERRORS = (ValueError, OSError)
+
+
+def _atomic_write(path, write):
+    """
+    Write a file by writing a temporary file and renaming it into place.
+
+    Args:
+        path (str): Destination path
+        write (callable): write(tmp_path) that writes the full file contents
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PriceCache(ABC):
+    """Interface for price history cache backends"""
+
+    # Name used to select this backend in config
+    name = ""
+
+    def __init__(self, cache_dir):
+        """
+        Initialize the cache backend.
+
+        Args:
+            cache_dir (str): Directory to store cached data
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @abstractmethod
+    def get_path(self, ticker, key):
+        """
+        Get the path of the file backing a cache entry.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker, e.g. '1y_1d'
+
+        Returns:
+            str: Path to the cache file
+        """
+        pass
+
+    @abstractmethod
+    def read(self, ticker, key):
+        """
+        Read a cache entry.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+
+        Returns:
+            pandas.DataFrame: Cached data with a DatetimeIndex named 'date'
+
+        Raises:
+            ValueError, OSError: If the entry is missing or cannot be parsed
+        """
+        pass
+
+    @abstractmethod
+    def write(self, ticker, key, df):
+        """
+        Write a cache entry, replacing any existing one.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+            df (pandas.DataFrame): Data to cache
+        """
+        pass
+
+    def exists(self, ticker, key):
+        """
+        Check whether a cache entry exists.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+
+        Returns:
+            bool: True if the entry exists on disk
+        """
+        return os.path.exists(self.get_path(ticker, key))
+
+    def get_meta_path(self, ticker, key):
+        """
+        Get the path of the JSON metadata file stored next to a cache entry.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+
+        Returns:
+            str: Path to the metadata file
+        """
+        return os.path.splitext(self.get_path(ticker, key))[0] + ".json"
+
+    def read_meta(self, ticker, key):
+        """
+        Read the metadata of a cache entry.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+
+        Returns:
+            dict: Entry metadata, empty if none was written or it is unreadable
+        """
+        try:
+            with open(self.get_meta_path(ticker, key)) as f:
+                return json.load(f)
+        except CACHE_READ_ERRORS:
+            return {}
+
+    def write_meta(self, ticker, key, meta):
+        """
+        Write the metadata of a cache entry, replacing any existing metadata.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            key (str): Entry key within the ticker
+            meta (dict): JSON-serializable metadata
+        """
+
+        def write(path):
+            with open(path, "w") as f:
+                json.dump(meta, f)
+
+        _atomic_write(self.get_meta_path(ticker, key), write)
+
+
+class CSVPriceCache(PriceCache):
+    """Cache backend storing each entry as a CSV file"""
+
+    name = "csv"
+
+    def get_path(self, ticker, key):
+        return os.path.join(self.cache_dir, f"{ticker}_{key}.csv")
+
+    def read(self, ticker, key):
+        return pd.read_csv(self.get_path(ticker, key), index_col=0, parse_dates=True)
+
+    def write(self, ticker, key, df):
+        _atomic_write(self.get_path(ticker, key), df.to_csv)
+
+
+class ParquetPriceCache(PriceCache):
+    """
+    Cache backend storing entries as Parquet files, one directory per ticker.
+
+    Parquet keeps column dtypes and the datetime index in the file schema, so
+    reads skip CSV tokenizing and date inference entirely.
+    """
+
+    name = "parquet"
+
+    def get_path(self, ticker, key):
+        return os.path.join(self.cache_dir, ticker, f"{key}.parquet")
+
+    def read(self, ticker, key):
+        return pd.read_parquet(self.get_path(ticker, key))
+
+    def write(self, ticker, key, df):
+        _atomic_write(self.get_path(ticker, key), df.to_parquet)
+
+
+def _parquet_available():
+    """Check whether a Parquet engine is installed."""
+    try:
+        import pyarrow  # noqa: F401, PLC0415
+    except ImportError:
+        return False
+    return True
+
+
+def load_cache_config():
+    """
+    Load cache settings from the 'cache' section of config/app.yaml.
+
+    Returns:
+        dict: Cache settings, empty if the config is unavailable
+    """
+    try:
+        from src.v2.config import config  # noqa: PLC0415
+    except ImportError:
+        return {}
+
+    cache_config = config.get("app.cache", {})
+    return cache_config if isinstance(cache_config, dict) else {}
+
+
+def create_price_cache(backend=None, cache_dir=".cache"):
+    """
+    Factory function to create a price cache backend.
+
+    Falls back to the CSV backend (with a warning) when the requested backend
+    is unknown or its dependencies are not installed, so a config change can
+    never prevent the data fetcher from starting.
+
+    Args:
+        backend (str, optional): Backend to use ('csv' or 'parquet').
+            If None, uses 'csv'.
+        cache_dir (str): Directory to store cached data
+
+    Returns:
+        PriceCache: An instance of the requested cache backend
+    """
+    if backend is None or backend == CSVPriceCache.name:
+        return CSVPriceCache(cache_dir)
+
+    if backend == ParquetPriceCache.name:
+        if _parquet_available():
+            return ParquetPriceCache(cache_dir)
+        logger.warning("pyarrow is not installed, falling back to the CSV cache")
+        return CSVPriceCache(cache_dir)
+
+    logger.warning(f"Unknown cache backend: {backend}, falling back to the CSV cache")
+    return CSVPriceCache(cache_dir)
+
+
+class HistoryStore:
+    """
+    Canonical per-ticker price history on top of a cache backend.
+
+    Each ticker and interval has a single cache entry holding the longest
+    date range fetched so far. Shorter periods are served as slices of it,
+    and a request for a longer period only fetches the older dates that are
+    missing. The first date the entry covers is kept in the entry metadata,
+    since the first row alone cannot tell a short fetch from a young ticker.
+
+    In incremental mode, a stale history is refreshed by fetching only the
+    bars since its last date instead of the whole period.
+    """
+
+    # Extra days fetched before a period start so weekends and holidays at the
+    # start of a short period (e.g. '1d' on a Sunday) still return a bar
+    start_padding = pd.Timedelta(days=7)
+
+    def __init__(self, cache, cache_ttl, incremental=False):
+        """
+        Initialize the history store.
+
+        Args:
+            cache (PriceCache): Backend used to store histories
+            cache_ttl (int): Cache TTL in seconds, see should_use_cache
+            incremental (bool): Refresh stale histories by appending new bars
+        """
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.incremental = incremental
+
+    @staticmethod
+    def get_key(interval):
+        """Get the cache entry key holding a ticker's history for an interval."""
+        return f"history_{interval}"
+
+    def get_path(self, ticker, interval):
+        """Get the path of the file backing a ticker's history."""
+        return self.cache.get_path(ticker, self.get_key(interval))
+
+    def get_fetch_start(self, period):
+        """
+        Get the first date to fetch for a period, including the start padding.
+
+        Args:
+            period (str): Time period ('1d', '3m', '1y', 'max', etc.)
+
+        Returns:
+            pandas.Timestamp or None: Start date, or None for the full history
+        """
+        start = period_to_start(period)
+        return None if start is None else start - self.start_padding
+
+    def load(self, ticker, interval):
+        """
+        Load a ticker's stored history.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            tuple: (history, covered_start, is_fresh)
+                - history (pandas.DataFrame or None): Stored history, None if missing
+                - covered_start (pandas.Timestamp or None): First date covered,
+                  None if the full history is stored
+                - is_fresh (bool): True if should_use_cache accepts the entry
+        """
+        key = self.get_key(interval)
+        if not self.cache.exists(ticker, key):
+            return None, None, False
+
+        try:
+            history = self.cache.read(ticker, key)
+        except CACHE_READ_ERRORS as e:
+            logger.warning(f"Error reading history for {ticker}: {e}")
+            return None, None, False
+        if history.empty:
+            return None, None, False
+
+        covered = self.cache.read_meta(ticker, key).get("covered_start")
+        if covered is None:
+            # Entries without metadata only cover what they hold
+            covered_start = history.index[0]
+        else:
+            covered_start = None if covered == "max" else pd.Timestamp(covered)
+
+        is_fresh, reason = should_use_cache(
+            self.cache.get_path(ticker, key), self.cache_ttl
+        )
+        logger.debug(f"History for {ticker}: {reason}")
+        return history, covered_start, is_fresh
+
+    @staticmethod
+    def covers(covered_start, start):
+        """
+        Check whether a stored range reaches back to a start date.
+
+        Args:
+            covered_start (pandas.Timestamp or None): First date stored,
+                None if the full history is stored
+            start (pandas.Timestamp or None): First date needed, None for the
+                full history
+
+        Returns:
+            bool: True if no older data needs to be fetched
+        """
+        if covered_start is None:
+            return True
+        return start is not None and covered_start <= start
+
+    def save(self, ticker, interval, df, start, *, history=None, covered_start=None):
+        """
+        Merge fetched data into a ticker's history and write it back.
+
+        Rows in df replace stored rows with the same date.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            interval (str): Data interval ('1d', '1wk', etc.)
+            df (pandas.DataFrame): Newly fetched data
+            start (pandas.Timestamp or None): First date the fetch covered,
+                None for the full history
+            history (pandas.DataFrame, optional): Stored history to merge into
+            covered_start (pandas.Timestamp, optional): First date history covers
+
+        Returns:
+            pandas.DataFrame: The merged history
+        """
+        if history is not None:
+            merged = pd.concat([history, df])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            if start is None or covered_start is None:
+                start = None
+            else:
+                start = min(start, covered_start)
+        else:
+            merged = df.sort_index()
+
+        key = self.get_key(interval)
+        self.cache.write(ticker, key, merged)
+        self.cache.write_meta(
+            ticker,
+            key,
+            {"covered_start": "max" if start is None else start.isoformat()},
+        )
+        return merged
+
+    def can_append(self, history, covered_start, start):
+        """
+        Check whether a stale history can be refreshed by appending new bars.
+
+        Args:
+            history (pandas.DataFrame or None): Stored history
+            covered_start (pandas.Timestamp or None): First date history covers
+            start (pandas.Timestamp or None): First date needed
+
+        Returns:
+            bool: True in incremental mode if history already covers start
+        """
+        return (
+            self.incremental
+            and history is not None
+            and self.covers(covered_start, start)
+        )
+
+    @staticmethod
+    def fetch_tail(ticker, history, fetch_range):
+        """
+        Fetch the bars since a history's last date.
+
+        The last stored bar is fetched again, since it may have been saved
+        before the close.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            history (pandas.DataFrame): Stored history
+            fetch_range (callable): See fetch
+
+        Returns:
+            pandas.DataFrame: Bars on or after the last stored date
+        """
+        last_date = history.index[-1]
+        logger.info(f"Fetching {ticker} data since {last_date.date()}")
+        try:
+            return fetch_range(last_date, None)
+        except ValueError as e:
+            if "No historical data found" not in str(e):
+                raise
+            # No new bars yet, e.g. on a weekend
+            return history.iloc[:0]
+
+    @staticmethod
+    def has_new_actions(history, df):
+        """
+        Check whether bars after a history's last date include a dividend or split.
+
+        Adjusted prices before such an event change, so the stored rows must
+        be refetched rather than extended.
+
+        Args:
+            history (pandas.DataFrame): Stored history
+            df (pandas.DataFrame): Newly fetched bars
+
+        Returns:
+            bool: True if a new bar has a dividend or stock split
+        """
+        new_rows = df[df.index > history.index[-1]]
+        columns = [c for c in ("Dividends", "Stock Splits") if c in new_rows.columns]
+        return bool((new_rows[columns].fillna(0) != 0).to_numpy().any())
+
+    @staticmethod
+    def slice(history, period):
+        """
+        Get the part of a history covering a period.
+
+        The most recent row is always included, so short periods still return
+        the last close over weekends and holidays.
+
+        Args:
+            history (pandas.DataFrame): Stored history
+            period (str): Time period ('1d', '3m', '1y', 'max', etc.)
+
+        Returns:
+            pandas.DataFrame: Rows on or after the period start
+        """
+        start = period_to_start(period)
+        if start is None:
+            return history
+        sliced = history[history.index >= start]
+        if sliced.empty:
+            return history.iloc[-1:]
+        return sliced
+
+    def fetch(self, ticker, period, interval, fetch_range):
+        """
+        Get a ticker's history for a period, fetching only what is missing.
+
+        - A fresh history that covers the period is sliced without a request
+        - A fresh history that is too short fetches only the older dates
+        - In incremental mode, a stale history that covers the period fetches
+          only the bars since its last date, or its whole range again if a new
+          bar has a dividend or split
+        - Otherwise the whole period is fetched and merged into the history
+        - If a fetch fails, a stored history is used as a fallback
+
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Time period ('1d', '3m', '1y', 'max', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+            fetch_range (callable): fetch_range(start, end) returning a
+                DataFrame of rows from start (None for the full history) up to
+                but excluding end (None for the latest data). Raises ValueError
+                if no data is available, or OSError for network failures.
+
+        Returns:
+            pandas.DataFrame: DataFrame with stock data
+
+        Raises:
+            ValueError, OSError: If the fetch fails and no history is stored
+        """
+        start = self.get_fetch_start(period)
+        history, covered_start, is_fresh = self.load(ticker, interval)
+
+        if is_fresh and self.covers(covered_start, start):
+            logger.info(f"Loading {ticker} data from stored history")
+            return self.slice(history, period)
+
+        try:
+            if is_fresh:
+                logger.info(
+                    f"Fetching older data for {ticker} before {history.index[0]}"
+                )
+                try:
+                    df = fetch_range(start, history.index[0])
+                except ValueError as e:
+                    if "No historical data found" not in str(e):
+                        raise
+                    # Nothing older exists, so the stored history already covers start
+                    df = history.iloc[:0]
+            elif self.can_append(history, covered_start, start):
+                df = self.fetch_tail(ticker, history, fetch_range)
+                if self.has_new_actions(history, df):
+                    logger.info(f"New dividend or split for {ticker}, refetching")
+                    df = fetch_range(covered_start, None)
+            else:
+                logger.info(f"Fetching {period} of data for {ticker}")
+                df = fetch_range(start, None)
+        except (ValueError, OSError) as e:
+            if history is None:
+                raise
+            logger.warning(f"Data fetch error for {ticker}: {e}")
+            logger.warning(f"Using stored history for {ticker} as fallback")
+            return self.slice(history, period)
+
+        history = self.save(
+            ticker, interval, df, start, history=history, covered_start=covered_start
+        )
+        return self.slice(history, period)
+
+
+class MemoryCache:
+    """
+    Size-bounded LRU cache of DataFrames in front of the disk cache.
+
+    Each entry expires when its disk entry would stop passing should_use_cache,
+    so the memory tier never serves data the disk tier would refetch, but a
+    hit skips the file checks and parsing entirely. Entries are copied in and
+    out, so callers may modify the DataFrames they get.
+
+    The cache is thread-safe, since prices may be refreshed on a thread pool.
+    """
+
+    def __init__(self, max_entries=128):
+        """
+        Initialize the memory cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept. 0 disables the cache.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get an entry if it is present and not expired.
+
+        Args:
+            key (tuple): Entry key, e.g. (ticker, period, interval)
+
+        Returns:
+            pandas.DataFrame or None: A copy of the cached data, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0].copy()
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, df, cache_path, cache_ttl):
+        """
+        Add an entry that expires with the disk entry backing it.
+
+        Nothing is stored if the disk entry is missing or already expired, e.g.
+        when a fetcher fell back to an expired cache.
+
+        Args:
+            key (tuple): Entry key, e.g. (ticker, period, interval)
+            df (pandas.DataFrame): Data to cache
+            cache_path (str): Path of the disk entry the data was loaded from
+            cache_ttl (int): Cache TTL in seconds, see should_use_cache
+        """
+        if self.max_entries <= 0 or df is None:
+            return
+
+        expires_at = get_cache_expiry(cache_path, cache_ttl)
+        if expires_at is None or expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[key] = (df.copy(), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'entries' and 'max_entries'
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
@@ -15,8 +15,9 @@ import logging
 import os
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import pandas as pd
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -58,14 +59,64 @@ class DataFetcherInterface(ABC):
         """
         pass
 
+    def fetch_many(self, tickers, period="3m", interval="1d"):
+        """
+        Fetch stock data for several tickers at once.
+
+        The default implementation calls fetch_data for each ticker in turn.
+        Fetchers backed by an API with bulk endpoints should override this to
+        fill all cache misses with a single request.
+
+        Tickers that cannot be fetched are logged and omitted from the result,
+        so callers should treat a missing key the same as an empty DataFrame.
+
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period ('3m', '6m', '1y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
 
-def create_data_fetcher(source="yfinance", cache_dir=None):
+        Returns:
+            dict[str, pandas.DataFrame]: Mapping of ticker to its DataFrame
+        """
+        results = {}
+        for ticker in dict.fromkeys(tickers):
+            try:
+                results[ticker] = self.fetch_data(ticker, period, interval)
+            except (ImportError, NameError, AttributeError, TypeError, SyntaxError):
+                # Programming errors should never be swallowed
+                raise
+            except Exception as e:
+                logger.warning(f"Could not fetch data for {ticker}: {e}")
+        return results
+
+    def get_cache_path(self, ticker, period="3m", interval="1d"):  # noqa: ARG002 - signature for subclasses
+        """
+        Get the path of the cache file that data for a ticker is loaded from.
+
+        Callers use the file's modification time to tell when cached data has
+        changed. The default implementation returns None for fetchers without
+        a file cache.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Time period ('3m', '6m', '1y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            str or None: Path to the cache file, which may not exist yet
+        """
+        return None
+
+
+def create_data_fetcher(source="yfinance", cache_dir=None, cache_config=None):
     """
     Factory function to create the appropriate data fetcher.
 
     Args:
         source (str): Data source to use ('yfinance' or 'fmp')
         cache_dir (str, optional): Cache directory. If None, uses default.
+        cache_config (dict, optional): Cache settings such as 'backend' and
+            'canonical_history'. If None, the fetcher uses config/app.yaml.
 
     Returns:
         DataFetcherInterface: An instance of the appropriate data fetcher
@@ -91,12 +142,12 @@ def create_data_fetcher(source="yfinance", cache_dir=None):
         from src.yfinance import YFinanceDataFetcher
 
         logger.info(f"Creating YFinance data fetcher with cache dir: {cache_dir}")
-        return YFinanceDataFetcher(cache_dir=cache_dir)
+        return YFinanceDataFetcher(cache_dir=cache_dir, cache_config=cache_config)
     elif source == "fmp":
         from src.fmp import DataFetcher
 
         logger.info(f"Creating FMP data fetcher with cache dir: {cache_dir}")
-        return DataFetcher(cache_dir=cache_dir)
+        return DataFetcher(cache_dir=cache_dir, cache_config=cache_config)
     else:
         raise ValueError(f"Unknown data source: {source}")
 
@@ -138,9 +189,16 @@ class DataFetcherSingleton:
             else:
                 source = "yfinance"
 
+        # Determine the cache settings
+        cache_config = None
+        if config is not None:
+            cache_config = config.get("app", {}).get("cache")
+
         try:
             logger.info(f"Using data source: {source}")
-            cls._instance = create_data_fetcher(source=source, cache_dir=cache_dir)
+            cls._instance = create_data_fetcher(
+                source=source, cache_dir=cache_dir, cache_config=cache_config
+            )
 
             if cls._instance is None:
                 raise RuntimeError(
@@ -250,3 +308,93 @@ def should_use_cache(cache_path, cache_ttl):
 
     # Cache is valid
     return True, f"Cache is valid (age: {cache_age:.0f}s)"
+
+
+def get_cache_date(now=None):
+    """
+    Get the date of the most recent 2PM Pacific cutoff.
+
+    Caches written after a cutoff stay valid until the next one (see
+    is_cache_expired), so results derived from cached data can be keyed by
+    this date and expire together with it.
+
+    Args:
+        now (datetime, optional): Current time, timezone-aware. If None, uses now.
+
+    Returns:
+        datetime.date: Today from 2PM Pacific onwards, otherwise yesterday
+    """
+    pacific_tz = pytz.timezone("US/Pacific")
+    now = datetime.now(pacific_tz) if now is None else now.astimezone(pacific_tz)
+    if now.hour >= 14:
+        return now.date()
+    return now.date() - timedelta(days=1)
+
+
+def get_cache_expiry(cache_path, cache_ttl):
+    """
+    Get the time at which should_use_cache will stop accepting a cache file.
+
+    This is the earlier of the TTL expiry and the first 2PM Pacific cutoff
+    after the file was written, using the same local time handling as
+    is_cache_expired.
+
+    Args:
+        cache_path (str): Path to the cache file
+        cache_ttl (int): Cache time-to-live in seconds
+
+    Returns:
+        float or None: Expiry as a Unix timestamp, None if the file does not exist
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    cache_mtime = os.path.getmtime(cache_path)
+    cache_time = datetime.fromtimestamp(cache_mtime)
+
+    # The first 2PM on or after the cache time, in Pacific time
+    cutoff = cache_time.replace(hour=14, minute=0, second=0, microsecond=0)
+    if cache_time.hour >= 14:
+        cutoff += timedelta(days=1)
+    cutoff_timestamp = pytz.timezone("US/Pacific").localize(cutoff).timestamp()
+
+    return min(cache_mtime + cache_ttl, cutoff_timestamp)
+
+
+def period_to_start(period, now=None):
+    """
+    Convert a period string to the first date it covers.
+
+    Args:
+        period (str): Time period ('5d', '3m', '3mo', '1y', 'ytd' or 'max')
+        now (pandas.Timestamp, optional): Reference time. If None, uses today.
+
+    Returns:
+        pandas.Timestamp or None: Start date (midnight), or None for 'max'
+
+    Raises:
+        ValueError: If the period format is not recognized
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    today = now.normalize()
+
+    if period == "max":
+        return None
+    if period == "ytd":
+        return today.replace(month=1, day=1)
+
+    # Check 'mo' before 'm'/'d' so '3mo' is read as months
+    for suffix, unit in (
+        ("mo", "months"),
+        ("m", "months"),
+        ("y", "years"),
+        ("d", "days"),
+    ):
+        if period.endswith(suffix):
+            try:
+                count = int(period[: -len(suffix)])
+            except ValueError:
+                break
+            return today - pd.DateOffset(**{unit: count})
+
+    raise ValueError(f"Unrecognized period format: {period}")
@@ -11,7 +11,14 @@ import os
 import pandas as pd
 
 import yfinance as yf
-from src.stockdata import DataFetcherInterface
+from src.price_cache import (
+    CACHE_READ_ERRORS,
+    HistoryStore,
+    MemoryCache,
+    create_price_cache,
+    load_cache_config,
+)
+from src.stockdata import DataFetcherInterface, should_use_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,13 +29,17 @@ class YFinanceDataFetcher(DataFetcherInterface):
     # Default period for beta calculations (3 months provides more current market behavior)
     beta_period = "3m"
 
-    def __init__(self, cache_dir=".cache_yf", cache_ttl=None):
+    def __init__(self, cache_dir=".cache_yf", cache_ttl=None, cache_config=None):
         """
         Initialize the YFinanceDataFetcher.
 
         Args:
             cache_dir (str): Directory to store cached data
             cache_ttl (int, optional): Cache TTL in seconds. If None, uses config or default.
+            cache_config (dict, optional): Cache settings: 'backend' ('csv' or
+                'parquet'), 'canonical_history' (bool), 'incremental_refresh'
+                (bool) and 'memory_cache_size' (int, 0 disables the memory
+                tier). If None, uses the 'cache' section of config/app.yaml.
         """
         self.cache_dir = cache_dir
 
@@ -46,6 +57,23 @@ class YFinanceDataFetcher(DataFetcherInterface):
         else:
             self.cache_ttl = cache_ttl
 
+        # Get cache settings from config if not specified
+        if cache_config is None:
+            cache_config = load_cache_config()
+        self.cache = create_price_cache(cache_config.get("backend"), cache_dir)
+
+        # Keep one history per ticker and slice periods from it, if enabled
+        self.history_store = None
+        if cache_config.get("canonical_history"):
+            self.history_store = HistoryStore(
+                self.cache,
+                self.cache_ttl,
+                incremental=bool(cache_config.get("incremental_refresh")),
+            )
+
+        # Keep recently used DataFrames in memory in front of the disk cache
+        self.memory_cache = MemoryCache(cache_config.get("memory_cache_size", 0))
+
     def fetch_data(self, ticker, period="3m", interval="1d"):
         """
         Fetch stock data for a ticker from Yahoo Finance.
@@ -58,18 +86,53 @@ class YFinanceDataFetcher(DataFetcherInterface):
         Returns:
             pandas.DataFrame: DataFrame with stock data
         """
+        memory_key = (ticker, period, interval)
+        df = self.memory_cache.get(memory_key)
+        if df is not None:
+            return df
+
+        df = self._fetch_data_with_disk_cache(ticker, period, interval)
+        self.memory_cache.put(
+            memory_key,
+            df,
+            self.get_cache_path(ticker, period, interval),
+            self.cache_ttl,
+        )
+        return df
+
+    def _fetch_data_with_disk_cache(self, ticker, period, interval):
+        """
+        Fetch stock data for a ticker from the disk cache or Yahoo Finance.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Time period ('1y', '5y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            pandas.DataFrame: DataFrame with stock data
+        """
+        if self.history_store is not None:
+            return self.history_store.fetch(
+                ticker,
+                period,
+                interval,
+                # The store passes start=None to request the full history
+                lambda start, end: self._fetch_from_yfinance(
+                    ticker, "max", interval, start=start, end=end
+                ),
+            )
+
         # Check cache first
         cache_path = self._get_cache_path(ticker, period, interval)
 
         # Use the centralized cache validation logic
-        from src.stockdata import should_use_cache
-
         should_use, reason = should_use_cache(cache_path, self.cache_ttl)
 
         if should_use:
             logger.info(f"Loading {ticker} data from cache: {reason}")
             try:
-                return pd.read_csv(cache_path, index_col=0, parse_dates=True)
+                return self.cache.read(ticker, self._get_cache_key(period, interval))
             except Exception as e:
                 logger.warning(f"Error reading cache for {ticker}: {e}")
                 # Continue to fetch from API
@@ -82,7 +145,7 @@ class YFinanceDataFetcher(DataFetcherInterface):
             df = self._fetch_from_yfinance(ticker, period, interval)
 
             # Save to cache
-            df.to_csv(cache_path)
+            self.cache.write(ticker, self._get_cache_key(period, interval), df)
 
             return df
         except (ValueError, pd.errors.EmptyDataError) as e:
@@ -94,8 +157,10 @@ class YFinanceDataFetcher(DataFetcherInterface):
             if os.path.exists(cache_path):
                 logger.warning(f"Using expired cache for {ticker} as fallback")
                 try:
-                    return pd.read_csv(cache_path, index_col=0, parse_dates=True)
-                except (pd.errors.ParserError, pd.errors.EmptyDataError) as cache_e:
+                    return self.cache.read(
+                        ticker, self._get_cache_key(period, interval)
+                    )
+                except CACHE_READ_ERRORS as cache_e:
                     logger.error(f"Error reading cache for {ticker}: {cache_e}")
                     # Re-raise the original error since cache fallback failed
                     raise e from cache_e
@@ -113,6 +178,190 @@ class YFinanceDataFetcher(DataFetcherInterface):
             )
             raise
 
+    def fetch_many(self, tickers, period="3m", interval="1d"):
+        """
+        Fetch stock data for several tickers, filling cache misses in one request.
+
+        Entries in the memory cache and valid disk cache entries are used
+        as-is. All remaining tickers are fetched with a single yfinance bulk
+        download and written back to the cache. Tickers missing from the bulk
+        response fall back to an expired cache entry when one exists, and are
+        otherwise omitted from the result.
+
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period ('1y', '5y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            dict[str, pandas.DataFrame]: Mapping of ticker to its DataFrame
+        """
+        results = {}
+        pending = []
+        for ticker in dict.fromkeys(tickers):
+            df = self.memory_cache.get((ticker, period, interval))
+            if df is not None:
+                results[ticker] = df
+            else:
+                pending.append(ticker)
+
+        if not pending:
+            return results
+
+        if self.history_store is not None:
+            fetched = self._fetch_many_from_history(pending, period, interval)
+        else:
+            fetched = self._fetch_many_with_disk_cache(pending, period, interval)
+
+        for ticker, df in fetched.items():
+            self.memory_cache.put(
+                (ticker, period, interval),
+                df,
+                self.get_cache_path(ticker, period, interval),
+                self.cache_ttl,
+            )
+        results.update(fetched)
+        return results
+
+    def _fetch_many_with_disk_cache(self, tickers, period, interval):
+        """
+        Fetch several tickers from per-period disk cache entries or one bulk download.
+
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period ('1y', '5y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            dict[str, pandas.DataFrame]: Mapping of ticker to its DataFrame
+        """
+        cache_key = self._get_cache_key(period, interval)
+        results = {}
+        misses = []
+        for ticker in dict.fromkeys(tickers):
+            cache_path = self._get_cache_path(ticker, period, interval)
+            should_use, reason = should_use_cache(cache_path, self.cache_ttl)
+            if should_use:
+                logger.debug(f"Loading {ticker} data from cache: {reason}")
+                try:
+                    results[ticker] = self.cache.read(ticker, cache_key)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Error reading cache for {ticker}: {e}")
+            misses.append(ticker)
+
+        if not misses:
+            return results
+
+        try:
+            logger.info(f"Bulk fetching {len(misses)} tickers from Yahoo Finance")
+            frames = self._download_from_yfinance(misses, period, interval)
+        except ValueError as e:
+            logger.warning(f"Bulk data fetch error: {e}")
+            frames = {}
+
+        for ticker in misses:
+            if ticker in frames:
+                self.cache.write(ticker, cache_key, frames[ticker])
+                results[ticker] = frames[ticker]
+            elif self.cache.exists(ticker, cache_key):
+                logger.warning(f"Using expired cache for {ticker} as fallback")
+                try:
+                    results[ticker] = self.cache.read(ticker, cache_key)
+                except CACHE_READ_ERRORS as cache_e:
+                    logger.error(f"Error reading cache for {ticker}: {cache_e}")
+            else:
+                logger.warning(f"No historical data found for {ticker}")
+
+        return results
+
+    def _fetch_many_from_history(self, tickers, period, interval):
+        """
+        Fetch several tickers through the history store.
+
+        Stored histories that are fresh and long enough are sliced. In
+        incremental mode, stale histories that cover the period share one
+        bulk download of the bars since the earliest of their last dates. All
+        other tickers share one bulk download of the whole period. Fetched
+        bars are merged into the stored histories.
+
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period ('1y', '5y', etc.)
+            interval (str): Data interval ('1d', '1wk', etc.)
+
+        Returns:
+            dict[str, pandas.DataFrame]: Mapping of ticker to its DataFrame
+        """
+        store = self.history_store
+        start = store.get_fetch_start(period)
+        results = {}
+        stored = {}
+        appends = set()
+        for ticker in dict.fromkeys(tickers):
+            history, covered_start, is_fresh = store.load(ticker, interval)
+            if is_fresh and store.covers(covered_start, start):
+                results[ticker] = store.slice(history, period)
+                continue
+            stored[ticker] = (history, covered_start)
+            if not is_fresh and store.can_append(history, covered_start, start):
+                appends.add(ticker)
+
+        if not stored:
+            return results
+
+        frames = {}
+        if appends:
+            tail_start = min(stored[ticker][0].index[-1] for ticker in appends)
+            frames.update(
+                self._bulk_download(sorted(appends), period, interval, tail_start)
+            )
+        misses = [ticker for ticker in stored if ticker not in appends]
+        if misses:
+            frames.update(self._bulk_download(misses, period, interval, start))
+
+        for ticker, (history, covered_start) in stored.items():
+            df = frames.get(ticker)
+            if df is not None and ticker in appends:
+                df = df[df.index >= history.index[-1]]
+                if store.has_new_actions(history, df):
+                    logger.info(f"New dividend or split for {ticker}, refetching")
+                    try:
+                        df = self._fetch_from_yfinance(
+                            ticker, "max", interval, start=covered_start
+                        )
+                    except ValueError as e:
+                        logger.warning(f"Data fetch error for {ticker}: {e}")
+                        df = None
+
+            if df is not None:
+                merged = store.save(
+                    ticker,
+                    interval,
+                    df,
+                    start,
+                    history=history,
+                    covered_start=covered_start,
+                )
+            elif history is not None:
+                logger.warning(f"Using stored history for {ticker} as fallback")
+                merged = history
+            else:
+                logger.warning(f"No historical data found for {ticker}")
+                continue
+            results[ticker] = store.slice(merged, period)
+
+        return results
+
+    def _bulk_download(self, tickers, period, interval, start):
+        """Bulk download tickers from start, returning no frames if it fails."""
+        try:
+            logger.info(f"Bulk fetching {len(tickers)} tickers from Yahoo Finance")
+            return self._download_from_yfinance(tickers, period, interval, start=start)
+        except ValueError as e:
+            logger.warning(f"Bulk data fetch error: {e}")
+            return {}
+
     def fetch_market_data(self, market_index="SPY", period=None, interval="1d"):
         """
         Fetch market index data for beta calculations.
@@ -133,14 +382,18 @@ class YFinanceDataFetcher(DataFetcherInterface):
         # Call fetch_data with the market index ticker
         return self.fetch_data(market_index, period, interval)
 
-    def _fetch_from_yfinance(self, ticker, period="1y", interval="1d"):
+    def _fetch_from_yfinance(
+        self, ticker, period="1y", interval="1d", start=None, end=None
+    ):
         """
         Fetch data from Yahoo Finance using yfinance.
 
         Args:
             ticker (str): Stock ticker symbol
-            period (str): Time period ('1y', '5y', etc.)
+            period (str): Time period ('1y', '5y', etc.), used if start is None
             interval (str): Data interval ('1d', '1wk', etc.)
+            start (pandas.Timestamp, optional): First date to fetch
+            end (pandas.Timestamp, optional): Date to stop before
 
         Returns:
             pandas.DataFrame: DataFrame with stock data
@@ -152,34 +405,21 @@ class YFinanceDataFetcher(DataFetcherInterface):
         # Fetch data
         try:
             ticker_obj = yf.Ticker(ticker)
-            df = ticker_obj.history(period=yf_period, interval=interval)
+            if start is not None:
+                df = ticker_obj.history(start=start, end=end, interval=interval)
+            else:
+                df = ticker_obj.history(period=yf_period, interval=interval)
 
             if df.empty:
                 raise ValueError(f"No historical data found for {ticker}")
 
-            # Rename columns to match expected format
-            # yfinance returns columns with capitalized names already, but let's ensure consistency
-            column_mapping = {
-                "Open": "Open",
-                "High": "High",
-                "Low": "Low",
-                "Close": "Close",
-                "Volume": "Volume",
-                "Dividends": "Dividends",
-                "Stock Splits": "Stock Splits",
-            }
-
-            # Only rename columns that exist
-            rename_cols = {k: v for k, v in column_mapping.items() if k in df.columns}
-            df = df.rename(columns=rename_cols)
-
-            # Ensure index is named 'date'
-            df.index.name = "date"
-
-            # Convert timezone-aware timestamps to naive timestamps
-            # This is important for compatibility with the current implementation
-            if df.index.tzinfo is not None:
-                df.index = df.index.tz_localize(None)
+            df = self._normalize_history(df)
+
+            # Keep end exclusive regardless of how the API treats it
+            if end is not None:
+                df = df[df.index < end]
+                if df.empty:
+                    raise ValueError(f"No historical data found for {ticker}")
 
             return df
 
@@ -193,6 +433,102 @@ class YFinanceDataFetcher(DataFetcherInterface):
                 # Re-raise with more context
                 raise ValueError(f"Error fetching data for {ticker}: {e}") from e
 
+    def _download_from_yfinance(self, tickers, period="1y", interval="1d", start=None):
+        """
+        Fetch data for several tickers with a single yfinance bulk download.
+
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period ('1y', '5y', etc.), used if start is None
+            interval (str): Data interval ('1d', '1wk', etc.)
+            start (pandas.Timestamp, optional): First date to fetch
+
+        Returns:
+            dict[str, pandas.DataFrame]: Mapping of ticker to its DataFrame.
+                Tickers without data are omitted.
+        """
+        if start is not None:
+            date_range = {"start": start}
+        else:
+            date_range = {"period": self._map_period_to_yfinance(period)}
+
+        try:
+            # Match Ticker.history defaults so bulk and single fetches agree
+            data = yf.download(
+                tickers,
+                **date_range,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                actions=True,
+                progress=False,
+                threads=True,
+            )
+        except Exception as e:
+            raise ValueError(
+                f"Error fetching data for {len(tickers)} tickers: {e}"
+            ) from e
+
+        if data is None or data.empty:
+            return {}
+
+        frames = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                df = data[ticker].copy()
+            elif len(tickers) == 1:
+                df = data.copy()
+            else:
+                continue
+
+            # Bulk downloads share one date index, so drop rows this ticker lacks
+            df = df.dropna(how="all")
+            if df.empty or "Close" not in df.columns or df["Close"].isna().all():
+                continue
+
+            df.columns.name = None
+            frames[ticker] = self._normalize_history(df)
+
+        return frames
+
+    def _normalize_history(self, df):
+        """
+        Normalize a yfinance history DataFrame to the expected format.
+
+        Args:
+            df (pandas.DataFrame): Raw yfinance history
+
+        Returns:
+            pandas.DataFrame: DataFrame with a naive 'date' index
+        """
+        # Rename columns to match expected format
+        # yfinance returns columns with capitalized names already, but let's ensure consistency
+        column_mapping = {
+            "Open": "Open",
+            "High": "High",
+            "Low": "Low",
+            "Close": "Close",
+            "Volume": "Volume",
+            "Dividends": "Dividends",
+            "Stock Splits": "Stock Splits",
+        }
+
+        # Only rename columns that exist
+        rename_cols = {k: v for k, v in column_mapping.items() if k in df.columns}
+        df = df.rename(columns=rename_cols)
+
+        # Ensure index is named 'date'
+        df.index.name = "date"
+
+        # Convert timezone-aware timestamps to naive timestamps
+        # This is important for compatibility with the current implementation
+        if df.index.tzinfo is not None:
+            df.index = df.index.tz_localize(None)
+
+        return df
+
     def _map_period_to_yfinance(self, period):
         """
         Map period string to yfinance format.
@@ -283,4 +619,33 @@ class YFinanceDataFetcher(DataFetcherInterface):
         Returns:
             str: Path to cache file
         """
-        return os.path.join(self.cache_dir, f"{ticker}_{period}_{interval}.csv")
+        return self.cache.get_path(ticker, self._get_cache_key(period, interval))
+
+    def get_cache_path(self, ticker, period="3m", interval="1d"):
+        """
+        Get the path of the disk entry that data for a period is loaded from.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Time period
+            interval (str): Data interval
+
+        Returns:
+            str: Path to the history store entry, or to the per-period cache file
+        """
+        if self.history_store is not None:
+            return self.history_store.get_path(ticker, interval)
+        return self._get_cache_path(ticker, period, interval)
+
+    def _get_cache_key(self, period, interval):
+        """
+        Get the key of a ticker's cache entry for a period and interval.
+
+        Args:
+            period (str): Time period
+            interval (str): Data interval
+
+        Returns:
+            str: Cache entry key
+        """
+        return f"{period}_{interval}"
@@ -0,0 +1,79 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from src.folio.data_model import OptionPosition, PortfolioGroup, StockPosition
+from src.folio.portfolio_value import (
+    calculate_beta_adjusted_exposure,
+    calculate_net_exposure,
+)
+
+
+def _create_option_position(
+    ticker, option_type, quantity, delta_exposure, market_value
+):
+    """Create an option position with the values the frame aggregates."""
+    return OptionPosition(
+        ticker=ticker,
+        position_type="option",
+        quantity=quantity,
+        beta=1.1,
+        beta_adjusted_exposure=delta_exposure * 1.1,
+        strike=100.0,
+        expiry="2030-01-18",
+        option_type=option_type,
+        delta=0.5 if option_type == "CALL" else -0.5,
+        delta_exposure=delta_exposure,
+        notional_value=abs(quantity) * 100 * 100.0,
+        underlying_beta=1.1,
+        market_exposure=delta_exposure,
+        price=5.0,
+        cost_basis=4.0,
+        market_value=market_value,
+    )
+
+
+def _create_portfolio_group(ticker, stock_quantity, options):
+    """Create a group with an optional stock position."""
+    stock = None
+    if stock_quantity is not None:
+        stock = StockPosition(
+            ticker=ticker,
+            quantity=stock_quantity,
+            beta=1.1,
+            beta_adjusted_exposure=stock_quantity * 110.0,
+            market_exposure=stock_quantity * 100.0,
+            price=100.0,
+            cost_basis=90.0,
+        )
+    return PortfolioGroup(
+        ticker=ticker,
+        stock_position=stock,
+        option_positions=options,
+        net_exposure=calculate_net_exposure(stock, options),
+        beta=1.1,
+        beta_adjusted_exposure=calculate_beta_adjusted_exposure(stock, options),
+        total_delta_exposure=sum(option.delta_exposure for option in options),
+        options_delta_exposure=sum(option.delta_exposure for option in options),
+    )
+
+
+@pytest.fixture
+def portfolio_groups():
+    """Groups with and without stock, options and short legs."""
+    return [
+        _create_portfolio_group(
+            "AAPL",
+            100,
+            [
+                _create_option_position("AAPL", "CALL", 2, 10000.0, 1000.0),
+                _create_option_position("AAPL", "PUT", 1, -5000.0, 500.0),
+            ],
+        ),
+        _create_portfolio_group("MSFT", -50, []),
+        _create_portfolio_group(
+            "TSLA",
+            None,
+            [_create_option_position("TSLA", "CALL", -3, -15000.0, -1500.0)],
+        ),
+    ]
@@ -420,6 +420,40 @@ class TestAsymptoticAnalysis(unittest.TestCase):
         self.assertFalse(result["unbounded_profit_low"])
         self.assertFalse(result["unbounded_loss_low"])
 
+    def test_terminal_deltas(self):
+        """Test that calls and puts are classified by type, other types skipped."""
+        expiration = datetime.date.today() + datetime.timedelta(days=30)
+
+        # Short straddle: unbounded loss in both directions
+        straddle = [
+            {
+                "position_type": "option",
+                "option_type": option_type,
+                "strike": 150,
+                "expiration": expiration,
+                "quantity": -2,
+                "price": 5,
+                "ticker": "AAPL",
+            }
+            for option_type in ("CALL", "PUT")
+        ]
+        result = analyze_asymptotic_behavior(straddle)
+        self.assertTrue(result["unbounded_loss_high"])
+        self.assertTrue(result["unbounded_loss_low"])
+        self.assertFalse(result["unbounded_profit_high"])
+        self.assertFalse(result["unbounded_profit_low"])
+
+        # Option types are matched regardless of case
+        long_call = {**straddle[0], "option_type": "call", "quantity": 1}
+        result = analyze_asymptotic_behavior([long_call])
+        self.assertTrue(result["unbounded_profit_high"])
+
+        # Unknown option types are skipped
+        other = {**straddle[0], "option_type": "OTHER", "quantity": 1}
+        with self.assertLogs("folio", level="WARNING"):
+            result = analyze_asymptotic_behavior([other])
+        self.assertFalse(any(result.values()))
+
     def test_fallback_calculation(self):
         """Test the fallback calculation when delta calculation fails."""
         # Create a position that will cause the delta calculation to fail
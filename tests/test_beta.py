@@ -1,9 +1,10 @@
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.folio.utils import get_beta
+from src.folio.utils import get_beta, get_betas
 
 # Test categories based on check_beta.py:
 # 1. Money market funds (SPAXX**, FMPXX) - should have beta ≈ 0
@@ -132,3 +133,64 @@ def test_invalid_data_format(mock_data_fetcher):
 
     with pytest.raises(KeyError):  # Should raise KeyError when trying to access 'Close'
         get_beta("BADFORMAT")
+
+
+def test_get_betas_matches_get_beta(mock_data_fetcher):
+    """Test that the vectorized betas match the per-ticker calculation."""
+    market_moves = [0.01, -0.01, 0.02, -0.015, 0.025] * 20
+    histories = {
+        "MCHI": create_price_data([0.007, -0.007, 0.014, -0.011, 0.018] * 20),
+        "AAPL": create_price_data([0.015, -0.015, 0.03, -0.022, 0.037] * 20),
+        "TLT": create_price_data(
+            [0.0001 if i % 2 == 0 else -0.0001 for i in range(100)]
+        ),
+        "NEWSTOCK": create_price_data([0.01]),
+    }
+    # Gaps in one series must not affect the others
+    histories["AAPL"].loc[[10, 11, 50], "Close"] = np.nan
+    histories["TLT"] = histories["TLT"].drop(index=[20, 21, 22])
+
+    mock_data_fetcher.fetch_many.return_value = histories
+    mock_data_fetcher.fetch_market_data.return_value = create_price_data(market_moves)
+
+    betas = get_betas([*histories, "SPAXX"])
+
+    assert betas["SPAXX"] == 0.0
+    assert betas["NEWSTOCK"] == 0.0
+    mock_data_fetcher.fetch_many.assert_called_once_with(
+        list(histories), period=mock_data_fetcher.beta_period
+    )
+    for ticker, history in histories.items():
+        mock_data_fetcher.fetch_data.return_value = history
+        assert betas[ticker] == pytest.approx(get_beta(ticker))
+
+
+def test_get_betas_uses_descriptions(mock_data_fetcher):
+    """Test that descriptions identify cash-like positions without fetching data."""
+    betas = get_betas(["XYZ"], {"XYZ": "TREASURY MONEY MARKET FUND"})
+
+    assert betas == {"XYZ": 0.0}
+    mock_data_fetcher.fetch_many.assert_not_called()
+
+
+def test_get_betas_constant_market(mock_data_fetcher):
+    """Test that a near-zero market variance gives a beta of 0.0."""
+    mock_data_fetcher.fetch_many.return_value = {
+        "AAPL": create_price_data([0.01, -0.01] * 10)
+    }
+    mock_data_fetcher.fetch_market_data.return_value = pd.DataFrame(
+        {"Close": [100.0] * 21}
+    )
+
+    assert get_betas(["AAPL"]) == {"AAPL": 0.0}
+
+
+def test_get_betas_omits_failed_fetches(mock_data_fetcher):
+    """Test that tickers the fetcher could not return are left out."""
+    mock_data_fetcher.fetch_many.return_value = {"AAPL": create_price_data([0.01] * 10)}
+    mock_data_fetcher.fetch_market_data.return_value = create_price_data(
+        [0.02, -0.01] * 5
+    )
+
+    betas = get_betas(["AAPL", "INVALID"])
+    assert set(betas) == {"AAPL"}
@@ -0,0 +1,154 @@
+"""Tests for the persistent beta cache in src/folio/beta_cache.py
+
+These tests verify:
+1. Betas round trip and miss when their date or price data changes
+2. Invalidation by ticker, market index or all
+3. get_beta and get_betas skip the calculation for cached betas
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import pytz
+
+from src.folio.beta_cache import BetaCache
+from src.folio.utils import get_beta, get_betas
+from src.stockdata import get_cache_date
+
+
+@pytest.fixture
+def beta_cache(tmpdir):
+    """Create a beta cache in a temporary directory."""
+    cache = BetaCache(str(tmpdir.join("betas.sqlite")))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def price_files(tmpdir):
+    """Create price cache files for the mock fetcher to point at."""
+    paths = {}
+    for ticker in ("AAPL", "MCHI", "SPY"):
+        path = tmpdir.join(f"{ticker}_3m_1d.csv")
+        path.write("date,Close\n")
+        paths[ticker] = str(path)
+    return paths
+
+
+@pytest.fixture
+def mock_data_fetcher(price_files, beta_cache):
+    """Create a mock DataFetcher backed by cache files and a temporary beta cache."""
+    moves = [0.01, -0.01, 0.02, -0.015, 0.025] * 20
+    prices = pd.DataFrame({"Close": (1 + pd.Series([0.0, *moves])).cumprod() * 100})
+
+    with (
+        patch("src.folio.utils.data_fetcher") as mock,
+        patch("src.folio.utils.beta_cache", beta_cache),
+    ):
+        mock.beta_period = "3m"
+        mock.get_cache_path.side_effect = lambda ticker, period: price_files[ticker]
+        mock.fetch_data.return_value = prices
+        mock.fetch_market_data.return_value = prices
+        mock.fetch_many.side_effect = lambda tickers, period: dict.fromkeys(
+            tickers, prices
+        )
+        yield mock
+
+
+class TestBetaCache:
+    """Tests for storing and expiring betas."""
+
+    def test_round_trip(self, beta_cache):
+        """Test that a stored beta is returned for the same key and stamp."""
+        beta_cache.put("AAPL", "SPY", "3m", "1:2", 1.25)
+
+        assert beta_cache.get("AAPL", "SPY", "3m", "1:2") == 1.25
+        assert beta_cache.get("AAPL", "SPY", "6m", "1:2") is None
+        assert beta_cache.get("AAPL", "QQQ", "3m", "1:2") is None
+
+    def test_changed_price_stamp(self, beta_cache):
+        """Test that a beta calculated from other price data is a miss."""
+        beta_cache.put("AAPL", "SPY", "3m", "1:2", 1.25)
+        assert beta_cache.get("AAPL", "SPY", "3m", "1:3") is None
+
+    def test_expires_with_cache_date(self, beta_cache):
+        """Test that betas from an earlier cache date are misses and pruned."""
+        yesterday = get_cache_date() - timedelta(days=1)
+        beta_cache.put("AAPL", "SPY", "3m", "1:2", 1.25, as_of=yesterday)
+
+        assert beta_cache.get("AAPL", "SPY", "3m", "1:2") is None
+        assert beta_cache.get("AAPL", "SPY", "3m", "1:2", as_of=yesterday) == 1.25
+
+        reopened = BetaCache(beta_cache.db_path)
+        assert reopened.get("AAPL", "SPY", "3m", "1:2", as_of=yesterday) is None
+        reopened.close()
+
+    def test_invalidate(self, beta_cache):
+        """Test invalidating one ticker, the market index and everything."""
+        beta_cache.put("AAPL", "SPY", "3m", "1:2", 1.25)
+        beta_cache.put("MCHI", "SPY", "3m", "1:2", 0.7)
+        beta_cache.put("MCHI", "QQQ", "3m", "1:2", 0.5)
+
+        beta_cache.invalidate("AAPL")
+        assert beta_cache.get("AAPL", "SPY", "3m", "1:2") is None
+        assert beta_cache.get("MCHI", "SPY", "3m", "1:2") == 0.7
+
+        beta_cache.invalidate("SPY")
+        assert beta_cache.get("MCHI", "SPY", "3m", "1:2") is None
+        assert beta_cache.get("MCHI", "QQQ", "3m", "1:2") == 0.5
+
+        beta_cache.invalidate()
+        assert beta_cache.get("MCHI", "QQQ", "3m", "1:2") is None
+
+    def test_cache_date(self):
+        """Test that the cache date moves forward at 2PM Pacific."""
+        pacific_tz = pytz.timezone("US/Pacific")
+        before = pacific_tz.localize(datetime(2025, 6, 16, 13, 59))
+        after = pacific_tz.localize(datetime(2025, 6, 16, 14, 0))
+
+        assert get_cache_date(before) == date(2025, 6, 15)
+        assert get_cache_date(after) == date(2025, 6, 16)
+
+
+class TestCachedBetas:
+    """Tests for get_beta and get_betas with the beta cache."""
+
+    def test_get_beta_uses_cache(self, mock_data_fetcher):
+        """Test that a second get_beta call does no fetching or math."""
+        beta = get_beta("AAPL")
+        mock_data_fetcher.fetch_data.reset_mock()
+
+        assert get_beta("AAPL") == pytest.approx(beta)
+        mock_data_fetcher.fetch_data.assert_not_called()
+
+    def test_price_change_invalidates(self, mock_data_fetcher, price_files):
+        """Test that rewriting the price cache recalculates the beta."""
+        get_beta("AAPL")
+        mtime = os.path.getmtime(price_files["SPY"]) + 60
+        os.utime(price_files["SPY"], (mtime, mtime))
+        mock_data_fetcher.fetch_data.reset_mock()
+
+        get_beta("AAPL")
+        mock_data_fetcher.fetch_data.assert_called_once()
+
+    def test_get_betas_shares_cache(self, mock_data_fetcher):
+        """Test that get_betas reads betas cached by get_beta and fills the rest."""
+        get_beta("AAPL")
+
+        betas = get_betas(["AAPL", "MCHI"])
+        mock_data_fetcher.fetch_many.assert_called_once_with(["MCHI"], period="3m")
+
+        mock_data_fetcher.fetch_many.reset_mock()
+        assert get_betas(["AAPL", "MCHI"]) == betas
+        mock_data_fetcher.fetch_many.assert_not_called()
+
+    def test_no_cache_files(self, mock_data_fetcher, price_files):
+        """Test that betas are not cached when the price cache files are missing."""
+        os.remove(price_files["AAPL"])
+        get_beta("AAPL")
+        get_beta("AAPL")
+
+        assert mock_data_fetcher.fetch_data.call_count == 2
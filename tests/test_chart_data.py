@@ -1,10 +1,12 @@
 """Tests for chart data transformation functions."""
 
+import numpy as np
 import pytest
 
 from src.folio.chart_data import (
     transform_for_allocations_chart,
     transform_for_exposure_chart,
+    transform_for_scenario_surface,
     transform_for_treemap,
 )
 from src.folio.data_model import (
@@ -724,3 +726,22 @@ class TestChartDataTransformations:
             long_percentage + short_percentage + cash_percentage + pending_percentage
         )
         assert net_percentage == pytest.approx(100.0, abs=1.0)
+
+    def test_scenario_surface_heatmap(self):
+        """Test that one horizon of a surface becomes a P&L heatmap."""
+        surface = {
+            "spy_changes": [-0.1, 0.0, 0.1],
+            "volatility_shifts": [-0.05, 0.05],
+            "days_forward": [0, 30],
+            "pnl": np.arange(12, dtype=float).reshape(2, 2, 3) - 6,
+        }
+
+        chart_data = transform_for_scenario_surface(surface, days_index=1)
+
+        heatmap = chart_data["data"][0]
+        assert heatmap["type"] == "heatmap"
+        assert heatmap["x"] == ["-10%", "+0%", "+10%"]
+        assert heatmap["y"] == ["-5 pts", "+5 pts"]
+        assert heatmap["z"] == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+        assert heatmap["zmid"] == 0
+        assert chart_data["layout"]["title"]["text"] == "P&L in 30 Days"
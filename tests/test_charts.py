@@ -135,14 +135,15 @@ class TestChartComponents:
         card_body = collapse.children
         assert isinstance(card_body, dbc.CardBody)
 
-        # There should be 3 chart cards (exposure, treemap, allocations)
+        # There should be 4 chart cards (exposure, treemap, allocations, surface)
         chart_cards = card_body.children
-        assert len(chart_cards) == 3
+        assert len(chart_cards) == 4
 
         # Verify card titles
         assert "Market Exposure" in str(chart_cards[0])
         assert "Position Size by Exposure" in str(chart_cards[1])
         assert "Portfolio Allocation" in str(chart_cards[2])
+        assert "scenario-surface-chart" in str(chart_cards[3])
 
 
 class TestChartDataTransformation:
@@ -437,6 +438,11 @@ class TestChartIntegration:
 
         assert treemap_callback_found, "Position treemap callback not registered"
 
+        # Check for scenario surface callback
+        assert any(
+            "scenario-surface-chart.figure" in callback_id for callback_id in callbacks
+        ), "Scenario surface callback not registered"
+
     def test_dashboard_section_in_app_layout(self):
         """Test that dashboard section is included in the app layout."""
         # Create the app
@@ -457,6 +463,8 @@ class TestChartIntegration:
             "exposure-net-btn",
             "exposure-beta-btn",
             "treemap-group-by",
+            "scenario-surface-chart",
+            "scenario-surface-days",
         ]
 
         # Find all components with IDs in the layout
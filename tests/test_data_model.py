@@ -3,6 +3,10 @@
 This module tests the core functionality of the data model classes in src/folio/data_model.py.
 """
 
+import pickle
+
+import pytest
+
 from src.folio.data_model import (
     ExposureBreakdown,
     OptionPosition,
@@ -114,6 +118,46 @@ class TestOptionPosition:
         assert option.underlying_beta == 1.2
         assert option.price == 15.0
 
+    def test_option_position_copy_with(self):
+        """Test that copy_with replaces fields and leaves the original unchanged."""
+        option = OptionPosition(
+            ticker="AAPL",
+            position_type="option",
+            quantity=10,
+            beta=1.2,
+            beta_adjusted_exposure=1800.0,
+            market_exposure=1500.0,
+            strike=150.0,
+            expiry="2023-01-01",
+            option_type="CALL",
+            delta=0.7,
+            delta_exposure=1050.0,
+            notional_value=15000.0,
+            underlying_beta=1.2,
+            price=15.0,
+            cost_basis=12.0,
+        )
+
+        copy = option.copy_with(price=20.0, market_value=20000.0)
+
+        assert type(copy) is OptionPosition
+        assert copy.price == 20.0
+        assert copy.market_value == 20000.0
+        assert option.price == 15.0
+        assert option.market_value == 15000.0
+        assert copy.to_dict() == {
+            **option.to_dict(),
+            "price": 20.0,
+            "market_value": 20000.0,
+        }
+
+        # Positions are slotted, so unknown fields are rejected
+        assert not hasattr(copy, "__dict__")
+        with pytest.raises(AttributeError):
+            option.copy_with(volatility=0.3)
+
+        assert pickle.loads(pickle.dumps(copy)) == copy
+
     def test_option_position_to_dict(self):
         """Test conversion of OptionPosition to dictionary."""
         option = OptionPosition(
@@ -314,6 +358,41 @@ class TestPortfolioGroup:
         assert group.call_count == 1
         assert group.put_count == 0
 
+    def test_portfolio_group_copy_with(self):
+        """Test that copy_with keeps the option counts and shares positions."""
+        option = OptionPosition(
+            ticker="AAPL",
+            position_type="option",
+            quantity=-5,
+            beta=1.2,
+            beta_adjusted_exposure=600.0,
+            market_exposure=500.0,
+            strike=140.0,
+            expiry="2023-01-01",
+            option_type="PUT",
+            delta=-0.2,
+            delta_exposure=500.0,
+            notional_value=7000.0,
+            underlying_beta=1.2,
+        )
+        group = PortfolioGroup(
+            ticker="AAPL",
+            stock_position=None,
+            option_positions=[option],
+            net_exposure=500.0,
+            beta=1.2,
+            beta_adjusted_exposure=600.0,
+            total_delta_exposure=500.0,
+            options_delta_exposure=500.0,
+        )
+
+        copy = group.copy_with(net_exposure=1000.0)
+
+        assert copy.net_exposure == 1000.0
+        assert group.net_exposure == 500.0
+        assert copy.put_count == 1
+        assert copy.option_positions is group.option_positions
+
     def test_portfolio_group_to_dict(self):
         """Test conversion of PortfolioGroup to dictionary."""
         stock = StockPosition(
@@ -3,14 +3,22 @@ Tests for options.py
 """
 
 import datetime
+from unittest.mock import patch
 
+import numpy as np
 import pytest
+import QuantLib as ql  # noqa: N813
 
 from src.folio.options import (
+    ImpliedVolatilityCache,
     OptionContract,
+    QuantLibPricingContext,
     calculate_black_scholes_delta,
     calculate_bs_price,
+    calculate_implied_volatilities,
     calculate_implied_volatility,
+    get_pricing_context,
+    implied_volatility_cache,
     parse_option_description,
 )
 
@@ -114,3 +122,119 @@ def test_parse_option_description():
     # Test invalid month
     with pytest.raises(ValueError):
         parse_option_description("AAPL FOO 15 2023 $150 CALL")
+
+
+def test_pricing_context_reuses_contracts():
+    """Test that repricing a contract only updates its quotes."""
+    context = QuantLibPricingContext()
+    option = create_test_option(option_type="PUT", strike=100, days_to_expiry=60)
+
+    prices = [context.price(option, spot, 0.3) for spot in (90, 100, 110)]
+    contract = context.get_contract(option, 100, 0.3)
+
+    assert len(context) == 1
+    assert prices[0] > prices[1] > prices[2]
+    assert contract.spot.value() == 100
+    assert context.price(option, 100, 0.3) == pytest.approx(prices[1])
+    assert context.get_contract(option, 90, 0.4) is contract
+    assert context.delta(option, 100, 0.3) == pytest.approx(
+        calculate_black_scholes_delta(option, 100, volatility=0.3, engine="quantlib")
+    )
+
+
+def test_pricing_context_bounded():
+    """Test that the least recently used contracts are dropped."""
+    context = QuantLibPricingContext(max_contracts=2)
+    options = [create_test_option(strike=strike) for strike in (90, 100, 110)]
+
+    first = context.get_contract(options[0], 100, 0.3)
+    second = context.get_contract(options[1], 100, 0.3)
+    context.price(options[0], 100, 0.3)
+    context.price(options[2], 100, 0.3)
+
+    assert len(context) == 2
+    assert context.get_contract(options[0], 100, 0.3) is first
+    assert context.get_contract(options[1], 100, 0.3) is not second
+
+
+def test_get_pricing_context():
+    """Test that contexts are shared per rate and rebuilt for a new date."""
+    context = get_pricing_context(0.05)
+    assert get_pricing_context(0.05) is context
+    assert get_pricing_context(0.04) is not context
+    assert context.evaluation_date == ql.Date.todaysDate()
+
+    context.evaluation_date = ql.Date.todaysDate() - 1
+    assert get_pricing_context(0.05) is not context
+
+
+@pytest.mark.parametrize("engine", ["quantlib", "baw"])
+def test_calculate_implied_volatilities(engine):
+    """Test solving several contracts at once, then warm-starting from the result."""
+    options = [
+        create_test_option(option_type="CALL", strike=95, days_to_expiry=45),
+        create_test_option(option_type="PUT", strike=105, days_to_expiry=90),
+        create_test_option(option_type="PUT", strike=80, days_to_expiry=200),
+    ]
+    known_vols = [0.25, 0.4, 0.6]
+    prices = [
+        calculate_bs_price(option, 100, volatility=vol, engine=engine)
+        for option, vol in zip(options, known_vols, strict=True)
+    ]
+
+    implied_vols = calculate_implied_volatilities(options, 100, prices, engine=engine)
+    for option, vol, price in zip(options, implied_vols, prices, strict=True):
+        assert calculate_bs_price(
+            option, 100, volatility=vol, engine=engine
+        ) == pytest.approx(price, abs=1e-4)
+
+    # The next solve for the same contract starts from the last result
+    assert calculate_implied_volatility(
+        options[1], 100, prices[1], engine=engine
+    ) == pytest.approx(implied_vols[1], abs=1e-6)
+
+
+def test_implied_volatility_cache():
+    """Test that re-solving an unchanged book is served from the cache."""
+    implied_volatility_cache.clear()
+    options = [
+        create_test_option(option_type="CALL", strike=strike, days_to_expiry=60)
+        for strike in (90, 100, 110)
+    ]
+    prices = [12.0, 5.0, 1.5]
+
+    first = calculate_implied_volatilities(options, 100, prices, engine="baw")
+    assert implied_volatility_cache.stats()["misses"] == 3
+
+    with patch("src.folio.options.implied_volatility") as solver:
+        second = calculate_implied_volatilities(options, 100.001, prices, engine="baw")
+        solver.assert_not_called()
+    np.testing.assert_array_equal(first, second)
+
+    # A new option price is a miss, and only that contract is solved
+    calculate_implied_volatilities(options, 100, [12.0, 5.5, 1.5], engine="baw")
+    stats = implied_volatility_cache.stats()
+    assert stats["hits"] == 5
+    assert stats["misses"] == 4
+    assert stats["hit_rate"] == pytest.approx(5 / 9)
+
+    # Other engines are cached separately
+    calculate_implied_volatilities(options[:1], 100, prices[:1], engine="bsm")
+    assert implied_volatility_cache.stats()["misses"] == 5
+
+
+def test_implied_volatility_cache_eviction():
+    """Test that the least recently used entries are evicted."""
+    cache = ImpliedVolatilityCache(max_entries=2)
+    cache.put(("a",), 0.1)
+    cache.put(("b",), 0.2)
+    assert cache.get(("a",)) == 0.1
+    cache.put(("c",), 0.3)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 0.1
+    assert cache.stats()["evictions"] == 1
+
+    disabled = ImpliedVolatilityCache(max_entries=0)
+    disabled.put(("a",), 0.1)
+    assert disabled.get(("a",)) is None
@@ -12,9 +12,13 @@ from src.folio.data_model import OptionPosition, StockPosition
 from src.folio.pnl import (
     calculate_breakeven_points,
     calculate_max_profit_loss,
+    calculate_pnl_grid,
     calculate_position_pnl,
     calculate_strategy_pnl,
     determine_price_range,
+    sample_pnl_adaptively,
+    solve_breakeven_points,
+    solve_max_profit_loss,
     summarize_strategy_pnl,
 )
 
@@ -92,8 +96,8 @@ class TestPnLCalculations(unittest.TestCase):
         self.assertLessEqual(price_range[0], 440.0 * 0.8)
         self.assertGreaterEqual(price_range[1], 460.0 * 1.2)
 
-    @patch("src.folio.pnl.calculate_bs_price")
-    def test_calculate_position_pnl_stock(self, mock_calculate_bs_price):
+    @patch("src.folio.pnl.calculate_option_prices")
+    def test_calculate_position_pnl_stock(self, mock_calculate_option_prices):
         """Test P&L calculation for a stock position."""
         # Calculate P&L for stock position using current price as entry price (default)
         pnl_data = calculate_position_pnl(
@@ -119,10 +123,10 @@ class TestPnLCalculations(unittest.TestCase):
             self.assertAlmostEqual(pnl_data["pnl_values"][i], expected_pnl, places=2)
 
         # Verify mock wasn't called for stock position
-        mock_calculate_bs_price.assert_not_called()
+        mock_calculate_option_prices.assert_not_called()
 
         # Reset mock for the next test
-        mock_calculate_bs_price.reset_mock()
+        mock_calculate_option_prices.reset_mock()
 
         # Calculate P&L for stock position using cost basis as entry price
         pnl_data_cost_basis = calculate_position_pnl(
@@ -144,13 +148,14 @@ class TestPnLCalculations(unittest.TestCase):
             )
 
         # Verify mock wasn't called for stock position
-        mock_calculate_bs_price.assert_not_called()
+        mock_calculate_option_prices.assert_not_called()
 
-    @patch("src.folio.pnl.calculate_bs_price")
-    def test_calculate_position_pnl_option(self, mock_calculate_bs_price):
+    @patch("src.folio.pnl.calculate_option_prices")
+    def test_calculate_position_pnl_option(self, mock_calculate_option_prices):
         """Test P&L calculation for an option position."""
-        # Mock the option pricing function for default mode
-        mock_calculate_bs_price.side_effect = [5.0, 10.0, 15.0, 20.0, 25.0]
+        # Mock the option pricing function for default mode, one row per price
+        theo_prices = np.array([[5.0], [10.0], [15.0], [20.0], [25.0]])
+        mock_calculate_option_prices.return_value = theo_prices
 
         # Calculate P&L for call option position using current price as entry price (default)
         pnl_data = calculate_position_pnl(
@@ -178,12 +183,11 @@ class TestPnLCalculations(unittest.TestCase):
         for i, expected_pnl in enumerate(expected_pnls):
             self.assertAlmostEqual(pnl_data["pnl_values"][i], expected_pnl, places=2)
 
-        # Verify mock was called for option position
-        self.assertEqual(mock_calculate_bs_price.call_count, 5)
+        # Verify all prices were priced in one call
+        self.assertEqual(mock_calculate_option_prices.call_count, 1)
 
-        # Reset mock and set new side effect for cost basis mode
-        mock_calculate_bs_price.reset_mock()
-        mock_calculate_bs_price.side_effect = [5.0, 10.0, 15.0, 20.0, 25.0]
+        # Reset mock for cost basis mode
+        mock_calculate_option_prices.reset_mock()
 
         # Calculate P&L for call option position using cost basis as entry price
         pnl_data_cost_basis = calculate_position_pnl(
@@ -205,30 +209,20 @@ class TestPnLCalculations(unittest.TestCase):
                 pnl_data_cost_basis["pnl_values"][i], expected_pnl, places=2
             )
 
-        # Verify mock was called for option position
-        self.assertEqual(mock_calculate_bs_price.call_count, 5)
+        # Verify all prices were priced in one call
+        self.assertEqual(mock_calculate_option_prices.call_count, 1)
 
-    @patch("src.folio.pnl.calculate_position_pnl")
-    def test_calculate_strategy_pnl(self, mock_calculate_position_pnl):
+    @patch("src.folio.pnl.calculate_pnl_grid")
+    def test_calculate_strategy_pnl(self, mock_calculate_pnl_grid):
         """Test P&L calculation for a strategy (multiple positions)."""
-        # Mock the position P&L calculations for default mode
-        mock_calculate_position_pnl.side_effect = [
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [-4000.0, 1000.0, 6000.0],
-                "position": {},
-            },
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [500.0, 200.0, -100.0],
-                "position": {},
-            },
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [1000.0, 0.0, -1000.0],
-                "position": {},
-            },
-        ]
+        # Mock the P&L grid for default mode (one row per position)
+        mock_calculate_pnl_grid.return_value = np.array(
+            [
+                [-4000.0, 1000.0, 6000.0],
+                [500.0, 200.0, -100.0],
+                [1000.0, 0.0, -1000.0],
+            ]
+        )
 
         # Calculate P&L for a strategy with all positions using current price as entry price (default)
         positions = [self.stock_position, self.call_option, self.put_option]
@@ -243,6 +237,9 @@ class TestPnLCalculations(unittest.TestCase):
         self.assertEqual(len(pnl_data["price_points"]), 3)
         self.assertEqual(len(pnl_data["pnl_values"]), 3)
         self.assertEqual(len(pnl_data["individual_pnls"]), 3)
+        self.assertEqual(
+            pnl_data["individual_pnls"][1]["pnl_values"], [500.0, 200.0, -100.0]
+        )
 
         # Verify combined P&L calculations
         # Combined P&L = sum of individual P&Ls
@@ -250,38 +247,21 @@ class TestPnLCalculations(unittest.TestCase):
         for i, expected_pnl in enumerate(expected_combined_pnls):
             self.assertAlmostEqual(pnl_data["pnl_values"][i], expected_pnl, places=2)
 
-        # Verify mock was called for each position
-        self.assertEqual(mock_calculate_position_pnl.call_count, 3)
+        # Verify all positions were calculated in one batch
+        mock_calculate_pnl_grid.assert_called_once()
+        self.assertFalse(mock_calculate_pnl_grid.call_args.kwargs["use_cost_basis"])
 
         # Reset mock for cost basis mode
-        mock_calculate_position_pnl.reset_mock()
-
-        # Mock the position P&L calculations for cost basis mode
-        mock_calculate_position_pnl.side_effect = [
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [
-                    -3000.0,
-                    2000.0,
-                    7000.0,
-                ],  # Different values for cost basis
-                "position": {},
-            },
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [700.0, 400.0, 100.0],  # Different values for cost basis
-                "position": {},
-            },
-            {
-                "price_points": [400.0, 450.0, 500.0],
-                "pnl_values": [
-                    800.0,
-                    -200.0,
-                    -1200.0,
-                ],  # Different values for cost basis
-                "position": {},
-            },
-        ]
+        mock_calculate_pnl_grid.reset_mock()
+
+        # Mock the P&L grid for cost basis mode
+        mock_calculate_pnl_grid.return_value = np.array(
+            [
+                [-3000.0, 2000.0, 7000.0],
+                [700.0, 400.0, 100.0],
+                [800.0, -200.0, -1200.0],
+            ]
+        )
 
         # Calculate P&L for a strategy with all positions using cost basis as entry price
         pnl_data_cost_basis = calculate_strategy_pnl(
@@ -299,8 +279,74 @@ class TestPnLCalculations(unittest.TestCase):
                 pnl_data_cost_basis["pnl_values"][i], expected_pnl, places=2
             )
 
-        # Verify mock was called for each position
-        self.assertEqual(mock_calculate_position_pnl.call_count, 3)
+        mock_calculate_pnl_grid.assert_called_once()
+        self.assertTrue(mock_calculate_pnl_grid.call_args.kwargs["use_cost_basis"])
+
+    def test_calculate_pnl_grid(self):
+        """Test that the batched grid matches per-position P&L calculations."""
+        positions = [self.stock_position, self.call_option, self.put_option]
+        price_points = np.linspace(400.0, 500.0, 7)
+
+        for use_cost_basis in (False, True):
+            pnl_grid = calculate_pnl_grid(
+                positions, price_points, use_cost_basis=use_cost_basis
+            )
+            self.assertEqual(pnl_grid.shape, (3, 7))
+
+            for row, position in enumerate(positions):
+                pnl_data = calculate_position_pnl(
+                    position,
+                    price_range=(400.0, 500.0),
+                    num_points=7,
+                    use_cost_basis=use_cost_basis,
+                )
+                np.testing.assert_allclose(
+                    pnl_grid[row], pnl_data["pnl_values"], atol=1e-6
+                )
+
+    def test_sample_pnl_adaptively(self):
+        """Test that adaptive sampling follows the P&L curve within its budget."""
+        # Expiring tomorrow, so the P&L bends sharply at the strikes
+        expiry = (datetime.datetime.now() + datetime.timedelta(days=1)).strftime(
+            "%Y-%m-%d"
+        )
+        self.call_option.expiry = expiry
+        self.put_option.expiry = expiry
+        positions = [self.stock_position, self.call_option, self.put_option]
+        price_range = (350.0, 550.0)
+
+        price_points, pnl_grid = sample_pnl_adaptively(positions, price_range, 60)
+
+        self.assertLessEqual(len(price_points), 60)
+        self.assertEqual(pnl_grid.shape, (3, len(price_points)))
+        self.assertTrue(np.all(np.diff(price_points) > 0))
+        self.assertEqual(price_points[0], 350.0)
+        self.assertEqual(price_points[-1], 550.0)
+        self.assertIn(440.0, price_points)
+        self.assertIn(460.0, price_points)
+
+        # Points are denser around the strikes than in the linear tails
+        near_strikes = np.sum((price_points > 430) & (price_points < 470))
+        in_tail = np.sum(price_points > 510)
+        self.assertGreater(near_strikes, in_tail)
+
+        # Interpolating the samples follows the curve closely
+        dense_points = np.linspace(*price_range, 2001)
+        dense_pnl = calculate_pnl_grid(positions, dense_points).sum(axis=0)
+        interpolated = np.interp(dense_points, price_points, pnl_grid.sum(axis=0))
+        self.assertLess(
+            np.abs(interpolated - dense_pnl).max(), 0.01 * np.ptp(dense_pnl)
+        )
+
+        # calculate_strategy_pnl uses num_points as the budget
+        pnl_data = calculate_strategy_pnl(
+            positions, price_range=price_range, num_points=30, adaptive=True
+        )
+        self.assertLessEqual(len(pnl_data["price_points"]), 30)
+        self.assertEqual(
+            len(pnl_data["individual_pnls"][0]["pnl_values"]),
+            len(pnl_data["price_points"]),
+        )
 
     def test_calculate_breakeven_points(self):
         """Test calculation of breakeven points."""
@@ -347,6 +393,56 @@ class TestPnLCalculations(unittest.TestCase):
         self.assertEqual(max_pl["max_loss"], -1000.0)
         self.assertEqual(max_pl["max_loss_price"], 400.0)
 
+    def test_solve_breakeven_points(self):
+        """Test that breakevens are solved for exactly from a coarse grid."""
+        # A stock position breaks even at its entry price
+        breakeven_points = solve_breakeven_points(
+            [self.stock_position], np.linspace(400.0, 500.0, 3), use_cost_basis=True
+        )
+        self.assertEqual(len(breakeven_points), 1)
+        self.assertAlmostEqual(breakeven_points[0], 400.0, places=3)
+
+        # Breakevens of an option strategy match a dense grid
+        positions = [self.call_option, self.put_option]
+        coarse_points = np.linspace(380.0, 540.0, 9)
+        breakeven_points = solve_breakeven_points(positions, coarse_points)
+
+        dense_points = np.linspace(380.0, 540.0, 100001)
+        dense_pnl = calculate_pnl_grid(positions, dense_points).sum(axis=0)
+        crossings = np.flatnonzero(dense_pnl[:-1] * dense_pnl[1:] < 0)
+        self.assertEqual(len(breakeven_points), len(crossings))
+        for breakeven, crossing in zip(breakeven_points, crossings, strict=True):
+            self.assertGreaterEqual(breakeven, dense_points[crossing] - 1e-3)
+            self.assertLessEqual(breakeven, dense_points[crossing + 1] + 1e-3)
+
+        # With positions, calculate_breakeven_points uses the solver
+        pnl_data = calculate_strategy_pnl(
+            positions, price_range=(380.0, 540.0), num_points=9
+        )
+        self.assertEqual(
+            calculate_breakeven_points(pnl_data, positions), breakeven_points
+        )
+
+    def test_solve_max_profit_loss(self):
+        """Test that extremes between grid points are refined."""
+        # Long call, short two puts: P&L is lowest at the put strike
+        positions = [self.call_option, self.put_option]
+        coarse_points = np.linspace(380.0, 540.0, 9)
+        coarse_pnl = calculate_pnl_grid(positions, coarse_points).sum(axis=0)
+        extremes = solve_max_profit_loss(positions, coarse_points, coarse_pnl)
+
+        dense_points = np.linspace(380.0, 540.0, 100001)
+        dense_pnl = calculate_pnl_grid(positions, dense_points).sum(axis=0)
+
+        self.assertLessEqual(extremes["max_loss"], coarse_pnl.min())
+        self.assertAlmostEqual(extremes["max_loss"], dense_pnl.min(), places=2)
+        self.assertAlmostEqual(
+            extremes["max_loss_price"], dense_points[dense_pnl.argmin()], delta=0.01
+        )
+        # The maximum is at the edge of the range and is not refined
+        self.assertEqual(extremes["max_profit_price"], 540.0)
+        self.assertEqual(extremes["max_profit"], coarse_pnl[-1])
+
     def test_summarize_strategy_pnl(self):
         """Test strategy P&L summary generation."""
         # Create sample P&L data
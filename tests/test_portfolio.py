@@ -5,8 +5,11 @@ portfolio data from CSV files.
 """
 
 import os
+import threading
+import time
 
 import pandas as pd
+import pytest
 
 from src.folio.data_model import (
     ExposureBreakdown,
@@ -15,7 +18,10 @@ from src.folio.data_model import (
     PortfolioSummary,
     StockPosition,
 )
-from src.folio.portfolio import calculate_beta_adjusted_net_exposure
+from src.folio.portfolio import (
+    _fetch_latest_prices,
+    calculate_beta_adjusted_net_exposure,
+)
 
 
 class TestPortfolioLoading:
@@ -330,7 +336,7 @@ class TestPriceUpdates:
         # Create mock data fetcher
         mock_data_fetcher = mocker.MagicMock()
         mock_df = pd.DataFrame({"Close": [150.0]})
-        mock_data_fetcher.fetch_data.return_value = mock_df
+        mock_data_fetcher.fetch_many.return_value = {"AAPL": mock_df}
 
         # Create test portfolio groups
         stock_position = StockPosition(
@@ -388,7 +394,7 @@ class TestPriceUpdates:
         assert stock_position.beta_adjusted_exposure == 18000.0  # $15000 * 1.2
 
         # Verify the data fetcher was called correctly
-        mock_data_fetcher.fetch_data.assert_called_with("AAPL", period="1d")
+        mock_data_fetcher.fetch_many.assert_called_once_with(["AAPL"], period="1d")
 
     def test_update_portfolio_summary_with_prices(self, mocker):
         """Test updating the portfolio summary with the latest prices."""
@@ -529,3 +535,132 @@ class TestPriceUpdates:
         assert spy_group.option_positions[0].quantity == -30
         assert spy_group.option_positions[1].quantity == -30
         assert spy_group.option_positions[2].quantity == 30
+
+
+class StubPriceFetcher:
+    """Local data fetcher that simulates per-ticker network latency."""
+
+    def __init__(self, latency=0.05, slow_tickers=None, failing_tickers=None):
+        self.latency = latency
+        self.slow_tickers = slow_tickers or {}
+        self.failing_tickers = failing_tickers or set()
+        self.batch_calls = 0
+        # Number of fetch_data calls in progress, and the most seen at once
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def fetch_data(self, ticker, period="3m", interval="1d"):  # noqa: ARG002
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.slow_tickers.get(ticker, self.latency))
+        finally:
+            with self.lock:
+                self.active -= 1
+        if ticker in self.failing_tickers:
+            raise ValueError(f"No historical data found for {ticker}")
+        return pd.DataFrame({"Close": [100.0]})
+
+    def fetch_many(self, tickers, period="3m", interval="1d"):  # noqa: ARG002
+        self.batch_calls += 1
+        return {ticker: pd.DataFrame({"Close": [100.0]}) for ticker in tickers}
+
+
+class TestConcurrentPriceRefresh:
+    """Tests for the concurrent price refresh mode."""
+
+    def test_fetches_overlap(self):
+        """Test that tickers are fetched concurrently, up to max_workers at once."""
+        tickers = [f"T{i}" for i in range(10)]
+        fetcher = StubPriceFetcher(latency=0.2)
+
+        prices = _fetch_latest_prices(
+            tickers,
+            fetcher,
+            {"mode": "concurrent", "max_workers": 4, "timeout": 30},
+        )
+
+        assert prices == dict.fromkeys(tickers, 100.0)
+        assert 1 < fetcher.max_active <= 4
+
+    def test_per_ticker_timeout_and_errors(self, caplog):
+        """Test that slow and failing tickers are reported in one aggregated error."""
+        fetcher = StubPriceFetcher(
+            latency=0.01, slow_tickers={"SLOW": 1.0}, failing_tickers={"BAD"}
+        )
+
+        prices = _fetch_latest_prices(
+            ["AAPL", "SLOW", "BAD"],
+            fetcher,
+            {"mode": "concurrent", "max_workers": 3, "timeout": 0.2},
+        )
+
+        assert prices == {"AAPL": 100.0}
+        report = [
+            r.message for r in caplog.records if "Price refresh failed" in r.message
+        ]
+        assert len(report) == 1
+        assert "2 of 3 tickers" in report[0]
+        assert "SLOW (timed out" in report[0]
+        assert "BAD (No historical data found" in report[0]
+
+    def test_unknown_mode(self, caplog):
+        """Test that an unknown refresh mode falls back to batch with a warning."""
+        fetcher = StubPriceFetcher()
+
+        prices = _fetch_latest_prices(["AAPL"], fetcher, {"mode": "serial"})
+
+        assert prices == {"AAPL": 100.0}
+        assert fetcher.batch_calls == 1
+        assert any("Unknown price refresh mode" in r.message for r in caplog.records)
+
+    def test_programming_errors_are_raised(self):
+        """Test that programming errors in a fetch are not reported as failures."""
+
+        def broken_fetch(*_args, **_kwargs):
+            raise TypeError("bad argument")
+
+        fetcher = StubPriceFetcher()
+        fetcher.fetch_data = broken_fetch
+
+        with pytest.raises(TypeError):
+            _fetch_latest_prices(["AAPL"], fetcher, {"mode": "concurrent"})
+
+
+class FailingBatchFetcher(StubPriceFetcher):
+    """Local data fetcher whose batch request fails."""
+
+    def __init__(self, error, **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.error = error
+
+    def fetch_many(self, tickers, period="3m", interval="1d"):  # noqa: ARG002
+        raise self.error
+
+
+class TestBatchPriceRefresh:
+    """Tests for the batch price refresh mode."""
+
+    def test_falls_back_to_per_ticker_fetches(self, caplog):
+        """Test that a failed batch request does not fail the whole refresh."""
+        fetcher = FailingBatchFetcher(
+            OSError("cache write failed"), failing_tickers={"BAD"}
+        )
+
+        prices = _fetch_latest_prices(["AAPL", "BAD"], fetcher, {"mode": "batch"})
+
+        assert prices == {"AAPL": 100.0}
+        report = [
+            r.message for r in caplog.records if "Price refresh failed" in r.message
+        ]
+        assert len(report) == 1
+        assert "BAD (No historical data found" in report[0]
+
+    def test_programming_errors_are_raised(self):
+        """Test that programming errors in the batch request are not swallowed."""
+        fetcher = FailingBatchFetcher(TypeError("bad argument"))
+
+        with pytest.raises(TypeError):
+            _fetch_latest_prices(["AAPL"], fetcher, {"mode": "batch"})
@@ -0,0 +1,63 @@
+"""Tests for the columnar PortfolioFrame."""
+
+import numpy as np
+
+from src.folio.portfolio_frame import PortfolioFrame
+from src.folio.portfolio_value import (
+    calculate_beta_adjusted_exposure,
+    calculate_net_exposure,
+    process_option_positions,
+)
+
+
+def test_index_arrays(portfolio_groups):
+    """Test the index arrays between groups and option legs."""
+    frame = PortfolioFrame.from_groups(portfolio_groups)
+
+    assert len(frame) == 3
+    np.testing.assert_array_equal(frame.option_groups, [0, 0, 2])
+    np.testing.assert_array_equal(frame.option_offsets, [0, 2, 2, 3])
+    np.testing.assert_array_equal(frame.has_stock, [True, True, False])
+
+
+def test_round_trip(portfolio_groups):
+    """Test that rebuilding the groups from the frame preserves every field."""
+    rebuilt = PortfolioFrame.from_groups(portfolio_groups).to_groups()
+
+    assert [group.to_dict() for group in rebuilt] == [
+        group.to_dict() for group in portfolio_groups
+    ]
+
+
+def test_reductions_match_canonical_functions(portfolio_groups):
+    """Test per-group exposures against the canonical functions."""
+    frame = PortfolioFrame.from_groups(portfolio_groups)
+
+    np.testing.assert_allclose(
+        frame.calculate_net_exposures(),
+        [
+            calculate_net_exposure(group.stock_position, group.option_positions)
+            for group in portfolio_groups
+        ],
+    )
+    np.testing.assert_allclose(
+        frame.calculate_beta_adjusted_exposures(),
+        [
+            calculate_beta_adjusted_exposure(
+                group.stock_position, group.option_positions
+            )
+            for group in portfolio_groups
+        ],
+    )
+
+
+def test_options_with_missing_values(portfolio_groups):
+    """Test that options with missing values are left out of the totals."""
+    portfolio_groups[0].option_positions[0].delta_exposure = None
+    frame = PortfolioFrame.from_groups(portfolio_groups)
+
+    np.testing.assert_array_equal(frame.valid_options(), [False, True, True])
+
+    long_options, short_options = process_option_positions(frame)
+    assert long_options["value"] == 0.0
+    assert short_options["delta_exposure"] == -20000.0
@@ -86,10 +86,11 @@ def sample_portfolio_with_options():
     return pd.DataFrame(data)
 
 
+@patch("src.folio.portfolio.get_betas", return_value={})
 @patch("src.folio.portfolio.get_beta")
 @patch("src.folio.portfolio.data_fetcher")
 def test_option_processing(
-    mock_data_fetcher, mock_get_beta, sample_portfolio_with_options
+    mock_data_fetcher, mock_get_beta, _mock_get_betas, sample_portfolio_with_options
 ):
     """Test that option processing works correctly."""
     # Mock the data fetcher to return stock prices
@@ -104,6 +105,12 @@ def test_option_processing(
             "AAPL": mock_aapl_df,
         }.get(symbol, mock_df)
     )
+    mock_data_fetcher.fetch_many.side_effect = (
+        lambda symbols, period=None, interval=None: {
+            symbol: {"SPY": mock_df, "AAPL": mock_aapl_df}.get(symbol, mock_df)
+            for symbol in symbols
+        }
+    )
 
     # Mock the beta function to return a fixed beta
     mock_get_beta.return_value = 1.0
@@ -214,10 +221,11 @@ def test_option_processing(
     )
 
 
+@patch("src.folio.portfolio.get_betas", return_value={})
 @patch("src.folio.portfolio.get_beta")
 @patch("src.folio.portfolio.data_fetcher")
 def test_option_processing_with_errors(
-    mock_data_fetcher, mock_get_beta, sample_portfolio_with_options
+    mock_data_fetcher, mock_get_beta, _mock_get_betas, sample_portfolio_with_options
 ):
     """Test that option processing handles errors gracefully."""
     # Add an invalid option to the portfolio
@@ -246,6 +254,12 @@ def test_option_processing_with_errors(
             "AAPL": mock_aapl_df,
         }.get(symbol, mock_df)
     )
+    mock_data_fetcher.fetch_many.side_effect = (
+        lambda symbols, period=None, interval=None: {
+            symbol: {"SPY": mock_df, "AAPL": mock_aapl_df}.get(symbol, mock_df)
+            for symbol in symbols
+        }
+    )
 
     # Mock the beta function to return a fixed beta
     mock_get_beta.return_value = 1.0
@@ -0,0 +1,518 @@
+"""
+Tests for the price cache backends in src/price_cache.py
+
+These tests verify:
+1. Round trips through each backend preserve data, dtypes and the date index
+2. The factory selects backends and falls back to CSV when needed
+3. Data fetchers read and write through the configured backend
+4. The history store slices short periods and only fetches missing dates
+5. Incremental refreshes append new bars and writes are atomic
+6. The memory tier serves repeat requests and expires with the disk cache
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.price_cache import (
+    CSVPriceCache,
+    HistoryStore,
+    MemoryCache,
+    ParquetPriceCache,
+    _parquet_available,
+    create_price_cache,
+)
+from src.stockdata import get_cache_expiry, period_to_start
+from src.yfinance import YFinanceDataFetcher
+from tests.test_data.mock_stock_data import get_real_data
+
+requires_parquet = pytest.mark.skipif(
+    not _parquet_available(), reason="pyarrow is not installed"
+)
+
+
+@pytest.fixture
+def temp_cache_dir(tmpdir):
+    """Create a temporary directory for cache files."""
+    return str(tmpdir.mkdir("test_cache"))
+
+
+@pytest.fixture
+def sample_dataframe():
+    """Create a sample DataFrame with the expected structure using real data."""
+    return get_real_data("AAPL", "1y")
+
+
+@pytest.fixture
+def recent_history():
+    """Create five years of real AAPL prices re-dated to end today."""
+    df = get_real_data("AAPL", "5y").copy()
+    df.index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=len(df))
+    df.index.name = "date"
+    return df
+
+
+class RangeSource:
+    """Stand-in for a fetcher's date range request that records its calls."""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        df = self.history
+        if start is not None:
+            df = df[df.index >= start]
+        if end is not None:
+            df = df[df.index < end]
+        if df.empty:
+            raise ValueError("No historical data found for AAPL")
+        return df
+
+
+class TestBackends:
+    """Tests for reading and writing cache entries."""
+
+    def test_csv_round_trip(self, temp_cache_dir, sample_dataframe):
+        """Test that the CSV backend keeps the existing file layout."""
+        cache = CSVPriceCache(temp_cache_dir)
+        cache.write("AAPL", "1y_1d", sample_dataframe)
+
+        assert cache.get_path("AAPL", "1y_1d") == os.path.join(
+            temp_cache_dir, "AAPL_1y_1d.csv"
+        )
+        pd.testing.assert_frame_equal(
+            cache.read("AAPL", "1y_1d"), sample_dataframe, check_freq=False
+        )
+
+    @requires_parquet
+    def test_parquet_round_trip(self, temp_cache_dir, sample_dataframe):
+        """Test that the Parquet backend preserves dtypes and the date index."""
+        cache = ParquetPriceCache(temp_cache_dir)
+        cache.write("AAPL", "1y_1d", sample_dataframe)
+
+        assert cache.get_path("AAPL", "1y_1d") == os.path.join(
+            temp_cache_dir, "AAPL", "1y_1d.parquet"
+        )
+        df = cache.read("AAPL", "1y_1d")
+        pd.testing.assert_frame_equal(df, sample_dataframe, check_freq=False)
+        assert df.index.name == "date"
+        assert pd.api.types.is_datetime64_dtype(df.index)
+
+    def test_failed_write_keeps_existing_entry(self, temp_cache_dir, sample_dataframe):
+        """Test that an interrupted write leaves the previous entry intact."""
+        cache = CSVPriceCache(temp_cache_dir)
+        cache.write("AAPL", "1y_1d", sample_dataframe)
+
+        with (
+            patch.object(pd.DataFrame, "to_csv", side_effect=OSError("disk full")),
+            pytest.raises(OSError),
+        ):
+            cache.write("AAPL", "1y_1d", sample_dataframe.iloc[:10])
+
+        assert os.listdir(temp_cache_dir) == ["AAPL_1y_1d.csv"]
+        assert len(cache.read("AAPL", "1y_1d")) == len(sample_dataframe)
+
+    def test_exists(self, temp_cache_dir, sample_dataframe):
+        """Test checking for an entry before and after writing it."""
+        cache = CSVPriceCache(temp_cache_dir)
+        assert not cache.exists("AAPL", "1y_1d")
+        cache.write("AAPL", "1y_1d", sample_dataframe)
+        assert cache.exists("AAPL", "1y_1d")
+
+
+class TestFactory:
+    """Tests for selecting a cache backend."""
+
+    def test_default_is_csv(self, temp_cache_dir):
+        """Test that no backend selects CSV."""
+        assert isinstance(create_price_cache(None, temp_cache_dir), CSVPriceCache)
+
+    @requires_parquet
+    def test_parquet(self, temp_cache_dir):
+        """Test selecting the Parquet backend."""
+        cache = create_price_cache("parquet", temp_cache_dir)
+        assert isinstance(cache, ParquetPriceCache)
+
+    def test_parquet_without_pyarrow(self, temp_cache_dir):
+        """Test falling back to CSV when pyarrow is not installed."""
+        with patch("src.price_cache._parquet_available", return_value=False):
+            cache = create_price_cache("parquet", temp_cache_dir)
+        assert isinstance(cache, CSVPriceCache)
+
+    def test_unknown_backend(self, temp_cache_dir):
+        """Test falling back to CSV for an unknown backend."""
+        assert isinstance(create_price_cache("hdf5", temp_cache_dir), CSVPriceCache)
+
+
+@requires_parquet
+class TestFetcherIntegration:
+    """Tests for data fetchers using the Parquet backend."""
+
+    def test_fetch_writes_and_reads_parquet(self, temp_cache_dir, sample_dataframe):
+        """Test that a fetch is cached as Parquet and served from it afterwards."""
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = sample_dataframe
+
+        with patch("yfinance.Ticker", return_value=mock_ticker) as mock_yf:
+            fetcher = YFinanceDataFetcher(
+                cache_dir=temp_cache_dir, cache_config={"backend": "parquet"}
+            )
+            fetcher.fetch_data("AAPL", period="1y")
+            assert os.path.exists(os.path.join(temp_cache_dir, "AAPL", "1y_1d.parquet"))
+
+            df = fetcher.fetch_data("AAPL", period="1y")
+            assert mock_yf.call_count == 1
+            pd.testing.assert_frame_equal(df, sample_dataframe, check_freq=False)
+
+
+class TestPeriodToStart:
+    """Tests for converting period strings to start dates."""
+
+    def test_periods(self):
+        """Test the supported period formats."""
+        now = pd.Timestamp("2025-06-15 10:30")
+        assert period_to_start("1d", now) == pd.Timestamp("2025-06-14")
+        assert period_to_start("3m", now) == pd.Timestamp("2025-03-15")
+        assert period_to_start("3mo", now) == pd.Timestamp("2025-03-15")
+        assert period_to_start("10y", now) == pd.Timestamp("2015-06-15")
+        assert period_to_start("ytd", now) == pd.Timestamp("2025-01-01")
+        assert period_to_start("max", now) is None
+
+    def test_invalid_period(self):
+        """Test that an unknown period format raises ValueError."""
+        with pytest.raises(ValueError):
+            period_to_start("3q")
+
+
+class TestHistoryStore:
+    """Tests for the canonical per-ticker history store."""
+
+    def test_shorter_period_is_sliced(self, temp_cache_dir, recent_history):
+        """Test that a shorter period is served from a longer stored history."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=86400)
+        source = RangeSource(recent_history)
+
+        store.fetch("AAPL", "1y", "1d", source)
+        df = store.fetch("AAPL", "3m", "1d", source)
+
+        assert len(source.calls) == 1
+        assert df.index[0] >= period_to_start("3m")
+        assert df.index[-1] == recent_history.index[-1]
+        assert sorted(os.listdir(temp_cache_dir)) == [
+            "AAPL_history_1d.csv",
+            "AAPL_history_1d.json",
+        ]
+
+    def test_longer_period_fetches_only_older_dates(
+        self, temp_cache_dir, recent_history
+    ):
+        """Test that extending the range only requests dates before the stored ones."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=86400)
+        source = RangeSource(recent_history)
+
+        store.fetch("AAPL", "3m", "1d", source)
+        first_stored = store.load("AAPL", "1d")[0].index[0]
+        df = store.fetch("AAPL", "1y", "1d", source)
+
+        assert source.calls[1] == (store.get_fetch_start("1y"), first_stored)
+        expected = recent_history[recent_history.index >= period_to_start("1y")]
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+        # The merged history now covers both periods
+        store.fetch("AAPL", "6m", "1d", source)
+        assert len(source.calls) == 2
+
+    def test_no_older_data_is_remembered(self, temp_cache_dir, recent_history):
+        """Test that a ticker younger than the period is not refetched."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=86400)
+        source = RangeSource(recent_history.iloc[-50:])
+
+        store.fetch("AAPL", "3m", "1d", source)
+        store.fetch("AAPL", "1y", "1d", source)
+        df = store.fetch("AAPL", "1y", "1d", source)
+
+        assert len(source.calls) == 2
+        assert len(df) == 50
+
+    def test_stale_history_refetches_period(self, temp_cache_dir, recent_history):
+        """Test that a stale history is refreshed for the requested period."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=86400)
+        source = RangeSource(recent_history)
+        store.fetch("AAPL", "1y", "1d", source)
+
+        make_stale(store.get_path("AAPL", "1d"))
+        store.fetch("AAPL", "3m", "1d", source)
+
+        assert source.calls[1] == (store.get_fetch_start("3m"), None)
+
+    def test_fetch_error_uses_stored_history(self, temp_cache_dir, recent_history):
+        """Test falling back to a stale history when the fetch fails."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=0)
+        store.fetch("AAPL", "1y", "1d", RangeSource(recent_history))
+
+        failing_source = MagicMock(
+            side_effect=ValueError("Error fetching data for AAPL: Network error")
+        )
+
+        df = store.fetch("AAPL", "3m", "1d", failing_source)
+        assert df.index[-1] == recent_history.index[-1]
+
+        with pytest.raises(ValueError):
+            store.fetch("MSFT", "3m", "1d", failing_source)
+
+    def test_short_period_keeps_last_row(self, recent_history):
+        """Test that a period with no rows returns the most recent one."""
+        history = recent_history.iloc[:-10]
+        df = HistoryStore.slice(history, "1d")
+        pd.testing.assert_frame_equal(df, history.iloc[-1:], check_freq=False)
+
+
+def make_stale(path):
+    """Set a cache file's modification time to two days ago."""
+    old_time = pd.Timestamp.now().timestamp() - 2 * 86400
+    os.utime(path, (old_time, old_time))
+
+
+class TestIncrementalRefresh:
+    """Tests for refreshing stale histories by appending new bars."""
+
+    @pytest.fixture
+    def history_with_actions(self, recent_history):
+        """Add yfinance action columns to the sample history."""
+        df = recent_history.copy()
+        df["Dividends"] = 0.0
+        df["Stock Splits"] = 0.0
+        return df
+
+    def test_appends_new_bars(self, temp_cache_dir, history_with_actions):
+        """Test that a stale history only fetches bars since its last date."""
+        store = HistoryStore(
+            CSVPriceCache(temp_cache_dir), cache_ttl=86400, incremental=True
+        )
+        store.fetch("AAPL", "1y", "1d", RangeSource(history_with_actions.iloc[:-3]))
+        last_stored = history_with_actions.index[-4]
+        make_stale(store.get_path("AAPL", "1d"))
+
+        source = RangeSource(history_with_actions)
+        df = store.fetch("AAPL", "1y", "1d", source)
+
+        assert source.calls == [(last_stored, None)]
+        expected = history_with_actions[
+            history_with_actions.index >= period_to_start("1y")
+        ]
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    def test_no_new_bars_marks_history_fresh(
+        self, temp_cache_dir, history_with_actions
+    ):
+        """Test that an empty refresh still counts as a refresh."""
+        store = HistoryStore(
+            CSVPriceCache(temp_cache_dir), cache_ttl=86400, incremental=True
+        )
+        store.fetch("AAPL", "1y", "1d", RangeSource(history_with_actions))
+        make_stale(store.get_path("AAPL", "1d"))
+
+        empty_source = RangeSource(history_with_actions.iloc[:0])
+        store.fetch("AAPL", "1y", "1d", empty_source)
+        store.fetch("AAPL", "1y", "1d", empty_source)
+
+        assert len(empty_source.calls) == 1
+
+    def test_new_dividend_refetches_history(self, temp_cache_dir, history_with_actions):
+        """Test that a dividend in the new bars refetches the stored range."""
+        store = HistoryStore(
+            CSVPriceCache(temp_cache_dir), cache_ttl=86400, incremental=True
+        )
+        store.fetch("AAPL", "1y", "1d", RangeSource(history_with_actions.iloc[:-3]))
+        covered_start = store.get_fetch_start("1y")
+        make_stale(store.get_path("AAPL", "1d"))
+
+        updated = history_with_actions.copy()
+        updated.iloc[-2, updated.columns.get_loc("Dividends")] = 0.25
+        updated["Close"] = updated["Close"] * 0.99
+        source = RangeSource(updated)
+        df = store.fetch("AAPL", "1y", "1d", source)
+
+        assert source.calls[1] == (covered_start, None)
+        assert df["Close"].iloc[0] == updated.loc[df.index[0], "Close"]
+
+    def test_disabled_refetches_period(self, temp_cache_dir, history_with_actions):
+        """Test that without incremental mode the whole period is fetched."""
+        store = HistoryStore(CSVPriceCache(temp_cache_dir), cache_ttl=86400)
+        store.fetch("AAPL", "1y", "1d", RangeSource(history_with_actions))
+        make_stale(store.get_path("AAPL", "1d"))
+
+        source = RangeSource(history_with_actions)
+        store.fetch("AAPL", "1y", "1d", source)
+
+        assert source.calls == [(store.get_fetch_start("1y"), None)]
+
+
+class TestFetcherHistoryStore:
+    """Tests for data fetchers with canonical_history enabled."""
+
+    def test_fetch_data_shares_history(self, temp_cache_dir, recent_history):
+        """Test that the beta and price refresh periods share one download."""
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = recent_history
+
+        with patch("yfinance.Ticker", return_value=mock_ticker):
+            fetcher = YFinanceDataFetcher(
+                cache_dir=temp_cache_dir, cache_config={"canonical_history": True}
+            )
+            fetcher.fetch_data("AAPL", period="3m")
+            df = fetcher.fetch_data("AAPL", period="1d")
+
+        assert mock_ticker.history.call_count == 1
+        assert mock_ticker.history.call_args.kwargs["start"] == (
+            fetcher.history_store.get_fetch_start("3m")
+        )
+        assert df.index[-1] == recent_history.index[-1]
+
+    def test_fetch_many_downloads_only_misses(self, temp_cache_dir, recent_history):
+        """Test that fetch_many slices stored histories and bulk fetches the rest."""
+        bulk = pd.concat({"GOOGL": recent_history}, axis=1)
+
+        with patch("yfinance.download", return_value=bulk) as mock_download:
+            fetcher = YFinanceDataFetcher(
+                cache_dir=temp_cache_dir, cache_config={"canonical_history": True}
+            )
+            fetcher.history_store.save("AAPL", "1d", recent_history, None)
+            results = fetcher.fetch_many(["AAPL", "GOOGL"], period="1y")
+
+        mock_download.assert_called_once()
+        assert mock_download.call_args.args[0] == ["GOOGL"]
+        assert set(results) == {"AAPL", "GOOGL"}
+        assert fetcher.history_store.load("GOOGL", "1d")[0] is not None
+
+    def test_fetch_many_appends_in_one_download(self, temp_cache_dir, recent_history):
+        """Test that stale histories share one download of their new bars."""
+        fetcher = YFinanceDataFetcher(
+            cache_dir=temp_cache_dir,
+            cache_config={"canonical_history": True, "incremental_refresh": True},
+        )
+        store = fetcher.history_store
+        store.save("AAPL", "1d", recent_history.iloc[:-2], None)
+        store.save("GOOGL", "1d", recent_history.iloc[:-5], None)
+        make_stale(store.get_path("AAPL", "1d"))
+        make_stale(store.get_path("GOOGL", "1d"))
+
+        tail = recent_history.iloc[-5:]
+        bulk = pd.concat({"AAPL": tail, "GOOGL": tail}, axis=1)
+        with patch("yfinance.download", return_value=bulk) as mock_download:
+            results = fetcher.fetch_many(["AAPL", "GOOGL"], period="1y")
+
+        mock_download.assert_called_once()
+        assert mock_download.call_args.kwargs["start"] == recent_history.index[-6]
+        for ticker in ("AAPL", "GOOGL"):
+            assert results[ticker].index[-1] == recent_history.index[-1]
+            assert store.load(ticker, "1d")[2]
+
+
+class TestMemoryCache:
+    """Tests for the in-process memory tier."""
+
+    @pytest.fixture
+    def cache_file(self, temp_cache_dir, sample_dataframe):
+        """Write a fresh disk entry for memory entries to expire with."""
+        cache = CSVPriceCache(temp_cache_dir)
+        cache.write("AAPL", "1y_1d", sample_dataframe)
+        return cache.get_path("AAPL", "1y_1d")
+
+    def test_hits_and_misses(self, cache_file, sample_dataframe):
+        """Test that counters track lookups and entries are copies."""
+        memory = MemoryCache(max_entries=4)
+        assert memory.get("AAPL") is None
+
+        memory.put("AAPL", sample_dataframe, cache_file, cache_ttl=86400)
+        df = memory.get("AAPL")
+        df["Close"] = 0.0
+
+        pd.testing.assert_frame_equal(memory.get("AAPL"), sample_dataframe)
+        assert memory.stats() == {
+            "hits": 2,
+            "misses": 1,
+            "evictions": 0,
+            "entries": 1,
+            "max_entries": 4,
+        }
+
+    def test_lru_eviction(self, cache_file, sample_dataframe):
+        """Test that the least recently used entry is evicted."""
+        memory = MemoryCache(max_entries=2)
+        memory.put("A", sample_dataframe, cache_file, cache_ttl=86400)
+        memory.put("B", sample_dataframe, cache_file, cache_ttl=86400)
+        memory.get("A")
+        memory.put("C", sample_dataframe, cache_file, cache_ttl=86400)
+
+        assert memory.get("B") is None
+        assert memory.get("A") is not None
+        assert memory.get("C") is not None
+        assert memory.evictions == 1
+
+    def test_expires_with_disk_entry(self, cache_file, sample_dataframe):
+        """Test that entries are not kept past their disk entry's expiry."""
+        memory = MemoryCache()
+        memory.put("AAPL", sample_dataframe, cache_file, cache_ttl=86400)
+
+        expires_at = get_cache_expiry(cache_file, 86400)
+        with patch("src.price_cache.time.time", return_value=expires_at):
+            assert memory.get("AAPL") is None
+
+        make_stale(cache_file)
+        memory.put("AAPL", sample_dataframe, cache_file, cache_ttl=86400)
+        assert memory.stats()["entries"] == 0
+
+    def test_disabled(self, cache_file, sample_dataframe):
+        """Test that a size of 0 stores nothing."""
+        memory = MemoryCache(max_entries=0)
+        memory.put("AAPL", sample_dataframe, cache_file, cache_ttl=86400)
+        assert memory.get("AAPL") is None
+
+    def test_cache_expiry(self, cache_file):
+        """Test that expiry is bounded by the TTL and the next 2PM cutoff."""
+        mtime = os.path.getmtime(cache_file)
+        assert get_cache_expiry(cache_file, 1) == mtime + 1
+        # Local time is read as Pacific time, as in is_cache_expired, so the
+        # cutoff can be more than a day away on machines in other timezones
+        assert mtime < get_cache_expiry(cache_file, 7 * 86400) < mtime + 2 * 86400
+        assert get_cache_expiry(cache_file + ".missing", 86400) is None
+
+    def test_market_data_parsed_once(self, temp_cache_dir, sample_dataframe):
+        """Test that repeated SPY requests read the disk cache only once."""
+        fetcher = YFinanceDataFetcher(
+            cache_dir=temp_cache_dir, cache_config={"memory_cache_size": 8}
+        )
+        fetcher.cache.write("SPY", "3m_1d", sample_dataframe)
+
+        with patch.object(fetcher.cache, "read", wraps=fetcher.cache.read) as read:
+            for _ in range(5):
+                df = fetcher.fetch_market_data()
+
+        assert read.call_count == 1
+        assert fetcher.memory_cache.hits == 4
+        pd.testing.assert_frame_equal(df, sample_dataframe, check_freq=False)
+
+    def test_fetch_many_uses_memory(self, temp_cache_dir, recent_history):
+        """Test that fetch_many serves tickers already held in memory."""
+        fetcher = YFinanceDataFetcher(
+            cache_dir=temp_cache_dir,
+            cache_config={"canonical_history": True, "memory_cache_size": 8},
+        )
+        bulk = pd.concat({"AAPL": recent_history, "GOOGL": recent_history}, axis=1)
+        with patch("yfinance.download", return_value=bulk):
+            fetcher.fetch_many(["AAPL", "GOOGL"], period="1y")
+
+        with patch.object(fetcher.history_store, "load") as load:
+            results = fetcher.fetch_many(["AAPL", "GOOGL"], period="1y")
+
+        load.assert_not_called()
+        assert set(results) == {"AAPL", "GOOGL"}
@@ -0,0 +1,342 @@
+"""
+Tests for pricing.py and the pricing engine selection in options.py
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+import QuantLib as ql  # noqa: N813
+
+from src.folio.options import (
+    calculate_black_scholes_delta,
+    calculate_bs_price,
+    calculate_option_deltas,
+    calculate_option_greeks,
+    calculate_option_prices,
+    calculate_time_to_expiry,
+    estimate_volatilities_with_skew,
+    estimate_volatility_with_skew,
+    get_pricing_engine,
+    get_scenario_pricing_engine,
+    options_config,
+    roll_forward,
+)
+from src.folio.pricing import (
+    baw_greeks,
+    baw_price,
+    bsm_greeks,
+    bsm_price,
+    implied_volatility,
+    norm_cdf,
+    price_options,
+)
+from tests.test_options import create_test_option
+
+# (spot, strike, days to expiry, volatility, is_call, rate, dividend yield)
+CASES = [
+    (100, 100, 30, 0.3, True, 0.05, 0.0),
+    (100, 110, 90, 0.25, False, 0.05, 0.0),
+    (100, 130, 200, 0.4, False, 0.05, 0.0),
+    (100, 90, 365, 0.2, True, 0.05, 0.03),
+    (100, 80, 30, 0.3, False, 0.05, 0.0),
+    (100, 150, 60, 0.3, False, 0.08, 0.0),
+]
+
+
+def quantlib_option(case, exercise):
+    """Price a case with QuantLib's analytic European or BAW American engine."""
+    spot, strike, days, volatility, is_call, rate, dividend_yield = case
+    today = ql.Date.todaysDate()
+    ql.Settings.instance().evaluationDate = today
+    day_count = ql.Actual365Fixed()
+    process = ql.BlackScholesMertonProcess(
+        ql.QuoteHandle(ql.SimpleQuote(spot)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, dividend_yield, day_count)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, rate, day_count)),
+        ql.BlackVolTermStructureHandle(
+            ql.BlackConstantVol(today, ql.NullCalendar(), volatility, day_count)
+        ),
+    )
+    payoff = ql.PlainVanillaPayoff(ql.Option.Call if is_call else ql.Option.Put, strike)
+    if exercise == "european":
+        option = ql.VanillaOption(payoff, ql.EuropeanExercise(today + days))
+        option.setPricingEngine(ql.AnalyticEuropeanEngine(process))
+    else:
+        option = ql.VanillaOption(payoff, ql.AmericanExercise(today, today + days))
+        option.setPricingEngine(ql.BaroneAdesiWhaleyApproximationEngine(process))
+    return option
+
+
+def test_norm_cdf():
+    """Test the normal CDF against known values."""
+    x = np.array([-3.0, -1.0, 0.0, 1.0, 1.96])
+    expected = [0.0013499, 0.1586553, 0.5, 0.8413447, 0.9750021]
+    np.testing.assert_allclose(norm_cdf(x), expected, atol=1e-7)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_bsm_matches_quantlib(case):
+    """Test Black-Scholes-Merton prices and Greeks against QuantLib."""
+    spot, strike, days, volatility, is_call, rate, dividend_yield = case
+    greeks = bsm_greeks(
+        spot,
+        strike,
+        days / 365,
+        volatility,
+        is_call,
+        rate=rate,
+        dividend_yield=dividend_yield,
+    )
+    option = quantlib_option(case, "european")
+
+    assert greeks["price"] == pytest.approx(option.NPV(), abs=1e-5)
+    assert greeks["delta"] == pytest.approx(option.delta(), abs=1e-6)
+    assert greeks["gamma"] == pytest.approx(option.gamma(), abs=1e-6)
+    assert greeks["vega"] == pytest.approx(option.vega(), abs=1e-4)
+    assert greeks["theta"] == pytest.approx(option.theta(), abs=1e-4)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_baw_matches_quantlib(case):
+    """Test Barone-Adesi-Whaley prices against QuantLib's approximation engine."""
+    spot, strike, days, volatility, is_call, rate, dividend_yield = case
+    price = baw_price(
+        spot,
+        strike,
+        days / 365,
+        volatility,
+        is_call,
+        rate=rate,
+        dividend_yield=dividend_yield,
+    )
+    assert price == pytest.approx(quantlib_option(case, "american").NPV(), abs=1e-4)
+
+
+def test_baw_greeks():
+    """Test BAW Greeks against finite differences and the exercise region."""
+    spot = np.array([99.0, 100.0, 101.0])
+    prices = baw_price(spot, 110, 0.25, 0.25, False)
+    greeks = baw_greeks(100.0, 110, 0.25, 0.25, False)
+
+    assert greeks["delta"] == pytest.approx((prices[2] - prices[0]) / 2, abs=1e-3)
+    assert greeks["gamma"] == pytest.approx(
+        prices[2] - 2 * prices[1] + prices[0], abs=1e-3
+    )
+    assert greeks["vega"] > 0
+    assert greeks["theta"] < 0
+
+    # Deep in-the-money puts are exercised immediately
+    deep = baw_greeks(50.0, 100, 0.5, 0.3, False)
+    assert deep["price"] == pytest.approx(50.0)
+    assert deep["delta"] == pytest.approx(-1.0)
+    assert deep["gamma"] == pytest.approx(0.0)
+
+
+def test_american_premium():
+    """Test that American puts are worth at least European puts and intrinsic value."""
+    spot = np.linspace(50, 150, 21)
+    american = baw_price(spot, 100, 0.5, 0.3, False)
+    european = bsm_price(spot, 100, 0.5, 0.3, False)
+
+    assert np.all(american >= european - 1e-12)
+    assert np.all(american >= np.maximum(100 - spot, 0) - 1e-12)
+
+    # Without dividends, American calls are worth the same as European calls
+    np.testing.assert_allclose(
+        baw_price(spot, 100, 0.5, 0.3, True), bsm_price(spot, 100, 0.5, 0.3, True)
+    )
+
+
+def test_broadcasting():
+    """Test that a grid of spots prices every contract in one call."""
+    spot = np.linspace(80, 120, 5)[:, np.newaxis]
+    strike = np.array([90.0, 100.0, 110.0])
+    is_call = np.array([True, False, True])
+    prices = price_options(spot, strike, 0.25, 0.3, is_call)
+
+    assert prices.shape == (5, 3)
+    assert prices[2, 1] == pytest.approx(baw_price(100.0, 100.0, 0.25, 0.3, False))
+
+    with pytest.raises(ValueError):
+        price_options(spot, strike, 0.25, 0.3, is_call, engine="quantlib")
+
+
+def test_get_pricing_engine():
+    """Test engine selection from the argument, config and unknown names."""
+    assert get_pricing_engine("bsm") == "bsm"
+    assert get_pricing_engine("quantlib") == "quantlib"
+    assert get_pricing_engine("unknown") == "quantlib"
+
+
+def test_get_scenario_pricing_engine(monkeypatch):
+    """Test that scenario grids use their own engine, or the default one."""
+    monkeypatch.setitem(options_config, "scenario_pricing_engine", "baw")
+    monkeypatch.setitem(options_config, "pricing_engine", "quantlib")
+    assert get_scenario_pricing_engine() == "baw"
+    assert get_pricing_engine() == "quantlib"
+    assert get_scenario_pricing_engine("bsm") == "bsm"
+
+    monkeypatch.delitem(options_config, "scenario_pricing_engine")
+    assert get_scenario_pricing_engine() == "quantlib"
+
+
+def test_time_to_expiry():
+    """Test that past and same-day expiries count as one day, as with QuantLib."""
+    today = datetime.date(2025, 1, 10)
+    assert calculate_time_to_expiry(datetime.datetime(2025, 1, 20), today) == 10 / 365
+    assert calculate_time_to_expiry(datetime.datetime(2025, 1, 10), today) == 1 / 365
+    assert calculate_time_to_expiry(datetime.datetime(2025, 1, 1), today) == 1 / 365
+
+
+@pytest.mark.parametrize("option_type", ["CALL", "PUT"])
+def test_engines_agree(option_type):
+    """Test that the NumPy engine is close to the QuantLib binomial tree."""
+    option = create_test_option(option_type=option_type, days_to_expiry=60, strike=105)
+
+    reference_price = calculate_bs_price(option, 100, volatility=0.3, engine="quantlib")
+    reference_delta = calculate_black_scholes_delta(
+        option, 100, volatility=0.3, engine="quantlib"
+    )
+
+    assert calculate_bs_price(
+        option, 100, volatility=0.3, engine="baw"
+    ) == pytest.approx(reference_price, abs=0.05)
+    assert calculate_black_scholes_delta(
+        option, 100, volatility=0.3, engine="baw"
+    ) == pytest.approx(reference_delta, abs=0.01)
+
+
+@pytest.mark.parametrize("engine", ["quantlib", "baw"])
+def test_contract_arrays(engine):
+    """Test pricing lists of contracts against the single-contract functions."""
+    options = [
+        create_test_option("CALL", 30, 95),
+        create_test_option("PUT", 90, 100),
+        create_test_option("PUT", 180, 120),
+    ]
+    spots = np.array([90.0, 100.0])[:, np.newaxis]
+    volatilities = np.array([0.2, 0.3, 0.4])
+
+    prices = calculate_option_prices(
+        options, spots, volatilities=volatilities, engine=engine
+    )
+    deltas = calculate_option_deltas(
+        options, spots, volatilities=volatilities, engine=engine
+    )
+
+    assert prices.shape == deltas.shape == (2, 3)
+    for i, spot in enumerate(spots[:, 0]):
+        for j, option in enumerate(options):
+            assert prices[i, j] == pytest.approx(
+                calculate_bs_price(
+                    option, spot, volatility=volatilities[j], engine=engine
+                )
+            )
+            assert deltas[i, j] == pytest.approx(
+                calculate_black_scholes_delta(
+                    option, spot, volatility=volatilities[j], engine=engine
+                )
+            )
+
+
+def test_calculate_option_greeks():
+    """Test QuantLib tree Greeks against the BAW engine."""
+    options = [create_test_option("CALL", 60, 105), create_test_option("PUT", 90, 95)]
+    spots = np.array([100.0, 100.0])
+
+    reference = calculate_option_greeks(options, spots, engine="baw")
+    greeks = calculate_option_greeks(options, spots, engine="quantlib")
+
+    assert greeks["price"] == pytest.approx(reference["price"], abs=0.05)
+    assert greeks["delta"] == pytest.approx(reference["delta"], abs=0.01)
+    assert greeks["gamma"] == pytest.approx(reference["gamma"], abs=0.002)
+    assert greeks["vega"] == pytest.approx(reference["vega"], rel=0.05)
+    assert greeks["theta"] == pytest.approx(reference["theta"], rel=0.1)
+
+
+def test_roll_forward():
+    """Test that rolling forward moves expiries back, but not past tomorrow."""
+    options = [create_test_option("CALL", 30), create_test_option("PUT", 5)]
+    rolled = roll_forward(options, 10)
+
+    assert (options[0].expiry - rolled[0].expiry).days == 10
+    assert rolled[1].expiry.date() == datetime.date.today() + datetime.timedelta(days=1)
+    assert rolled[1].strike == options[1].strike
+
+
+def test_estimate_volatilities_with_skew():
+    """Test the vectorized skew model against the single-contract version."""
+    options = [
+        create_test_option("CALL", 30, 100),
+        create_test_option("PUT", 30, 100),
+        create_test_option("PUT", 365, 100),
+    ]
+    spots = np.array([70.0, 85.0, 100.0, 115.0, 130.0])[:, np.newaxis]
+    volatilities = estimate_volatilities_with_skew(options, spots)
+
+    assert volatilities.shape == (5, 3)
+    for i, spot in enumerate(spots[:, 0]):
+        for j, option in enumerate(options):
+            assert volatilities[i, j] == pytest.approx(
+                estimate_volatility_with_skew(option, spot)
+            )
+
+
+@pytest.mark.parametrize("engine", ["bsm", "baw"])
+def test_implied_volatility_round_trip(engine):
+    """Test that solving a book of prices recovers the volatilities."""
+    rng = np.random.default_rng(0)
+    strike = rng.uniform(60, 140, 500)
+    time_to_expiry = rng.uniform(0.02, 2, 500)
+    is_call = rng.random(500) > 0.5
+    volatility = rng.uniform(0.1, 1.0, 500)
+    prices = price_options(
+        100, strike, time_to_expiry, volatility, is_call, engine=engine
+    )
+
+    solved = implied_volatility(
+        prices, 100, strike, time_to_expiry, is_call, engine=engine
+    )
+    repriced = price_options(
+        100, strike, time_to_expiry, solved, is_call, engine=engine
+    )
+
+    np.testing.assert_allclose(repriced, prices, atol=1e-4)
+
+
+def test_implied_volatility_exercise_region():
+    """Test a put priced just above intrinsic, where the price is flat in volatility."""
+    price = baw_price(100, 139.6, 0.76, 0.311, False)
+    solved = implied_volatility(price, 100, 139.6, 0.76, False, initial_volatility=0.3)
+    assert baw_price(100, 139.6, 0.76, solved, False) == pytest.approx(price, abs=1e-4)
+
+
+def test_implied_volatility_out_of_range():
+    """Test that unreachable prices end at the edges of the search range."""
+    solved = implied_volatility([0.0, 200.0], 100, 100, 0.5, True)
+    assert solved[0] == pytest.approx(0.001, abs=1e-6)
+    assert solved[1] == pytest.approx(5.0)
+
+
+def test_implied_volatility_price_function():
+    """Test solving with a custom pricer and a warm start."""
+    calls = []
+
+    def price_function(volatility, index):
+        calls.append(index)
+        return bsm_price(100, 100, 0.5, volatility, True)
+
+    target = bsm_price(100, 100, 0.5, 0.4, True)
+    solved = implied_volatility(
+        target,
+        100,
+        100,
+        0.5,
+        True,
+        initial_volatility=0.39,
+        price_function=price_function,
+    )
+
+    assert solved == pytest.approx(0.4, abs=1e-4)
+    assert len(calls) <= 3
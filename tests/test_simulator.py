@@ -1,5 +1,9 @@
 """Tests for the simulator module."""
 
+import datetime
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.folio.data_model import (
@@ -9,9 +13,20 @@ from src.folio.data_model import (
     PortfolioSummary,
     StockPosition,
 )
+from src.folio.options import options_config
 from src.folio.simulator import (
+    PortfolioArrays,
+    TaylorApproximation,
     calculate_percentage_changes,
+    estimate_return_covariance,
+    get_simulation_method,
+    get_worker_count,
+    load_price_history,
+    simulate_historical_replay,
+    simulate_portfolio_monte_carlo,
+    simulate_portfolio_surface,
     simulate_portfolio_with_spy_changes,
+    simulate_rolling_replays,
 )
 
 
@@ -217,6 +232,7 @@ def test_simulate_portfolio_with_spy_changes(sample_portfolio_group, monkeypatch
     result = simulate_portfolio_with_spy_changes(
         portfolio_groups=[sample_portfolio_group],
         spy_changes=[-0.1, 0.0, 0.1],
+        method="objects",
     )
 
     # Check the structure of the result
@@ -255,3 +271,381 @@ def test_simulate_empty_portfolio():
     assert result["portfolio_exposures"] == []
     assert result["current_value"] == 0.0
     assert result["current_exposure"] == 0.0
+
+
+def test_vectorized_matches_objects(sample_portfolio_group, monkeypatch):
+    """Test that the vectorized method matches recalculating per scenario."""
+    # Price scenarios with the same engine as the objects method
+    monkeypatch.delitem(options_config, "scenario_pricing_engine", raising=False)
+    expiry = (datetime.date.today() + datetime.timedelta(days=90)).isoformat()
+    put = OptionPosition(
+        ticker="AAPL",
+        position_type="option",
+        quantity=-3,
+        beta=1.2,
+        beta_adjusted_exposure=-600.0,
+        strike=90.0,
+        expiry=expiry,
+        option_type="PUT",
+        delta=-0.3,
+        delta_exposure=900.0,
+        notional_value=3000.0,
+        underlying_beta=1.2,
+        market_exposure=900.0,
+        price=2.0,
+        cost_basis=2.5,
+        market_value=-600.0,
+    )
+    sample_portfolio_group.option_positions.append(put)
+    stock_group = PortfolioGroup(
+        ticker="MSFT",
+        stock_position=StockPosition(
+            ticker="MSFT",
+            quantity=-20,
+            beta=0.8,
+            market_exposure=-8000.0,
+            beta_adjusted_exposure=-6400.0,
+            price=400.0,
+        ),
+        option_positions=[],
+        net_exposure=-8000.0,
+        beta=0.8,
+        beta_adjusted_exposure=-6400.0,
+        total_delta_exposure=0.0,
+        options_delta_exposure=0.0,
+    )
+    cash_like = [
+        {
+            "ticker": "SPAXX",
+            "quantity": 5000,
+            "beta": 0.0,
+            "market_value": 5000.0,
+            "beta_adjusted_exposure": 0.0,
+            "price": 1.0,
+        }
+    ]
+    spy_changes = [-0.2, -0.1, 0.0, 0.1, 0.2]
+
+    results = {
+        method: simulate_portfolio_with_spy_changes(
+            [sample_portfolio_group, stock_group],
+            spy_changes,
+            cash_like,
+            100.0,
+            method=method,
+        )
+        for method in ("objects", "vectorized")
+    }
+    expected, actual = results["objects"], results["vectorized"]
+
+    assert actual.keys() == expected.keys()
+    for key in ("portfolio_values", "portfolio_exposures"):
+        assert actual[key] == pytest.approx(expected[key])
+    assert actual["current_value"] == pytest.approx(expected["current_value"])
+    assert actual["current_exposure"] == pytest.approx(expected["current_exposure"])
+    for ticker in ("AAPL", "MSFT"):
+        assert actual["position_values"][ticker] == pytest.approx(
+            expected["position_values"][ticker]
+        )
+        assert actual["position_exposures"][ticker] == pytest.approx(
+            expected["position_exposures"][ticker]
+        )
+        assert actual["position_details"][ticker] == pytest.approx(
+            expected["position_details"][ticker]
+        )
+        assert actual["position_changes"][ticker]["pct_changes"] == pytest.approx(
+            expected["position_changes"][ticker]["pct_changes"]
+        )
+
+
+def test_get_simulation_method():
+    """Test simulation method selection."""
+    assert get_simulation_method("objects") == "objects"
+    assert get_simulation_method("vectorized") == "vectorized"
+    assert get_simulation_method("taylor") == "taylor"
+    assert get_simulation_method("unknown") == "vectorized"
+
+
+def test_workers_match_in_process(sample_portfolio_group):
+    """Test that sharding scenarios across workers gives the same results."""
+    sample_portfolio_group.option_positions[0].expiry = (
+        datetime.date.today() + datetime.timedelta(days=60)
+    ).isoformat()
+    spy_changes = [-0.1, -0.05, 0.0, 0.05, 0.1]
+
+    expected = simulate_portfolio_with_spy_changes(
+        [sample_portfolio_group], spy_changes, workers=1
+    )
+    actual = simulate_portfolio_with_spy_changes(
+        [sample_portfolio_group], spy_changes, workers=2
+    )
+
+    assert actual["portfolio_values"] == expected["portfolio_values"]
+    assert actual["portfolio_exposures"] == expected["portfolio_exposures"]
+
+
+def test_simulate_portfolio_surface(sample_portfolio_group):
+    """Test the spot x volatility x time surface against the SPY sweep."""
+    sample_portfolio_group.option_positions[0].expiry = (
+        datetime.date.today() + datetime.timedelta(days=60)
+    ).isoformat()
+    spy_changes = [-0.1, 0.0, 0.1]
+
+    surface = simulate_portfolio_surface(
+        [sample_portfolio_group],
+        spy_changes,
+        volatility_shifts=[-0.1, 0.0, 0.1],
+        days_forward=[0, 30, 90],
+        cash_like_positions=[{"market_value": 500.0}],
+    )
+    sweep = simulate_portfolio_with_spy_changes(
+        [sample_portfolio_group],
+        spy_changes,
+        [{"market_value": 500.0}],
+        method="vectorized",
+    )
+
+    assert surface["portfolio_values"].shape == (3, 3, 3)
+    assert surface["group_values"].shape == (3, 3, 3, 1)
+    assert surface["current_value"] == pytest.approx(sweep["current_value"])
+    assert surface["portfolio_values"][0, 1] == pytest.approx(sweep["portfolio_values"])
+    assert surface["pnl"][0, 1, 1] == pytest.approx(0.0)
+
+    # A long call gains from volatility and loses to time
+    pnl = surface["pnl"]
+    assert np.all(np.diff(pnl[0, :, 1]) > 0)
+    assert np.all(np.diff(pnl[:, 1, 1]) < 0)
+
+
+def test_taylor_approximation(sample_portfolio_group):
+    """Test the Taylor expansion against full repricing."""
+    sample_portfolio_group.option_positions[0].expiry = (
+        datetime.date.today() + datetime.timedelta(days=60)
+    ).isoformat()
+    sample_portfolio_group.option_positions[0].quantity = 10
+    portfolio = PortfolioArrays.from_groups([sample_portfolio_group])
+    taylor = TaylorApproximation.from_portfolio(portfolio, max_move=0.05)
+    adjustments = np.array([[0.97], [0.99], [1.0], [1.02], [1.1]])
+
+    approximate = taylor.evaluate(adjustments)
+    exact = portfolio.evaluate(adjustments)
+
+    # Small moves are within the error bound, large moves are repriced
+    assert approximate["repriced"].tolist() == [False, False, False, False, True]
+    errors = np.abs(approximate["group_values"] - exact["group_values"])[:, 0]
+    assert np.all(errors <= approximate["error_bounds"] + 1e-6)
+    assert errors[2] == pytest.approx(0.0, abs=1e-9)
+    assert approximate["error_bounds"][1] < approximate["error_bounds"][0]
+    assert approximate["group_values"][4] == pytest.approx(exact["group_values"][4])
+    assert approximate["group_exposures"] == pytest.approx(
+        exact["group_exposures"], rel=0.02
+    )
+
+    # Volatility and time terms are close to repricing on the surface
+    shifted = taylor.evaluate(adjustments[:3], volatility_shift=0.02, days_forward=5)
+    surface = portfolio.evaluate_surface(
+        adjustments[:3], np.array([0.02]), np.array([5])
+    )
+    assert shifted["option_values"] == pytest.approx(
+        surface["option_values"][0, 0], rel=0.01
+    )
+
+    # The method is available to SPY sweeps
+    results = simulate_portfolio_with_spy_changes(
+        [sample_portfolio_group], [-0.01, 0.0, 0.01], method="taylor"
+    )
+    assert len(results["error_bounds"]) == 3
+    assert not any(results["repriced"])
+
+
+def test_get_worker_count():
+    """Test worker count selection."""
+    assert get_worker_count(4) == 4
+    assert get_worker_count(0) >= 1
+    assert get_worker_count(-1) == 1
+    assert get_worker_count(None) == 1
+
+
+def test_simulate_portfolio_monte_carlo(sample_stock_position):
+    """Test Monte Carlo VaR against the closed form for stocks."""
+    aapl = PortfolioGroup(
+        ticker="AAPL",
+        stock_position=sample_stock_position,
+        option_positions=[],
+        net_exposure=1000.0,
+        beta=1.2,
+        beta_adjusted_exposure=1200.0,
+        total_delta_exposure=0.0,
+        options_delta_exposure=0.0,
+    )
+    covariance = pd.DataFrame(
+        [[0.0004, 0.0001], [0.0001, 0.0001]],
+        index=["AAPL", "SPY"],
+        columns=["AAPL", "SPY"],
+    )
+
+    results = simulate_portfolio_monte_carlo(
+        [aapl], covariance, num_paths=50_000, horizon_days=4, seed=1
+    )
+
+    # Four days at 2% daily volatility is 4% over the horizon
+    assert results["current_value"] == pytest.approx(1000.0)
+    expected_var = -1000.0 * (np.exp(-1.6449 * 0.04) - 1)
+    assert results["var"][0.95] == pytest.approx(expected_var, rel=0.03)
+    assert results["expected_shortfall"][0.99] > results["var"][0.99]
+    assert results["var"][0.99] > results["var"][0.95]
+    assert sum(results["histogram"]["counts"]) == 50_000
+
+    # Results depend on the seed, not on how paths are chunked
+    chunked = simulate_portfolio_monte_carlo(
+        [aapl], covariance, num_paths=50_000, horizon_days=4, seed=1, chunk_size=7_000
+    )
+    np.testing.assert_array_equal(chunked["pnl_values"], results["pnl_values"])
+    sharded = simulate_portfolio_monte_carlo(
+        [aapl], covariance, num_paths=50_000, horizon_days=4, seed=1, workers=2
+    )
+    np.testing.assert_array_equal(sharded["pnl_values"], results["pnl_values"])
+
+    # Groups without an estimate follow the market index by beta
+    aapl.ticker = "MISSING"
+    mapped = simulate_portfolio_monte_carlo(
+        [aapl], covariance, num_paths=50_000, seed=1
+    )
+    assert mapped["std_pnl"] == pytest.approx(1000.0 * 1.2 * 0.01, rel=0.03)
+
+
+def test_estimate_return_covariance():
+    """Test covariances from price histories, skipping short histories."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2024-01-01", periods=250)
+    market = rng.normal(0, 0.01, 250)
+    histories = {
+        "SPY": pd.DataFrame({"Close": 100 * np.exp(np.cumsum(market))}, index=index),
+        "AAPL": pd.DataFrame(
+            {"Close": 100 * np.exp(np.cumsum(2 * market))}, index=index
+        ),
+        "NEW": pd.DataFrame({"Close": [10.0, 11.0]}, index=index[:2]),
+    }
+
+    class FakeFetcher:
+        def __init__(self):
+            self.calls = 0
+
+        def fetch_many(self, tickers, period="3m"):
+            assert period == "1y"
+            self.calls += 1
+            return {
+                ticker: histories[ticker] for ticker in tickers if ticker in histories
+            }
+
+    fetcher = FakeFetcher()
+    covariance = estimate_return_covariance(["AAPL", "NEW", "UNKNOWN"], fetcher)
+
+    assert list(covariance.index) == ["AAPL", "SPY"]
+    assert covariance.loc["AAPL", "AAPL"] == pytest.approx(
+        4 * covariance.loc["SPY", "SPY"]
+    )
+    assert covariance.loc["AAPL", "SPY"] == pytest.approx(
+        2 * covariance.loc["SPY", "SPY"]
+    )
+    # All histories are loaded in one request
+    assert fetcher.calls == 1
+
+    with pytest.raises(ValueError):
+        estimate_return_covariance(["UNKNOWN"], FakeFetcher(), market_index="NONE")
+
+
+def test_load_price_history():
+    """Test aligning closes to the market index's trading dates."""
+    index = pd.date_range("2024-01-01", periods=4)
+    histories = {
+        "SPY": pd.DataFrame({"Close": [100.0, 101.0, 102.0, 103.0]}, index=index),
+        "AAPL": pd.DataFrame({"Close": [50.0, 51.0]}, index=index[[0, 2]]),
+        "EMPTY": pd.DataFrame(columns=["Close"]),
+    }
+
+    class FakeFetcher:
+        def fetch_many(self, tickers, period="3m"):
+            assert period == "10y"
+            return {
+                ticker: histories[ticker] for ticker in tickers if ticker in histories
+            }
+
+    prices = load_price_history(["AAPL", "EMPTY", "MSFT"], FakeFetcher())
+
+    assert list(prices.columns) == ["AAPL", "SPY"]
+    assert prices["AAPL"].tolist() == [50.0, 50.0, 51.0, 51.0]
+
+    with pytest.raises(ValueError):
+        load_price_history(["AAPL"], FakeFetcher(), market_index="QQQ")
+
+
+def test_simulate_historical_replay(sample_stock_position):
+    """Test replaying realized moves, with beta for tickers without history."""
+    aapl = PortfolioGroup(
+        ticker="AAPL",
+        stock_position=sample_stock_position,
+        option_positions=[],
+        net_exposure=1000.0,
+        beta=1.2,
+        beta_adjusted_exposure=1200.0,
+        total_delta_exposure=0.0,
+        options_delta_exposure=0.0,
+    )
+    msft = PortfolioGroup(
+        ticker="MSFT",
+        stock_position=StockPosition(
+            ticker="MSFT",
+            quantity=-5,
+            beta=0.5,
+            market_exposure=-2000.0,
+            beta_adjusted_exposure=-1000.0,
+            price=400.0,
+        ),
+        option_positions=[],
+        net_exposure=-2000.0,
+        beta=0.5,
+        beta_adjusted_exposure=-1000.0,
+        total_delta_exposure=0.0,
+        options_delta_exposure=0.0,
+    )
+    prices = pd.DataFrame(
+        {
+            "AAPL": [200.0, 180.0, 150.0, 210.0, 190.0],
+            "SPY": [400.0, 380.0, 360.0, 400.0, 440.0],
+        },
+        index=pd.date_range("2020-03-01", periods=5),
+    )
+
+    replay = simulate_historical_replay(
+        [aapl, msft],
+        prices,
+        "2020-03-02",
+        cash_like_positions=[{"market_value": 100.0}],
+    )
+
+    # AAPL moves by its own closes, MSFT by half of SPY's moves
+    assert len(replay["dates"]) == 4
+    assert replay["current_value"] == pytest.approx(1000.0 - 2000.0 + 100.0)
+    assert replay["group_values"][:, 0] == pytest.approx(
+        [1000.0, 1000.0 * 150 / 180, 1000.0 * 210 / 180, 1000.0 * 190 / 180]
+    )
+    assert replay["group_values"][1, 1] == pytest.approx(
+        -2000.0 * (1 + 0.5 * (360 / 380 - 1))
+    )
+    assert replay["max_drawdown"] == pytest.approx(
+        np.max(
+            np.maximum.accumulate(replay["portfolio_values"])
+            - replay["portfolio_values"]
+        )
+    )
+
+    # Rolling windows agree with replaying each window
+    rolling = simulate_rolling_replays([aapl, msft], prices, window_days=2)
+    assert len(rolling["start_dates"]) == 3
+    for index, start in enumerate(rolling["start_dates"]):
+        window = simulate_historical_replay(
+            [aapl, msft], prices, start, rolling["end_dates"][index]
+        )
+        assert rolling["final_pnl"][index] == pytest.approx(window["pnl"][-1])
+        assert rolling["worst_pnl"][index] == pytest.approx(window["pnl"][1:].min())
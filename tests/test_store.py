@@ -0,0 +1,71 @@
+"""Tests for the dcc.Store payload encoding."""
+
+import json
+
+import pytest
+
+from src.folio.portfolio import calculate_portfolio_summary
+from src.folio.store import (
+    decode_groups,
+    decode_summary,
+    encode_groups,
+    encode_summary,
+)
+
+
+def test_groups_round_trip(portfolio_groups):
+    """Test that decoding an encoded payload preserves every field."""
+    payload = encode_groups(portfolio_groups)
+
+    # The payload must survive the JSON round trip through the browser
+    decoded = decode_groups(json.loads(json.dumps(payload)))
+
+    assert [group.to_dict() for group in decoded] == [
+        group.to_dict() for group in portfolio_groups
+    ]
+    assert isinstance(decoded[0].stock_position.quantity, int)
+
+
+def test_decoded_groups_are_cached(portfolio_groups):
+    """Test that decoding the same payload again reuses the decoded groups."""
+    payload = encode_groups(portfolio_groups)
+
+    first = decode_groups(payload)
+    second = decode_groups(dict(payload))
+
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second, strict=True))
+
+
+def test_summary_round_trip(portfolio_groups):
+    """Test that decoding an encoded summary preserves every field."""
+    summary = calculate_portfolio_summary(portfolio_groups)
+
+    decoded = decode_summary(json.loads(json.dumps(encode_summary(summary))))
+
+    assert decoded.to_dict() == summary.to_dict()
+
+
+def test_legacy_payloads(portfolio_groups):
+    """Test that plain to_dict() forms are still accepted."""
+    summary = calculate_portfolio_summary(portfolio_groups)
+
+    decoded_groups = decode_groups([group.to_dict() for group in portfolio_groups])
+    decoded_summary = decode_summary(summary.to_dict())
+
+    assert [group.to_dict() for group in decoded_groups] == [
+        group.to_dict() for group in portfolio_groups
+    ]
+    assert decoded_summary.to_dict() == summary.to_dict()
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"version": 99}, {"schema": "portfolio-summary"}, {"encoding": "pickle"}],
+)
+def test_unsupported_payloads(portfolio_groups, changes):
+    """Test that payloads of another version, schema or encoding are rejected."""
+    payload = {**encode_groups(portfolio_groups), **changes}
+
+    with pytest.raises(ValueError):
+        decode_groups(payload)
@@ -186,6 +186,70 @@ class TestDataFetching:
                 assert len(df_default) > 0
 
 
+class TestFetchMany:
+    """Tests for batched multi-ticker fetching."""
+
+    @pytest.fixture
+    def bulk_frame(self):
+        """Create a bulk download result with per-ticker column groups."""
+        return pd.concat(
+            {"AAPL": get_real_data("AAPL", "1y"), "SPY": get_real_data("SPY", "1y")},
+            axis=1,
+        )
+
+    def test_fetch_many_single_download(self, bulk_frame, temp_cache_dir):
+        """Test that all cache misses are filled with one bulk download."""
+        with patch("yfinance.download", return_value=bulk_frame) as mock_download:
+            fetcher = YFinanceDataFetcher(cache_dir=temp_cache_dir)
+            results = fetcher.fetch_many(["AAPL", "SPY"], period="1y")
+
+            mock_download.assert_called_once()
+            assert set(results) == {"AAPL", "SPY"}
+            for ticker, df in results.items():
+                assert "Close" in df.columns
+                assert df.index.name == "date"
+                assert os.path.exists(
+                    os.path.join(temp_cache_dir, f"{ticker}_1y_1d.csv")
+                )
+
+    def test_fetch_many_uses_cache(self, bulk_frame, temp_cache_dir, sample_dataframe):
+        """Test that only tickers without a valid cache are downloaded."""
+        cache_file = os.path.join(temp_cache_dir, "AAPL_1y_1d.csv")
+        sample_dataframe.to_csv(cache_file)
+        os.utime(cache_file, (time.time(), time.time()))
+
+        with patch("yfinance.download", return_value=bulk_frame) as mock_download:
+            fetcher = YFinanceDataFetcher(cache_dir=temp_cache_dir)
+            results = fetcher.fetch_many(["AAPL", "SPY"], period="1y")
+
+            assert mock_download.call_args[0][0] == ["SPY"]
+            pd.testing.assert_frame_equal(results["AAPL"], sample_dataframe)
+
+    def test_fetch_many_omits_missing_tickers(self, bulk_frame, temp_cache_dir):
+        """Test that tickers absent from the bulk response are omitted."""
+        with patch("yfinance.download", return_value=bulk_frame):
+            fetcher = YFinanceDataFetcher(cache_dir=temp_cache_dir)
+            results = fetcher.fetch_many(["AAPL", "INVALID"], period="1y")
+
+            assert set(results) == {"AAPL"}
+
+    def test_fetch_many_download_error_with_fallback(
+        self, temp_cache_dir, sample_dataframe
+    ):
+        """Test fallback to expired cache when the bulk download fails."""
+        cache_file = os.path.join(temp_cache_dir, "AAPL_1y_1d.csv")
+        sample_dataframe.to_csv(cache_file)
+        old_time = time.time() - 100000
+        os.utime(cache_file, (old_time, old_time))
+
+        with patch("yfinance.download", side_effect=Exception("Network error")):
+            fetcher = YFinanceDataFetcher(cache_dir=temp_cache_dir)
+            results = fetcher.fetch_many(["AAPL", "SPY"], period="1y")
+
+            assert set(results) == {"AAPL"}
+            pd.testing.assert_frame_equal(results["AAPL"], sample_dataframe)
+
+
 class TestErrorHandling:
     """Tests for error handling in YFinanceDataFetcher."""
 